@@ -24,7 +24,7 @@ and nifty callbacks)
 
 import microcotb as cocotb
 from microcotb.clock import Clock
-from microcotb.triggers import RisingEdge, FallingEdge, ClockCycles, Timer
+from ttboard.cocotb.triggers import RisingEdge, FallingEdge, ClockCycles, Timer
 from microcotb.utils import get_sim_time
 
 # get the detected @cocotb tests into a namespace
@@ -9,7 +9,7 @@ import gc
 from ttboard.demoboard import DemoBoard
 from ttboard.mode import RPMode
 from microcotb.clock import Clock
-from microcotb.triggers import RisingEdge, FallingEdge, ClockCycles, Timer
+from ttboard.cocotb.triggers import RisingEdge, FallingEdge, ClockCycles, Timer
 from microcotb.time.value import TimeValue
 import microcotb as cocotb
 from microcotb.utils import get_sim_time
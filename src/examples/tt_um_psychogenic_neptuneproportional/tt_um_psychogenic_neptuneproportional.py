@@ -6,7 +6,7 @@ Created on Nov 21, 2024
 '''
 import microcotb as cocotb
 from microcotb.clock import Clock
-from microcotb.triggers import Timer, ClockCycles # RisingEdge, FallingEdge, Timer, ClockCycles
+from ttboard.cocotb.triggers import Timer, ClockCycles # RisingEdge, FallingEdge, Timer, ClockCycles
 
 
 # get the detected @cocotb tests into a namespace
@@ -11,7 +11,7 @@ Created on Nov 24, 2024
 from microcotb.utils import get_sim_time
 import microcotb as cocotb
 from microcotb.clock import Clock
-from microcotb.triggers import ClockCycles, RisingEdge, FallingEdge # , Timer
+from ttboard.cocotb.triggers import ClockCycles, RisingEdge, FallingEdge # , Timer
 import hashlib
 import random 
 
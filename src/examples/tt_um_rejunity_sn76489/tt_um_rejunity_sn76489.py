@@ -28,7 +28,7 @@ Adapted from https://github.com/rejunity/tt05-psg-sn76489/blob/main/test/test.py
 
 import microcotb as cocotb 
 from microcotb.clock import Clock
-from microcotb.triggers import RisingEdge, FallingEdge, Timer, ClockCycles
+from ttboard.cocotb.triggers import RisingEdge, FallingEdge, Timer, ClockCycles
 
 
 # get the detected @cocotb tests into a namespace
@@ -23,7 +23,7 @@ TT demoboard with SDK
 
 import microcotb as cocotb
 from microcotb.clock import Clock
-from microcotb.triggers import RisingEdge, FallingEdge, Timer, ClockCycles
+from ttboard.cocotb.triggers import RisingEdge, FallingEdge, Timer, ClockCycles
 from microcotb.utils import get_sim_time
 
 # get the detected @cocotb tests into a namespace
@@ -182,7 +182,7 @@ class RGBLED(basedut.DUT):
         super().__init__('RGBLED')
         self.data = data 
         self.data_rdy = data_rdy
-        self.led = self.new_slice_attribute(self.tt.uo_out, 0)
+        self.led = self.new_bit_attribute('led', self.tt.uo_out, 0)
         self.nreset = self.rst_n
 
 class TBSPI(basedut.DUT):
@@ -8,6 +8,7 @@ import time
 
 from ttboard.mode import RPMode
 from ttboard.demoboard import DemoBoard
+from ttboard.pio.resources import PIOResources
 
 # PIO program to drive the clock.  Put a value n and it clocks n+1 times
 # Reads 0 when done.
@@ -28,24 +29,30 @@ def read_prog():
 tt = DemoBoard(apply_user_config=False)
 tt.shuttle.tt_um_test.enable()
 
+resources = PIOResources.get()
+
 # Setup the PIO clock driver
-sm = rp2.StateMachine(0, clock_prog, sideset_base=machine.Pin(0))
+sm_id = resources.claim_sm('counter_read', clock_prog)
+sm = rp2.StateMachine(sm_id, clock_prog, sideset_base=machine.Pin(0))
 sm.exec("irq(clear, 4)")
 sm.active(1)
 
 # Setup the PIO counter read
-sm_rx = rp2.StateMachine(1, read_prog, in_base=machine.Pin(3))
+sm_rx_id = resources.claim_sm('counter_read', read_prog)
+sm_rx = rp2.StateMachine(sm_rx_id, read_prog, in_base=machine.Pin(3))
+rx_pio = sm_rx_id // 4
+rx_sm = sm_rx_id % 4
 
 # Setup read DMA
 dst_data = bytearray(8192)
-d = rp2.DMA()
+d = resources.claim_dma('counter_read')
 
-# Read using the SM1 RX DREQ
-c = d.pack_ctrl(inc_read=False, treq_sel=5)
+# Read using the read SM's RX DREQ
+c = d.pack_ctrl(inc_read=False, treq_sel=8*rx_pio + 4 + rx_sm)
 
-# Read from the SM1 RX FIFO
+# Read from the read SM's RX FIFO
 d.config(
-    read=0x5020_0024,
+    read=(0x5020_0020, 0x5030_0020)[rx_pio] + 4*rx_sm,
     write=dst_data,
     count=len(dst_data)//4,
     ctrl=c,
@@ -76,7 +83,7 @@ def run_test(freq):
     if freq > 266_000_000:
         raise ValueError("Too high a frequency requested")
     
-    machine.freq(freq)
+    tt.system_clock.require('overclock_test', freq)
 
     try:
         # Run 64 clocks
@@ -157,8 +164,7 @@ def run_test(freq):
 
     finally:
         # Remove overclock
-        if freq > 133_000_000:
-            machine.freq(133_000_000)
+        tt.system_clock.release('overclock_test')
             
     return total_errors
 
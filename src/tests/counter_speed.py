@@ -9,6 +9,7 @@ import time
 
 from ttboard.mode import RPMode
 from ttboard.demoboard import DemoBoard
+from ttboard.pio.resources import PIOResources
 
 # PIO program to drive the clock.  Put a value n and it clocks n+1 times
 # Reads 0 when done.
@@ -25,7 +26,8 @@ tt = DemoBoard(apply_user_config=False)
 tt.shuttle.tt_um_test.enable()
 
 # Setup the PIO clock driver
-sm = rp2.StateMachine(0, clock_prog, sideset_base=machine.Pin(0))
+sm_id = PIOResources.get().claim_sm('counter_speed', clock_prog)
+sm = rp2.StateMachine(sm_id, clock_prog, sideset_base=machine.Pin(0))
 sm.active(1)
 
 def run_test(freq, fast=False):
@@ -35,10 +37,8 @@ def run_test(freq, fast=False):
     if freq > 350_000_000:
         raise ValueError("Too high a frequency requested")
     
-    if freq > 266_000_000:
-        rp2.Flash().set_divisor(4)
-
-    machine.freq(freq)
+    # also slows the flash down, if need be
+    tt.system_clock.require('overclock_test', freq)
 
     try:
         # Run 1 clock
@@ -69,10 +69,8 @@ def run_test(freq, fast=False):
                 # Sleep so the 7-seg display can be read
                 time.sleep(0.5)
     finally:
-        if freq > 133_000_000:
-            machine.freq(133_000_000)
-            if freq > 266_000_000:
-                rp2.Flash().set_divisor(2)
+        # back to whatever the clock was before
+        tt.system_clock.release('overclock_test')
         
     return errors
 
@@ -0,0 +1,137 @@
+'''
+Created on Oct 18, 2026
+
+On-board logic analyzer for uo_out and uio.
+
+Sampling runs continuously into a ring buffer while the
+sampler waits for the trigger--on the RP2040, the PIO program
+itself does, so nothing is missed at any sample rate.  Once it
+has been seen and enough post-trigger samples are in, sampling
+stops and the window around the trigger is pulled out as a
+Capture, e.g.
+
+    from ttboard.analyzer.analyzer import LogicAnalyzer
+    from ttboard.analyzer.trigger import EdgeTrigger
+
+    la = LogicAnalyzer(rate_hz=10_000_000)
+    tt.clock_project_PWM(1_000_000)
+    cap = la.capture(EdgeTrigger(7), pre=100, post=2000)
+    with open('/cap.vcd', 'w') as f:
+        cap.write_vcd(f)
+
+Triggers on more than one bit (PatternTrigger with a wider mask)
+can't be waited on like that: for those, the ring is filled once,
+sampling stops and it's searched after, so the pattern needs to
+show up within ring_size samples of calling capture().
+
+The analyzer only listens, but on TT04/TT05 demoboards some of
+uo_out is muxed: have a project enabled (tt.shuttle.X.enable())
+so the mux is letting project I/O through.
+
+Off-target, a DesktopSampler is used, so captures can be 
+made from any iterable of raw samples (see samples.to_raw).
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+import array
+import ttboard.util.platform as platform
+import ttboard.util.time as time
+import ttboard.analyzer.samples as samples
+from ttboard.analyzer.sampler import DesktopSampler
+from ttboard.analyzer.capture import Capture
+from ttboard.analyzer.trigger import Trigger
+import ttboard.log as logging
+log = logging.getLogger(__name__)
+
+if platform.IsRP2040:
+    from ttboard.analyzer.sampler import PIOSampler
+
+class LogicAnalyzer:
+    def __init__(self, rate_hz:int=1_000_000, ring_size:int=8192, sampler=None):
+        '''
+            @param rate_hz: sample rate, up to half the system clock on the RP2040
+            @param ring_size: ring buffer size, in samples (4 bytes each)
+            @param sampler: override the default sampler (PIOSampler on 
+                            the RP2040, DesktopSampler otherwise)
+        '''
+        if sampler is None:
+            if platform.IsRP2040:
+                sampler = PIOSampler(rate_hz)
+            else:
+                sampler = DesktopSampler(rate_hz)
+        self.sampler = sampler
+        self.ring = array.array('I', bytearray(4*ring_size))
+
+    @property
+    def rate_hz(self):
+        return self.sampler.rate_hz
+
+    def capture(self, trigger=None, pre:int=0, post:int=1024, timeout_ms:int=2000):
+        '''
+            Sample until trigger fires and post samples have followed it.
+            @param trigger: a Trigger, or None to trigger immediately
+            @param pre: samples to keep from before the trigger
+            @param post: samples to keep from the trigger on (including it)
+            @param timeout_ms: give up if nothing happens within this time
+            @return: a Capture, or None if the trigger never fired
+        '''
+        n = len(self.ring)
+        if pre + post > n:
+            raise ValueError(f'pre + post ({pre + post}) larger than ring ({n})')
+        if post < 1:
+            raise ValueError('post must include at least the trigger sample')
+        if trigger is None:
+            trigger = Trigger()
+
+        sampler = self.sampler
+        if sampler.can_trigger(trigger):
+            pos, trig_at = self._sample(trigger, post, timeout_ms)
+        else:
+            # nothing the sampler can wait for: fill the ring once,
+            # and look for it with sampling stopped
+            pos, trig_at = self._sample(Trigger(), n, timeout_ms)
+            if trig_at is not None:
+                trig_at = trigger.find(self.ring, max(trig_at, pos - n), pos)
+
+        if trig_at is None:
+            log.warn(f'Trigger {trigger} never fired')
+            return None
+
+        ring = self.ring
+        first = trig_at - pre
+        if first < 0:
+            first = 0
+        if first < pos - n:
+            log.warn(f'Lost {pos - n - first} pre-trigger samples')
+            first = pos - n
+        last = trig_at + post
+        if last > pos:
+            last = pos
+
+        decoded = array.array('H', bytearray(2*(last - first)))
+        for i in range(first, last):
+            decoded[i - first] = samples.decode(ring[i % n])
+
+        return Capture(decoded, self.rate_hz, trig_at - first)
+
+    def _sample(self, trigger, post:int, timeout_ms:int):
+        '''
+            Have the sampler run until it's done, or we time out.
+            @return: (final position, trigger position or None)
+        '''
+        sampler = self.sampler
+        start = time.ticks_ms()
+        sampler.start(self.ring, trigger, post)
+        try:
+            while True:
+                # polled at least once a lap of the ring, for the wrap count
+                sampler.position()
+                if sampler.finished:
+                    break
+                if time.ticks_diff(time.ticks_ms(), start) > timeout_ms:
+                    log.warn('Capture timed out')
+                    break
+        finally:
+            pos = sampler.stop()
+        return (pos, sampler.triggered_at)
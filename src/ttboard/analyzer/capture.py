@@ -0,0 +1,64 @@
+'''
+Created on Oct 18, 2026
+
+A logic analyzer capture: decoded samples (uo_out in the low
+byte, uio in the high byte), the sample rate and where the 
+trigger happened.
+
+    cap.uo_out(i)
+    cap.trigger_index
+    with open('cap.vcd', 'w') as f:
+        cap.write_vcd(f)
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+from ttboard.util.vcd import VCDWriter
+
+class Capture:
+    def __init__(self, samples, rate_hz:int, trigger_index:int=0):
+        '''
+            @param samples: sequence of decoded 16 bit samples
+            @param rate_hz: sampling rate
+            @param trigger_index: index of the trigger sample in samples
+        '''
+        self.samples = samples
+        self.rate_hz = rate_hz
+        self.trigger_index = trigger_index
+
+    def __len__(self):
+        return len(self.samples)
+
+    def uo_out(self, idx:int) -> int:
+        return self.samples[idx] & 0xFF
+
+    def uio(self, idx:int) -> int:
+        return (self.samples[idx] >> 8) & 0xFF
+
+    def time_ns(self, idx:int) -> int:
+        '''
+            Time of sample idx, relative to the first sample
+        '''
+        return (idx * 1_000_000_000) // self.rate_hz
+
+    def write_vcd(self, stream, include_uio:bool=True):
+        '''
+            Dump the capture as VCD, with a 1-bit 'trigger'
+            signal that pulses on the trigger sample.
+        '''
+        vcd = VCDWriter(stream, timescale='1ns')
+        sig_uo = vcd.add_signal('uo_out', 8)
+        sig_uio = vcd.add_signal('uio', 8) if include_uio else None
+        sig_trig = vcd.add_signal('trigger', 1)
+        vcd.write_header(f'{len(self)} samples at {self.rate_hz}Hz, trigger at {self.trigger_index}')
+        for i in range(len(self.samples)):
+            t = self.time_ns(i)
+            s = self.samples[i]
+            vcd.change(t, sig_uo, s & 0xFF)
+            if sig_uio is not None:
+                vcd.change(t, sig_uio, (s >> 8) & 0xFF)
+            vcd.change(t, sig_trig, 1 if i == self.trigger_index else 0)
+        vcd.finish(self.time_ns(len(self.samples)))
+
+    def __repr__(self):
+        return f'<Capture {len(self)} samples @ {self.rate_hz}Hz, trigger at {self.trigger_index}>'
@@ -0,0 +1,318 @@
+'''
+Created on Oct 18, 2026
+
+Samplers fill a ring buffer (an array('I')) with raw sample
+words (see samples.py), report how many samples have been
+written, in total, since start() and do the triggering: once
+the trigger has been seen and post samples (the trigger sample
+included) are in, they stop and say where the trigger was.
+
+  * PIOSampler: a PIO state machine grabs the GPIO bank once per
+    sample and two chained DMA channels pour that into the ring.
+    The trigger bit is the state machine's JMP pin, and which
+    program gets loaded decides what it waits for (level or
+    edge), before counting out the post-trigger samples in x.
+    Nothing runs in python while sampling, so it keeps up at
+    any rate up to half the system clock.
+
+  * DesktopSampler: pulls samples from any iterable (or the
+    platform port readers, by default) as it is polled, matching
+    the trigger on each, so the trigger/decode/VCD side can be
+    exercised off-target.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+import array
+import ttboard.util.platform as platform
+import ttboard.analyzer.samples as samples
+from ttboard.analyzer.trigger import Trigger
+from ttboard.pins.port_compiler import PortLayout
+import ttboard.pins.gpio_map as gp
+from ttboard.pio.resources import PIOResources
+
+if platform.IsRP2040:
+    import rp2
+    import machine
+    import uctypes
+
+    # All of these take 2 cycles per sample, wherever they are in
+    # the program (wrap is free): in_() then a jmp.  The sample
+    # after the JMP pin is seen in the wanted state is the trigger,
+    # it and the x following it are the post-trigger samples, then
+    # irq(rel(0)) says we're done.
+
+    @rp2.asm_pio(autopush=True, push_thresh=32)
+    def _sample_now():
+        label("post")
+        in_(pins, 32)
+        jmp(x_dec, "post")
+        irq(rel(0))
+        label("done")
+        jmp("done")
+
+    @rp2.asm_pio(autopush=True, push_thresh=32)
+    def _sample_high():
+        wrap_target()
+        in_(pins, 32)
+        jmp(pin, "post")
+        wrap()
+        label("post")
+        in_(pins, 32)
+        jmp(x_dec, "post")
+        irq(rel(0))
+        label("done")
+        jmp("done")
+
+    @rp2.asm_pio(autopush=True, push_thresh=32)
+    def _sample_low():
+        label("wait_low")
+        in_(pins, 32)
+        jmp(pin, "wait_low")
+        label("post")
+        in_(pins, 32)
+        jmp(x_dec, "post")
+        irq(rel(0))
+        label("done")
+        jmp("done")
+
+    @rp2.asm_pio(autopush=True, push_thresh=32)
+    def _sample_rising():
+        label("wait_low")
+        in_(pins, 32)
+        jmp(pin, "wait_low")
+        wrap_target()
+        in_(pins, 32)
+        jmp(pin, "post")
+        wrap()
+        label("post")
+        in_(pins, 32)
+        jmp(x_dec, "post")
+        irq(rel(0))
+        label("done")
+        jmp("done")
+
+    @rp2.asm_pio(autopush=True, push_thresh=32)
+    def _sample_falling():
+        wrap_target()
+        in_(pins, 32)
+        jmp(pin, "wait_low")
+        wrap()
+        label("wait_low")
+        in_(pins, 32)
+        jmp(pin, "wait_low")
+        label("post")
+        in_(pins, 32)
+        jmp(x_dec, "post")
+        irq(rel(0))
+        label("done")
+        jmp("done")
+
+    @rp2.asm_pio(autopush=True, push_thresh=32)
+    def _sample_either():
+        # first look decides which edge we're after
+        jmp(pin, "wait_low")
+        wrap_target()
+        in_(pins, 32)
+        jmp(pin, "post")
+        wrap()
+        label("wait_low")
+        in_(pins, 32)
+        jmp(pin, "wait_low")
+        label("post")
+        in_(pins, 32)
+        jmp(x_dec, "post")
+        irq(rel(0))
+        label("done")
+        jmp("done")
+
+    _SampleProgs = {
+        'now': _sample_now,
+        'high': _sample_high,
+        'low': _sample_low,
+        'rising': _sample_rising,
+        'falling': _sample_falling,
+        'either': _sample_either
+    }
+
+    class PIOSampler:
+        '''
+            Samples at rate_hz, the PIO clock being twice that,
+            so up to half the system clock.
+        '''
+        PIOBase = [0x50200000, 0x50300000]
+        DMABase = 0x50000000
+
+        def __init__(self, rate_hz:int, sm_id:int=5):
+            layout = PortLayout.from_gpio_map(gp.GPIOMap)
+            if not layout.is_standard:
+                # raw sample words are the GPIO bank as-is
+                raise RuntimeError(f'Sample format is for the TT04/TT06 layout, not {layout}')
+            if 2*rate_hz > machine.freq():
+                raise ValueError(f'Max sample rate is half the system clock ({machine.freq()//2})')
+            self.rate_hz = rate_hz
+            self.sm_id = sm_id
+            self.finished = False
+            self.triggered_at = None
+            self._sm = None
+            self._data = None
+            self._ctrl = None
+
+        def can_trigger(self, trigger:Trigger) -> bool:
+            return trigger.condition is not None
+
+        def start(self, ring, trigger:Trigger, post:int):
+            kind, bit = trigger.condition
+            prog = _SampleProgs[kind]
+            self._ring = ring
+            self._n = len(ring)
+            self._base = uctypes.addressof(ring)
+            self._last_idx = 0
+            self._wraps = 0
+            self._post = post
+            self.finished = False
+            self.triggered_at = None
+            # the control channel re-arms the data channel by
+            # writing the ring start back to its write address
+            # (AL2_WRITE_ADDR_TRIG), which also re-triggers it
+            self._ring_addr = array.array('I', [self._base])
+
+            resources = PIOResources.get()
+            self.sm_id = resources.claim_sm(self, prog, self.sm_id)
+            pio = self.sm_id // 4
+            sm_idx = self.sm_id % 4
+            rxf = self.PIOBase[pio] + 0x20 + 4*sm_idx
+            dreq_rx = 8*pio + 4 + sm_idx
+            self._irq_reg = self.PIOBase[pio] + 0x30
+            self._irq_bit = 1 << sm_idx
+
+            kwargs = {
+                'freq': 2*self.rate_hz,
+                'in_base': machine.Pin(samples.FirstGPIO)
+            }
+            if bit is not None:
+                kwargs['jmp_pin'] = machine.Pin(samples.gpio(bit))
+            self._sm = rp2.StateMachine(self.sm_id, prog, **kwargs)
+            # x: post-trigger samples, less the trigger itself
+            self._sm.put(post - 1)
+            self._sm.exec('pull()')
+            self._sm.exec('out(x, 32)')
+            machine.mem32[self._irq_reg] = self._irq_bit
+
+            self._data = resources.claim_dma(self)
+            self._ctrl = resources.claim_dma(self)
+            self._ctrl.config(
+                read=self._ring_addr,
+                write=self.DMABase + 0x40*self._data.channel + 0x2c,
+                count=1,
+                ctrl=self._ctrl.pack_ctrl(size=2, inc_read=False, inc_write=False),
+                trigger=False)
+            self._data.config(
+                read=rxf,
+                write=ring,
+                count=self._n,
+                ctrl=self._data.pack_ctrl(size=2, inc_read=False, treq_sel=dreq_rx,
+                                          chain_to=self._ctrl.channel),
+                trigger=True)
+            self._sm.active(1)
+
+        def position(self) -> int:
+            # needs to be called at least once per ring lap
+            # to keep track of wraps
+            if self._sm is None:
+                return self._wraps*self._n + self._last_idx
+            if not self.finished and (machine.mem32[self._irq_reg] & self._irq_bit):
+                # all post samples taken, let DMA empty the FIFO
+                while self._sm.rx_fifo():
+                    pass
+                self.finished = True
+            idx = (self._data.write - self._base) // 4
+            if idx < self._last_idx:
+                self._wraps += 1
+            self._last_idx = idx
+            pos = self._wraps*self._n + idx
+            if self.finished and self.triggered_at is None:
+                self.triggered_at = pos - self._post
+            return pos
+
+        def stop(self) -> int:
+            '''
+                Stop sampling.
+                @return: final position
+            '''
+            if self._sm is None:
+                return self.position()
+            self._sm.active(0)
+            pos = self.position()
+            self._data.active(0)
+            self._ctrl.active(0)
+            machine.mem32[self._irq_reg] = self._irq_bit
+            PIOResources.get().release(self)
+            self._sm = None
+            return pos
+
+
+class DesktopSampler:
+    '''
+        Sample source for off-target runs.  Each call to position()
+        "samples" up to chunk more values from the source.
+    '''
+    def __init__(self, rate_hz:int, source=None, chunk:int=64):
+        '''
+            @param rate_hz: nominal sample rate, used for timestamps
+            @param source: iterable of raw sample words, defaults to
+                           reading the ports through platform, forever
+            @param chunk: samples taken per position() call
+        '''
+        self.rate_hz = rate_hz
+        if source is None:
+            source = self._read_ports()
+        self._source = iter(source)
+        self.chunk = chunk
+        self.finished = False
+        self.triggered_at = None
+        self._exhausted = False
+        self._ring = None
+        self._pos = 0
+
+    def can_trigger(self, trigger:Trigger) -> bool:
+        return True
+
+    def start(self, ring, trigger:Trigger, post:int):
+        self._ring = ring
+        self._trigger = trigger
+        self._post = post
+        self._prev = None
+        self._pos = 0
+        self.finished = self._exhausted
+        self.triggered_at = None
+
+    def position(self) -> int:
+        if self._ring is None or self.finished:
+            return self._pos
+        n = len(self._ring)
+        for _i in range(self.chunk):
+            try:
+                v = next(self._source)
+            except StopIteration:
+                self._exhausted = True
+                self.finished = True
+                break
+            self._ring[self._pos % n] = v
+            if self.triggered_at is None and self._trigger.matches(self._prev, v):
+                self.triggered_at = self._pos
+            self._prev = v
+            self._pos += 1
+            if self.triggered_at is not None and self._pos >= self.triggered_at + self._post:
+                self.finished = True
+                break
+        return self._pos
+
+    def stop(self) -> int:
+        self._ring = None
+        return self._pos
+
+    @staticmethod
+    def _read_ports():
+        while True:
+            yield samples.to_raw(platform.read_uo_out_byte(), platform.read_uio_byte())
@@ -0,0 +1,45 @@
+'''
+Created on Oct 18, 2026
+
+Raw sample word <-> port value conversions.
+
+The samplers capture the GPIO bank from GPIO 5 up, as-is, so in a 
+raw sample word bit N is GPIO 5+N:
+    uo_out[3:0]: bits 0-3   (GPIO 5-8)
+    uo_out[7:4]: bits 8-11  (GPIO 13-16)
+    uio[7:0]:    bits 16-23 (GPIO 21-28)
+
+Decoded samples are 16 bits: uo_out in the low byte, uio in the high.
+
+That's the TT04/TT06 layout (port_compiler.StandardPorts), the 
+PIOSampler won't run on boards with any other.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+
+FirstGPIO = 5
+
+def to_raw(uo_out:int, uio:int=0) -> int:
+    '''
+        Raw sample word with uo_out and uio set as given
+    '''
+    return (uo_out & 0xF) | ((uo_out & 0xF0) << 4) | ((uio & 0xFF) << 16)
+
+def decode(raw:int) -> int:
+    '''
+        Raw sample word to 16 bit uo_out | (uio << 8)
+    '''
+    return (raw & 0xF) | ((raw >> 4) & 0xF0) | ((raw >> 8) & 0xFF00)
+
+def encode(sample:int) -> int:
+    '''
+        16 bit uo_out | (uio << 8) sample to its raw word
+    '''
+    return to_raw(sample & 0xFF, (sample >> 8) & 0xFF)
+
+def gpio(bit:int) -> int:
+    '''
+        GPIO carrying bit (0-15) of a decoded sample
+    '''
+    return FirstGPIO + len(bin(encode(1 << bit))) - 3
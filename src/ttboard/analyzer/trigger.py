@@ -0,0 +1,126 @@
+'''
+Created on Oct 18, 2026
+
+Triggers for the logic analyzer.  These are specified in terms of
+decoded samples--bits 0-7 are uo_out, bits 8-15 are uio--but
+are matched against raw sample words, so there's no conversion
+going on while scanning.
+
+    Trigger()                       # right away
+    PatternTrigger(0x80, mask=0x80) # uo_out[7] high
+    EdgeTrigger(8)                  # rising edge on uio[0]
+
+Anything on a single bit (edges, or a pattern with a one bit mask)
+has a condition the PIO sampler waits for itself, so sampling and
+triggering keep up at any rate.  Patterns over several bits are
+looked for in a ring's worth of samples, once they're all in.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+import ttboard.analyzer.samples as samples
+
+class Trigger:
+    '''
+        Fires on the very first sample.  Subclasses
+        override matches() and condition.
+    '''
+
+    @property
+    def condition(self):
+        '''
+            What the PIO sampler needs to wait for: (kind, bit), kind
+            one of 'now', 'high', 'low', 'rising', 'falling', 'either',
+            or None if this can't be done on a single bit.
+        '''
+        return ('now', None)
+
+    def matches(self, prev:int, cur:int) -> bool:
+        '''
+            @param prev: previous raw sample (None for the very first)
+            @param cur: raw sample under consideration
+        '''
+        return True
+
+    def find(self, ring, start:int, end:int, prev:int=None):
+        '''
+            Scan ring buffer from absolute sample index start
+            up to (not including) end.
+            @return: absolute index of first match, or None
+        '''
+        n = len(ring)
+        for i in range(start, end):
+            cur = ring[i % n]
+            if self.matches(prev, cur):
+                return i
+            prev = cur
+        return None
+
+    def __repr__(self):
+        return '<Trigger now>'
+
+
+class PatternTrigger(Trigger):
+    '''
+        Fires on the first sample where (sample & mask) == value
+    '''
+    def __init__(self, value:int, mask:int=0xFFFF):
+        self.value = value
+        self.mask = mask
+        self._raw_mask = samples.encode(mask)
+        self._raw_value = samples.encode(value & mask)
+
+    @property
+    def condition(self):
+        mask = self.mask & 0xFFFF
+        if not mask or (mask & (mask - 1)):
+            return None
+        bit = len(bin(mask)) - 3
+        return ('high' if self.value & mask else 'low', bit)
+
+    def matches(self, prev:int, cur:int) -> bool:
+        return (cur & self._raw_mask) == self._raw_value
+
+    def __repr__(self):
+        return f'<PatternTrigger value {hex(self.value)} mask {hex(self.mask)}>'
+
+
+class EdgeTrigger(Trigger):
+    '''
+        Fires on a transition of a single bit
+        (0-7: uo_out, 8-15: uio)
+    '''
+    Rising = 1
+    Falling = 2
+    Either = 3
+
+    def __init__(self, bit:int, edge:int=1):
+        if bit < 0 or bit > 15:
+            raise ValueError(f'Bit {bit} out of range 0-15')
+        if edge not in (self.Rising, self.Falling, self.Either):
+            raise ValueError(f'Unknown edge {edge}')
+        self.bit = bit
+        self.edge = edge
+        self._raw_mask = samples.encode(1 << bit)
+
+    @property
+    def condition(self):
+        return (self.edge_name, self.bit)
+
+    @property
+    def edge_name(self):
+        return {1: 'rising', 2: 'falling', 3: 'either'}[self.edge]
+
+    def matches(self, prev:int, cur:int) -> bool:
+        if prev is None:
+            return False
+        was = prev & self._raw_mask
+        now = cur & self._raw_mask
+        if was == now:
+            return False
+        if now:
+            return (self.edge & self.Rising) != 0
+        return (self.edge & self.Falling) != 0
+
+    def __repr__(self):
+        return f'<EdgeTrigger bit {self.bit} {self.edge_name}>'
@@ -0,0 +1,188 @@
+'''
+Created on Oct 18, 2026
+
+Micro-benchmark runner, same code on the board (ticks_us) 
+and the host (perf_counter).
+
+    runner = BenchRunner(min_time_ms=200)
+    results = runner.run([
+            Benchmark('uo_out read', lambda: tt.uo_out.value),
+        ])
+    print_table(results)
+    save(results, '/bench.json')
+    ...
+    print_table(results, load('/bench.json'))
+
+Each benchmark is called in batches of increasing size until
+a batch takes at least min_time_ms, and that batch is what's
+reported.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+import gc
+import json
+import ttboard.util.platform as platform
+import ttboard.log as logging
+log = logging.getLogger(__name__)
+
+if platform.IsRP2040:
+    import time
+    def ticks_us():
+        return time.ticks_us()
+    def elapsed_us(start:int) -> int:
+        return time.ticks_diff(time.ticks_us(), start)
+else:
+    from time import perf_counter
+    def ticks_us():
+        return int(perf_counter()*1_000_000)
+    def elapsed_us(start:int) -> int:
+        return ticks_us() - start
+
+
+class Benchmark:
+    def __init__(self, name:str, func, ops_per_call:int=1, setup=None, teardown=None):
+        '''
+            @param name: name, also the key in saved results
+            @param func: callable, no arguments, the thing being timed
+            @param ops_per_call: operations each call to func represents
+            @param setup: optional callable, run before timing
+            @param teardown: optional callable, run after timing
+        '''
+        self.name = name
+        self.func = func
+        self.ops_per_call = ops_per_call
+        self.setup = setup
+        self.teardown = teardown
+
+    def __repr__(self):
+        return f'<Benchmark {self.name}>'
+
+
+class BenchResult:
+    def __init__(self, name:str, ops:int, elapsed_us:int):
+        self.name = name
+        self.ops = ops
+        self.elapsed_us = elapsed_us if elapsed_us > 0 else 1
+
+    @property
+    def ops_per_sec(self) -> float:
+        return (self.ops * 1_000_000) / self.elapsed_us
+
+    @property
+    def us_per_op(self) -> float:
+        return self.elapsed_us / self.ops
+
+    def to_dict(self) -> dict:
+        return {
+            'ops': self.ops,
+            'elapsed_us': self.elapsed_us,
+            'ops_per_sec': self.ops_per_sec
+        }
+
+    def __repr__(self):
+        return f'<BenchResult {self.name}: {self.ops_per_sec:.1f} ops/s>'
+
+
+class BenchRunner:
+    def __init__(self, min_time_ms:int=200, max_calls:int=1_000_000):
+        self.min_time_ms = min_time_ms
+        self.max_calls = max_calls
+
+    def run_one(self, bench:Benchmark) -> BenchResult:
+        if bench.setup is not None:
+            bench.setup()
+        try:
+            func = bench.func
+            calls = 1
+            min_us = self.min_time_ms * 1000
+            while True:
+                gc.collect()
+                start = ticks_us()
+                for _i in range(calls):
+                    func()
+                elapsed = elapsed_us(start)
+                if elapsed >= min_us or calls >= self.max_calls:
+                    break
+                # aim a little past the min time, on the next go
+                if elapsed < min_us // 10:
+                    calls *= 10
+                else:
+                    calls = int(calls * 1.2 * min_us / elapsed) + 1
+                if calls > self.max_calls:
+                    calls = self.max_calls
+        finally:
+            if bench.teardown is not None:
+                bench.teardown()
+
+        return BenchResult(bench.name, calls * bench.ops_per_call, elapsed)
+
+    def run(self, benchmarks:list, only:str=None) -> list:
+        '''
+            Run all benchmarks (or those whose name contains only)
+            @return: list of BenchResult
+        '''
+        results = []
+        for b in benchmarks:
+            if only is not None and b.name.find(only) < 0:
+                continue
+            log.info(f'Running {b.name}')
+            results.append(self.run_one(b))
+        return results
+
+
+def print_table(results:list, baseline:dict=None):
+    '''
+        Print results, with % change against baseline (as 
+        returned by load()) if given.
+    '''
+    header = '{:<32} {:>14} {:>12}'.format('benchmark', 'ops/s', 'us/op')
+    if baseline is not None:
+        header += ' {:>14} {:>8}'.format('baseline', 'change')
+    print(header)
+    print('-'*len(header))
+    for r in results:
+        line = '{:<32} {:>14.1f} {:>12.3f}'.format(r.name, r.ops_per_sec, r.us_per_op)
+        if baseline is not None:
+            if r.name in baseline:
+                base = baseline[r.name]['ops_per_sec']
+                line += ' {:>14.1f} {:>7.1f}%'.format(base, percent_change(r, baseline))
+            else:
+                line += ' {:>14} {:>8}'.format('-', '-')
+        print(line)
+
+
+def percent_change(result:BenchResult, baseline:dict) -> float:
+    '''
+        Throughput change versus baseline, positive is faster
+    '''
+    base = baseline[result.name]['ops_per_sec']
+    return 100.0 * (result.ops_per_sec - base) / base
+
+
+def compare(results:list, baseline:dict, tolerance_pct:float=10.0) -> list:
+    '''
+        @return: list of (name, % change) for results slower
+                 than baseline by more than tolerance_pct
+    '''
+    regressions = []
+    for r in results:
+        if r.name not in baseline:
+            continue
+        change = percent_change(r, baseline)
+        if change < -tolerance_pct:
+            regressions.append((r.name, change))
+    return regressions
+
+
+def save(results:list, path:str):
+    data = dict()
+    for r in results:
+        data[r.name] = r.to_dict()
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
+def load(path:str) -> dict:
+    with open(path, 'r') as f:
+        return json.load(f)
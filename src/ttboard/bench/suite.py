@@ -0,0 +1,217 @@
+'''
+Created on Oct 18, 2026
+
+The SDK hot paths, as benchmarks:
+
+    import ttboard.bench.suite as bench
+    results = bench.run()                       # just print
+    results = bench.run(save_to='/bench.json')  # keep as baseline
+    results = bench.run(baseline='/bench.json') # compare
+
+The project mux/design index benchmarks need a shuttle, and use
+the factory test project unless told otherwise.
+
+Example testbenches (examples/basic and the shaman's sacrificial
+lamb) are timed as whole tests, with and without PIO clock bursts
+for ClockCycles().
+
+On the host, from the src directory (for the config.ini):
+    python -m ttboard.bench.suite [--save FILE] [--baseline FILE] [--only NAME]
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+import asyncio
+from microcotb.clock import Clock
+from ttboard.cocotb.triggers import ClockCycles
+from microcotb.time.system import SystemTime
+from microcotb.ports.io import IO as MicrocotbIO
+from ttboard.demoboard import DemoBoard
+from ttboard.mode import RPMode
+from ttboard.cocotb.dut import DUT
+from ttboard.bench.runner import Benchmark, BenchRunner, print_table, compare, save, load
+import ttboard.log as logging
+log = logging.getLogger(__name__)
+
+
+def port_benchmarks(tt:DemoBoard) -> list:
+    vals = [0x55, 0xaa]
+    state = {'i': 0}
+    def write_ui_in():
+        state['i'] ^= 1
+        tt.ui_in.value = vals[state['i']]
+
+    def read_uo_out():
+        return tt.uo_out.value
+
+    def write_ui_in_bit():
+        state['i'] ^= 1
+        tt.ui_in[3] = state['i']
+
+    def write_ui_in_bit_rmw():
+        # the generic microcotb path: read port, modify, write byte
+        state['i'] ^= 1
+        MicrocotbIO.__setitem__(tt.ui_in, 3, state['i'])
+
+    def write_ui_in_slice():
+        state['i'] ^= 1
+        tt.ui_in[5:2] = vals[state['i']] & 0xf
+
+    def write_uio_in():
+        state['i'] ^= 1
+        tt.uio_in.value = vals[state['i']]
+
+    return [
+        Benchmark('ui_in.value write', write_ui_in),
+        Benchmark('uo_out.value read', read_uo_out),
+        Benchmark('ui_in[3] bit write', write_ui_in_bit),
+        Benchmark('ui_in[3] bit write (byte RMW)', write_ui_in_bit_rmw),
+        Benchmark('ui_in[5:2] slice write', write_ui_in_slice),
+        Benchmark('uio_in.value write', write_uio_in),
+    ]
+
+
+def cocotb_benchmarks(dut:DUT, cycles_per_await:int=100) -> list:
+    clk = dut.clk
+    def toggle_clock():
+        clk.value = 1
+        clk.value = 0
+
+    def start_clock():
+        SystemTime.reset()
+        Clock.clear_all()
+        Clock(dut.clk, 10, units='us').start()
+        dut.clk.allow_bursts = False
+
+    def start_clock_bursts():
+        start_clock()
+        dut.clk.allow_bursts = True
+
+    def stop_clock():
+        Clock.clear_all()
+        dut.clk.allow_bursts = True
+        dut.clk.value = 0
+
+    async def await_cycles():
+        await ClockCycles(dut.clk, cycles_per_await)
+
+    def clock_cycles():
+        asyncio.run(await_cycles())
+
+    return [
+        Benchmark('ClockPin toggle', toggle_clock, ops_per_call=2,
+                  setup=dut.testing_will_begin),
+        Benchmark(f'ClockCycles({cycles_per_await}) cycle', clock_cycles,
+                  ops_per_call=cycles_per_await,
+                  setup=start_clock, teardown=stop_clock),
+        Benchmark(f'ClockCycles({cycles_per_await}) cycle (PIO burst)', clock_cycles,
+                  ops_per_call=cycles_per_await,
+                  setup=start_clock_bursts, teardown=stop_clock),
+    ]
+
+
+def example_benchmarks(tt:DemoBoard) -> list:
+    try:
+        import examples.basic.tb as basic
+        import examples.tt_um_psychogenic_shaman.tb as shaman
+    except ImportError as e:
+        log.warn(f'Examples not available ({e}), skipping testbench benchmarks')
+        return []
+
+    basic_dut = DUT()
+    basic_dut.add_bit_attribute('input_pulse', tt.ui_in, 0)
+    shaman_dut = shaman.DUT()
+
+    def setup_for(dut, bursts:bool):
+        def setup():
+            SystemTime.reset()
+            Clock.clear_all()
+            dut.testing_will_begin()
+            dut.clk.allow_bursts = bursts
+        return setup
+
+    def teardown_for(dut):
+        def teardown():
+            Clock.clear_all()
+            dut.clk.allow_bursts = True
+            dut.testing_done()
+        return teardown
+
+    benchmarks = []
+    for name, test, dut in [('basic test_clockcycles', basic.test_clockcycles, basic_dut),
+                            ('shaman test_sacraficiallamb', shaman.test_sacraficiallamb, shaman_dut)]:
+        benchmarks.append(Benchmark(name, lambda t=test, d=dut: t(d),
+                                    setup=setup_for(dut, False), teardown=teardown_for(dut)))
+        benchmarks.append(Benchmark(f'{name} (PIO burst)', lambda t=test, d=dut: t(d),
+                                    setup=setup_for(dut, True), teardown=teardown_for(dut)))
+    return benchmarks
+
+
+def shuttle_benchmarks(tt:DemoBoard, project_name:str=None) -> list:
+    if project_name is None:
+        project_name = 'tt_um_factory_test'
+    try:
+        if not tt.shuttle.has(project_name):
+            log.warn(f'No {project_name} in shuttle, skipping project mux benchmarks')
+            return []
+    except Exception as e:
+        log.warn(f'No shuttle ({e}), skipping project mux benchmarks')
+        return []
+
+    design = tt.shuttle.get(project_name)
+    def lookup_design():
+        return tt.shuttle.get(project_name)
+
+    def check_has():
+        return tt.shuttle.has(project_name)
+
+    def enable():
+        tt.shuttle.enable(design)
+
+    return [
+        Benchmark('DesignIndex get', lookup_design),
+        Benchmark('DesignIndex has', check_has),
+        Benchmark('ProjectMux.enable()', enable),
+    ]
+
+
+def all_benchmarks(tt:DemoBoard=None, project_name:str=None) -> list:
+    if tt is None:
+        tt = DemoBoard.get()
+    if tt.mode != RPMode.ASIC_RP_CONTROL:
+        log.warn(f'Benchmarking in mode {tt.mode_str}, writes may not reach the pins')
+    dut = DUT()
+    return port_benchmarks(tt) + cocotb_benchmarks(dut) + example_benchmarks(tt) \
+            + shuttle_benchmarks(tt, project_name)
+
+
+def run(save_to:str=None, baseline:str=None, only:str=None, 
+        min_time_ms:int=200, tolerance_pct:float=10.0, project_name:str=None) -> list:
+    '''
+        Run the suite, print a table, optionally compare to 
+        a baseline file and/or save the results.
+        @return: list of BenchResult
+    '''
+    runner = BenchRunner(min_time_ms=min_time_ms)
+    results = runner.run(all_benchmarks(project_name=project_name), only)
+    base = None
+    if baseline is not None:
+        base = load(baseline)
+    print_table(results, base)
+    if base is not None:
+        for name, change in compare(results, base, tolerance_pct):
+            log.warn(f'Regression: {name} {change:.1f}%')
+    if save_to is not None:
+        save(results, save_to)
+        log.info(f'Results saved to {save_to}')
+    return results
+
+
+if __name__ == '__main__':
+    import sys
+    args = dict()
+    argv = sys.argv[1:]
+    while len(argv) > 1:
+        args[argv[0].lstrip('-')] = argv[1]
+        argv = argv[2:]
+    run(save_to=args.get('save'), baseline=args.get('baseline'), only=args.get('only'))
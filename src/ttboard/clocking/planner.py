@@ -0,0 +1,341 @@
+'''
+Created on Oct 18, 2026
+
+Project clock planner: picks an RP2040 system clock, and PWM
+divider/wrap settings, to get as close as possible to a requested
+project clock frequency.
+
+The system clock comes from the PLL,
+    sys = 12MHz * FBDIV / (POSTDIV1 * POSTDIV2)
+with the VCO (12MHz * FBDIV) in 750-1600MHz, and--for machine.freq()
+to accept it--a whole number of kHz.  All of those are enumerated
+once, on first use.
+
+A PWM slice then divides the system clock by DIV (8.4 fixed point)
+times TOP+1 (up to 65536).  If the period, in system clock cycles,
+can be had with an integer DIV the clock is jitter free, otherwise the
+fractional divider dithers the period by a system clock cycle.
+
+    plan = planner.plan(10_000_000)
+    print(plan)  # <ClockPlan 10000000Hz: sys 130000000Hz / 13 ...>
+
+Plans are cached per request, in a small LRU, so asking for the same
+clock again is instant.
+
+For a PIO-generated project clock, which leaves the system clock
+alone, plan_pio() works out state machine divider and delay settings.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+
+XOSCHz = 12_000_000
+VCOMinHz = 750_000_000
+VCOMaxHz = 1_600_000_000
+SysClockMinHz = 48_000_000
+SysClockMaxHz = 133_000_000
+PWMTopMax = 65536 # TOP+1
+PWMDivIntMax = 255
+
+class ClockPlan:
+    '''
+        What to set to get a project clock.
+
+        sys_hz: RP2040 system clock
+        vco_hz, postdiv1, postdiv2: PLL settings producing sys_hz
+        cycles: system clock cycles per project clock period (ideal)
+        div16: PWM divider, in 16ths (DIV_INT << 4 | DIV_FRAC)
+        top: PWM TOP register value (wrap)
+        freq_hz: actual (mean) project clock frequency, float
+        error_hz: freq_hz - requested
+        jitter_ns: peak-to-peak period jitter, 0 for integer dividers
+    '''
+    def __init__(self, requested_hz:int, sys_hz:int, vco_hz:int, postdiv1:int, postdiv2:int,
+                 cycles:int, div16:int, top:int):
+        self.requested_hz = requested_hz
+        self.sys_hz = sys_hz
+        self.vco_hz = vco_hz
+        self.postdiv1 = postdiv1
+        self.postdiv2 = postdiv2
+        self.cycles = cycles
+        self.div16 = div16
+        self.top = top
+
+    @property
+    def jitter_free(self) -> bool:
+        return (self.div16 & 0xf) == 0
+
+    @property
+    def freq_hz(self) -> float:
+        return self.sys_hz * 16 / (self.div16 * (self.top + 1))
+
+    @property
+    def error_hz(self) -> float:
+        return self.freq_hz - self.requested_hz
+
+    @property
+    def jitter_ns(self) -> float:
+        if self.jitter_free:
+            return 0
+        return 1e9/self.sys_hz
+
+    def __repr__(self):
+        return f'<ClockPlan {self.requested_hz}Hz: sys {self.sys_hz}Hz / {self.div16/16} / {self.top+1} = {self.freq_hz:.2f}Hz, jitter {self.jitter_ns:.1f}ns>'
+
+
+class ClockPlanner:
+    '''
+        Finds, and remembers, ClockPlans.  There's normally
+        no need to create one of these, use the module-level
+        plan().
+    '''
+    def __init__(self, cache_size:int=8):
+        self.cache_size = cache_size
+        self._sys_clocks = None
+        self._cache = dict()
+        self._cache_order = []
+
+    @property
+    def system_clocks(self) -> list:
+        '''
+            All reachable system clocks, as a list of
+            (sys_hz, vco_hz, postdiv1, postdiv2), highest first.
+        '''
+        if self._sys_clocks is None:
+            self._sys_clocks = self._enumerate_system_clocks()
+        return self._sys_clocks
+
+    def plan(self, freq:int, max_sys_hz:int=SysClockMaxHz, current_sys_hz:int=None) -> ClockPlan:
+        '''
+            Best plan for a project clock of freq Hz.
+            @param max_sys_hz: highest system clock to consider (overclocking
+                               allows higher project clocks)
+            @param current_sys_hz: if given, and that system clock gives
+                                   exactly freq, it is used as is
+        '''
+        freq = int(freq)
+        max_sys_hz = int(max_sys_hz)
+        if freq > max_sys_hz // 2:
+            raise ValueError("Requested frequency too high")
+        if freq <= SysClockMinHz // (PWMTopMax * PWMDivIntMax):
+            raise ValueError("Requested frequency too low")
+
+        if current_sys_hz is not None and current_sys_hz <= max_sys_hz \
+           and current_sys_hz % freq == 0:
+            p = self.plan_for_system_clock(freq, current_sys_hz)
+            if p is not None and p.jitter_free:
+                return p
+
+        key = (freq, max_sys_hz)
+        if key in self._cache:
+            self._cache_order.remove(key)
+            self._cache_order.append(key)
+            return self._cache[key]
+
+        p = self._search(freq, max_sys_hz)
+        if p is None:
+            raise ValueError(f"No clock plan for {freq}Hz")
+        self._cache[key] = p
+        self._cache_order.append(key)
+        if len(self._cache_order) > self.cache_size:
+            del self._cache[self._cache_order.pop(0)]
+        return p
+
+    def clear(self):
+        self._cache = dict()
+        self._cache_order = []
+
+    def plan_for_system_clock(self, freq:int, sys_hz:int, vco_hz:int=0,
+                              postdiv1:int=0, postdiv2:int=0) -> ClockPlan:
+        '''
+            Plan for freq, at a given system clock, or None if out of range.
+        '''
+        cycles = (sys_hz + freq // 2) // freq
+        if cycles < 2:
+            return None
+        div16, top = self.pwm_divisors(cycles)
+        if div16 is None:
+            return None
+        return ClockPlan(freq, sys_hz, vco_hz, postdiv1, postdiv2, cycles, div16, top)
+
+    @staticmethod
+    def pwm_divisors(cycles:int):
+        '''
+            PWM DIV (in 16ths) and TOP to get a period of cycles,
+            as an integer divider if possible.
+            @return: (div16, top), or (None, None) if out of range
+        '''
+        div_int = (cycles + PWMTopMax - 1) // PWMTopMax
+        while div_int <= PWMDivIntMax:
+            if cycles % div_int == 0:
+                return (div_int << 4, cycles // div_int - 1)
+            div_int += 1
+        # no integer factoring, use the fractional divider with
+        # the full TOP range
+        div16 = (cycles * 16 + PWMTopMax // 2) // PWMTopMax
+        if div16 < 16:
+            div16 = 16
+        if div16 > (PWMDivIntMax << 4) | 0xf:
+            return (None, None)
+        top = (cycles * 16 + div16 // 2) // div16 - 1
+        if top >= PWMTopMax:
+            top = PWMTopMax - 1
+        return (div16, top)
+
+    def _search(self, freq:int, max_sys_hz:int):
+        best = None
+        best_err = None
+        for sys_hz, vco_hz, pd1, pd2 in self.system_clocks:
+            if sys_hz > max_sys_hz:
+                continue
+            if sys_hz < 2*freq:
+                break
+            p = self.plan_for_system_clock(freq, sys_hz, vco_hz, pd1, pd2)
+            if p is None:
+                continue
+            # error, scaled to stay integer: |sys*16 - freq*div16*(top+1)| / (div16*(top+1))
+            period16 = p.div16 * (p.top + 1)
+            err_num = abs(sys_hz * 16 - freq * period16)
+            if best is None:
+                better = True
+            else:
+                # compare err_num/period16 with best_err[0]/best_err[1]
+                lhs = err_num * best_err[1]
+                rhs = best_err[0] * period16
+                better = lhs < rhs or (lhs == rhs and self._rank(p) > self._rank(best))
+            if better:
+                best = p
+                best_err = (err_num, period16)
+                if err_num == 0 and self._rank(p) == 2:
+                    # highest exact, jitter free, even system clock: done
+                    break
+        return best
+
+    @staticmethod
+    def _rank(p:ClockPlan) -> int:
+        # for equal error: jitter free is better, and an even
+        # number of cycles per period gives an exact 50% duty
+        if not p.jitter_free:
+            return 0
+        if p.cycles % 2:
+            return 1
+        return 2
+
+    @staticmethod
+    def _enumerate_system_clocks() -> list:
+        seen = dict()
+        fbdiv_min = (VCOMinHz + XOSCHz - 1) // XOSCHz
+        fbdiv_max = VCOMaxHz // XOSCHz
+        for fbdiv in range(fbdiv_max, fbdiv_min - 1, -1):
+            vco = XOSCHz * fbdiv
+            for pd1 in range(7, 0, -1):
+                for pd2 in range(pd1, 0, -1):
+                    div = pd1 * pd2
+                    if vco % div:
+                        continue
+                    sys_hz = vco // div
+                    if sys_hz % 1000 or sys_hz < SysClockMinHz or sys_hz in seen:
+                        continue
+                    seen[sys_hz] = (sys_hz, vco, pd1, pd2)
+        clocks = list(seen.values())
+        clocks.sort(key=lambda c: c[0], reverse=True)
+        return clocks
+
+
+_Planner = None
+def planner() -> ClockPlanner:
+    global _Planner
+    if _Planner is None:
+        _Planner = ClockPlanner()
+    return _Planner
+
+def plan(freq:int, max_sys_hz:int=SysClockMaxHz, current_sys_hz:int=None) -> ClockPlan:
+    '''
+        Best ClockPlan for a project clock of freq Hz, see ClockPlanner.plan()
+    '''
+    return planner().plan(freq, max_sys_hz, current_sys_hz)
+
+
+PIOClkDivMax = 65536
+PIODelayMax = 0xffffffff
+
+class PIOClockPlan:
+    '''
+        Settings for the PIO project clock, at a fixed system clock.
+
+        Two programs:
+          * fast: toggles every state machine cycle, the state machine 
+            clock divider (16.8 fixed point) sets the frequency.  Used
+            down to sys/(2*65536), ~950Hz at 125MHz.
+          * delay: each half period is delay+2 state machine cycles,
+            for everything slower, with an integer divider.
+
+        div256: state machine clock divider, in 256ths
+        delay: delay loop count (delay program only)
+        freq_hz: actual (mean) frequency
+        jitter_ns: peak-to-peak period jitter, from a fractional divider
+    '''
+    Fast = 'fast'
+    Delay = 'delay'
+    def __init__(self, requested_hz, sys_hz:int, program:str, div256:int, delay:int=0):
+        self.requested_hz = requested_hz
+        self.sys_hz = sys_hz
+        self.program = program
+        self.div256 = div256
+        self.delay = delay
+
+    @property
+    def sm_cycles(self) -> int:
+        '''
+            state machine cycles per project clock period
+        '''
+        if self.program == self.Fast:
+            return 2
+        return 2*(self.delay + 2)
+
+    @property
+    def freq_hz(self) -> float:
+        return self.sys_hz * 256 / (self.div256 * self.sm_cycles)
+
+    @property
+    def error_hz(self) -> float:
+        return self.freq_hz - self.requested_hz
+
+    @property
+    def jitter_free(self) -> bool:
+        return (self.div256 & 0xff) == 0
+
+    @property
+    def jitter_ns(self) -> float:
+        if self.jitter_free:
+            return 0
+        return 1e9/self.sys_hz
+
+    def __repr__(self):
+        return f'<PIOClockPlan {self.requested_hz}Hz: {self.program} sys {self.sys_hz}Hz / {self.div256/256} / {self.sm_cycles} = {self.freq_hz:.3f}Hz, jitter {self.jitter_ns:.1f}ns>'
+
+
+def plan_pio(freq, sys_hz:int) -> PIOClockPlan:
+    '''
+        PIO clock settings for freq (Hz, may be fractional) at
+        system clock sys_hz.  Never changes the system clock.
+    '''
+    if freq <= 0:
+        raise ValueError("Requested frequency must be > 0")
+    if freq > sys_hz / 2:
+        raise ValueError(f"PIO clock max is {sys_hz//2}Hz at this system clock")
+    # period, in 256ths of a system clock cycle
+    period256 = int(sys_hz * 256 / freq + 0.5)
+    div256 = (period256 + 1) // 2
+    if div256 <= PIOClkDivMax * 256:
+        return PIOClockPlan(freq, sys_hz, PIOClockPlan.Fast, max(div256, 256))
+
+    # slow: integer divider, as small as possible for resolution
+    period = (period256 + 128) // 256
+    div = (period + 2*(PIODelayMax + 2) - 1) // (2*(PIODelayMax + 2))
+    if div > PIOClkDivMax:
+        raise ValueError("Requested frequency too low")
+    if div < 1:
+        div = 1
+    delay = (period + div) // (2*div) - 2
+    return PIOClockPlan(freq, sys_hz, PIOClockPlan.Delay, div * 256, delay)
@@ -0,0 +1,197 @@
+'''
+Created on Oct 18, 2026
+
+The RP2040 system clock is shared by everything: PWM and PIO
+dividers, USB, UART, timing.  Rather than having each part of the
+SDK call machine.freq() when it feels like it, the SystemClock
+owns changes:
+
+  * anything that needs a particular system clock require()s it,
+    by name, and release()s it when done.  The most recent
+    requirement wins, with the default (config.ini rp_clock_frequency,
+    or platform.RP2040SystemClockDefaultHz) when there are none;
+
+  * changes are only made when the resulting clock actually differs
+    and, within a batch(), only once on the way out;
+
+  * the QSPI flash clock divisor is raised before going above
+    FlashDivisorAboveHz, and put back once the clock is lower again;
+
+  * consumers--things running off dividers of the system clock, like
+    the PWM and PIO project clocks--are told about each change, so
+    they can recompute their dividers, via their
+    system_clock_changed(old_hz, new_hz) method.
+
+    sysclk = SystemClock.get()
+    with sysclk.batch():
+        sysclk.release('project_clock')
+        sysclk.require('project_config', 100_000_000)
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+import ttboard.util.platform as platform
+import ttboard.log as logging
+log = logging.getLogger(__name__)
+
+class SystemClock:
+    _SystemClockSingleton = None
+    # flash can't keep up with the default divisor past this
+    FlashDivisorAboveHz = 266_000_000
+
+    @classmethod
+    def get(cls):
+        '''
+            Get (or create) the SystemClock singleton
+        '''
+        if cls._SystemClockSingleton is None:
+            cls._SystemClockSingleton = cls()
+        return cls._SystemClockSingleton
+
+    def __init__(self):
+        self._default_hz = None
+        self._requirements = [] # (owner, hz), oldest first
+        self._consumers = []
+        self._batch_depth = 0
+        self._flash_slowed = False
+        self.changes = 0
+
+    @property
+    def current(self) -> int:
+        return platform.get_RP_system_clock()
+
+    @property
+    def default_hz(self) -> int:
+        if self._default_hz is None:
+            return platform.RP2040SystemClockDefaultHz
+        return self._default_hz
+
+    @default_hz.setter
+    def default_hz(self, hz:int):
+        self._default_hz = None if hz is None else int(hz)
+        self.apply()
+
+    @property
+    def target(self) -> int:
+        '''
+            The system clock we'll have once any batch completes.
+        '''
+        if len(self._requirements):
+            return self._requirements[-1][1]
+        return self.default_hz
+
+    @property
+    def requirements(self) -> dict:
+        ret = dict()
+        for owner, hz in self._requirements:
+            ret[owner] = hz
+        return ret
+
+    def require(self, owner:str, hz:int):
+        '''
+            owner needs the system clock to be hz.  Replaces any
+            previous requirement by the same owner.
+            @raise ValueError: if the clock can't be set, in which case
+                               the requirement is dropped
+        '''
+        hz = int(hz)
+        self._remove(owner)
+        others = self._requirements
+        if len(others) and others[-1][1] != hz:
+            log.info(f'System clock: {owner} wants {hz}Hz, overriding {others[-1][0]} ({others[-1][1]}Hz)')
+        self._requirements.append((owner, hz))
+        try:
+            self.apply()
+        except ValueError:
+            self._remove(owner)
+            raise
+
+    def release(self, owner:str):
+        '''
+            owner no longer cares what the system clock is.
+        '''
+        if self._remove(owner):
+            self.apply()
+
+    def release_all(self):
+        self._requirements = []
+        self.apply()
+
+    def add_consumer(self, consumer):
+        '''
+            consumer.system_clock_changed(old_hz, new_hz) will
+            be called after every change.
+        '''
+        if consumer not in self._consumers:
+            self._consumers.append(consumer)
+
+    def remove_consumer(self, consumer):
+        if consumer in self._consumers:
+            self._consumers.remove(consumer)
+
+    def batch(self):
+        '''
+            Context manager: any number of require()/release() within
+            result in, at most, a single change on exit.
+        '''
+        return self
+
+    def __enter__(self):
+        self._batch_depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._batch_depth -= 1
+        try:
+            self.apply()
+        except ValueError as e:
+            # drop whatever asked for the impossible, and settle
+            # for the next best thing
+            log.error(f'Could not set system clock to {self.target}Hz: {e}')
+            if len(self._requirements):
+                self._requirements.pop()
+            else:
+                self._default_hz = None
+            try:
+                self.apply()
+            except ValueError as e:
+                log.error(f'Could not set system clock to {self.target}Hz: {e}')
+        return False
+
+    def apply(self):
+        '''
+            Make the system clock match the target, if it doesn't already,
+            and let the consumers know.  Happens automatically, unless
+            in a batch.
+        '''
+        if self._batch_depth:
+            return
+        target = self.target
+        old = self.current
+        if target == old or target <= 0:
+            return
+        log.info(f'Setting RP2040 system clock to {target}Hz')
+        if target > self.FlashDivisorAboveHz and not self._flash_slowed:
+            if not platform.set_flash_divisor(4):
+                log.warn('Could not change flash divisor, overclocking anyway')
+            self._flash_slowed = True
+        platform.set_RP_system_clock(target)
+        if target <= self.FlashDivisorAboveHz and self._flash_slowed:
+            platform.set_flash_divisor(2)
+            self._flash_slowed = False
+        self.changes += 1
+        for consumer in self._consumers:
+            try:
+                consumer.system_clock_changed(old, target)
+            except Exception as e:
+                log.error(f'System clock consumer {consumer} failed to adjust: {e}')
+
+    def _remove(self, owner:str) -> bool:
+        for i in range(len(self._requirements)):
+            if self._requirements[i][0] == owner:
+                self._requirements.pop(i)
+                return True
+        return False
+
+    def __repr__(self):
+        return f'<SystemClock {self.current}Hz, requirements {self.requirements}>'
@@ -0,0 +1,82 @@
+'''
+Created on Oct 18, 2026
+
+Clocks on DUT bit attributes, run by PIO.
+
+A microcotb Clock is toggled by the time stepping: every SystemTime
+advance walks all clocks and writes the signal, from python.  For a
+clock on a GPIO we drive, like dut.input_pulse = ui_in[0], the DUT
+swaps it for a HardwareClock instead (see dut.BitAttribute), which
+leaves the toggling to a PIO state machine.
+
+The HardwareClock stays registered as the Clock for that signal, with
+the same period, so ClockCycles() on it and the time steps used by
+RisingEdge/FallingEdge are unchanged.  Since the edges now happen in
+real time, simulated time is held back so it never gets ahead of real
+time (since the clock started): a wait that covers N periods of the
+clock in simulated time takes at least as long for real, and sees
+(about) N real edges.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+from microcotb.clock import Clock
+from microcotb.time.system import SystemTime
+from ttboard.clocking.system import SystemClock
+import ttboard.util.platform as platform
+import ttboard.util.time as time
+import ttboard.log as logging
+log = logging.getLogger(__name__)
+
+class HardwareClock(Clock):
+    '''
+        Takes over from a started Clock, generating it on pin
+        with PIO.
+    '''
+    def __init__(self, clock:Clock, pin):
+        self.signal = clock.signal
+        self.running = True
+        self.half_period = clock.half_period
+        self.next_toggle = clock.next_toggle
+        self.current_signal_value = clock.current_signal_value
+        self._toggle_count = 0
+        self._period = None
+        self.pin = pin
+        self.freq_hz = 1/self.period.time_in('sec')
+
+        self._pio = platform.PIOClock(pin)
+        self._pio.start(self.freq_hz)
+        SystemClock.get().add_consumer(self._pio)
+        self._sim_start_us = SystemTime.current().time_in('us')
+        self._real_start_us = time.ticks_us()
+        log.info(f'{self.signal.name} clock ({self.freq_hz:.1f}Hz) running on PIO')
+
+    @property
+    def actual_freq(self) -> float:
+        return self._pio.actual_freq
+
+    def time_is_now(self, currentTime) -> bool:
+        # hold simulated time back to real time, so waits on
+        # this clock's signal line up with its real edges
+        if not self.running:
+            # stopped, but still in the Clock registry
+            return False
+        sim_us = currentTime.time_in('us') - self._sim_start_us
+        ahead_us = int(sim_us) - time.ticks_diff(time.ticks_us(), self._real_start_us)
+        if ahead_us > 0:
+            time.sleep_us(ahead_us)
+        return False
+
+    def toggle(self):
+        # PIO does this
+        return
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        SystemClock.get().remove_consumer(self._pio)
+        self._pio.stop()
+
+    def __repr__(self):
+        return f'<HardwareClock {self.period} on {self.signal}>'
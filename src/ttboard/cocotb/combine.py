@@ -0,0 +1,164 @@
+'''
+Created on Oct 18, 2026
+
+Write combining for DUT testbenches.
+
+Testbenches tend to set a few signals back to back, then await:
+
+    dut.uio_oe_pico.value = 0xf0
+    dut.ui_in.value = 0
+    dut.uio_in[3] = 1
+    await ClockCycles(dut.clk, 10)
+
+and each of those is a separate write to the GPIO registers, so the
+project sees them change one after the other.  With write combining on
+(dut.start_combining_writes()), writes to ui_in, uio_in and uio_oe_pico
+are held, and reads of those ports see the held values, until the next
+await on one of the ttboard.cocotb.triggers, where everything goes out
+at once: a single GPIO_OUT write for ui_in and uio_in, then the output
+enables.  A write to dut.clk with writes pending flushes them too: a
+falling edge goes out in that same GPIO_OUT write, but a rising edge
+only follows once the inputs are out, so the project never samples
+inputs that are changing under it.
+
+rst_n (which may be behind the mux) is still written immediately.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+import ttboard.util.platform as platform
+
+class HeldPort:
+    '''
+        A port whose writes are held by a WriteCombiner,
+        through its hooks (ports.hooks)
+    '''
+    def __init__(self, io, gpios:list=None):
+        self.io = io
+        self.hooks = io.hooks
+        self.held = None
+        self._combiner = None
+        # value -> GPIO_OUT bits, for ports we can commit
+        # along with others
+        self.gpio_mask = 0
+        self.gpio_values = None
+        if gpios is not None:
+            for g in gpios:
+                self.gpio_mask |= (1 << g)
+            self.gpio_values = list(map(lambda v: self._scatter(v, gpios), range(256)))
+
+    @staticmethod
+    def _scatter(v:int, gpios:list) -> int:
+        bits = 0
+        for i in range(len(gpios)):
+            if v & (1 << i):
+                bits |= (1 << gpios[i])
+        return bits
+
+    def start(self, combiner):
+        self._combiner = combiner
+        self.hooks.hold(self)
+
+    def stop(self):
+        self.hooks.release(self)
+        self._combiner = None
+
+    def held_write(self, v:int):
+        self.held = v
+        combiner = self._combiner
+        combiner.pending = True
+        combiner.writes += 1
+
+    def write(self, v:int):
+        '''
+            Actually write the port
+        '''
+        self.hooks.write(v)
+
+
+class WriteCombiner:
+    '''
+        Holds port writes until flush().  Combiners that are
+        running get flushed by flush_all(), which the triggers
+        call before any wait.
+    '''
+    _Running = []
+
+    @classmethod
+    def flush_all(cls):
+        for c in cls._Running:
+            if c.pending:
+                c.flush()
+
+    def __init__(self, ui_in, uio_in, uio_oe, clock_gpio:int=0):
+        '''
+            @param ui_in: the ui_in IO
+            @param uio_in: the uio_in IO
+            @param uio_oe: the uio_oe_pico OutputEnable
+            @param clock_gpio: project clock GPIO
+        '''
+        self.pending = False
+        # port writes asked for, and actually done
+        self.writes = 0
+        self.commits = 0
+        self._clock_bit = 1 << clock_gpio
+        self._ports = [HeldPort(ui_in, getattr(ui_in, 'gpios', None)),
+                       HeldPort(uio_in, getattr(uio_in, 'gpios', None))]
+        self._oe = HeldPort(uio_oe)
+
+    @property
+    def running(self) -> bool:
+        return self in self._Running
+
+    def start(self):
+        if self.running:
+            return
+        for p in self._ports:
+            p.start(self)
+        self._oe.start(self)
+        self._Running.append(self)
+
+    def stop(self):
+        '''
+            Flush anything held and go back to immediate writes
+        '''
+        if not self.running:
+            return
+        if self.pending:
+            self.flush()
+        self._Running.remove(self)
+        for p in self._ports:
+            p.stop()
+        self._oe.stop()
+
+    def flush(self, clk:int=None):
+        '''
+            Commit held writes, in a single GPIO_OUT write, then
+            output enables.  If clk is passed, the clock is set too:
+            low in that same write, high in its own write after.
+        '''
+        mask = 0
+        val = 0
+        if clk is not None:
+            if clk:
+                # inputs settle before the rising edge, not with it
+                self.flush()
+                platform.gpio_out_masked(self._clock_bit, self._clock_bit)
+                return
+            mask = self._clock_bit
+        for p in self._ports:
+            if p.held is None:
+                continue
+            if p.gpio_values is None:
+                p.write(p.held)
+            else:
+                mask |= p.gpio_mask
+                val |= p.gpio_values[p.held & 0xff]
+            p.held = None
+        if mask:
+            platform.gpio_out_masked(mask, val)
+        if self._oe.held is not None:
+            self._oe.write(self._oe.held)
+            self._oe.held = None
+        self.pending = False
+        self.commits += 1
@@ -10,12 +10,23 @@ import microcotb.dut
 from microcotb.testcase import TestCase
 from microcotb.dut import NoopSignal
 from microcotb.dut import Wire
+from microcotb.sub_signals import SliceWrapper
+from microcotb.clock import Clock
+from ttboard.cocotb.clock import HardwareClock
+from ttboard.cocotb.trace import SignalTracer
+from ttboard.cocotb.recorder import SessionRecorder
+from ttboard.cocotb.combine import WriteCombiner
+from ttboard.cocotb.profiler import Profiler
+from ttboard.cocotb.snapshot import SnapshotDecoder, RegIn, RegOut, RegOE
+from ttboard.pins.muxed import MuxedSelection
 import ttboard.log as logging
 
 
 class PinWrapper(microcotb.dut.PinWrapper):
     def __init__(self, name:str, pin):
         super().__init__(name, pin)
+        # called with every value written, see start_trace()
+        self.write_hooks = []
         
     @property 
     def value(self):
@@ -26,16 +37,30 @@ class PinWrapper(microcotb.dut.PinWrapper):
         if self._pin.mode != Pins.OUT:
             self._pin.mode = Pins.OUT
         self._pin.value(set_to)
+        if self.write_hooks:
+            for hook in self.write_hooks:
+                hook(set_to)
         
 class ClockPin(microcotb.dut.PinWrapper):
     '''
         clock pin is use *a lot*, needs
         to be optimized a little by 
-        calling the low level platform func
+        calling the low level platform func.
+        
+        Given the DemoBoard, long ClockCycles() waits 
+        (from ttboard.cocotb.triggers) can be done as 
+        a single PIO burst, unless allow_bursts is False
+        or something (tracing, recording) needs to see 
+        every edge, through write_hooks.
     '''
     
-    def __init__(self, name:str, pin):
+    def __init__(self, name:str, pin, tt:DemoBoard=None):
         super().__init__(name, pin)
+        self._tt = tt
+        self.allow_bursts = tt is not None
+        self.write_hooks = []
+        # see DUT.start_combining_writes()
+        self.combiner = None
         
     @property 
     def value(self):
@@ -43,10 +68,76 @@ class ClockPin(microcotb.dut.PinWrapper):
     
     @value.setter 
     def value(self, set_to:int):
-        plat.write_clock(set_to)
+        combiner = self.combiner
+        if combiner is not None and combiner.pending:
+            # held writes go out before a rising edge,
+            # with a falling one
+            combiner.flush(set_to)
+        else:
+            plat.write_clock(set_to)
+        if self.write_hooks:
+            for hook in self.write_hooks:
+                hook(set_to)
+        
+    def can_burst(self, freq_hz:float) -> bool:
+        if not self.allow_bursts or self.write_hooks:
+            return False
+        sysclk = plat.get_RP_system_clock()
+        return (sysclk // 131072) + 1 <= freq_hz <= sysclk // 2
+    
+    def burst(self, num_cycles:int, freq_hz:float):
+        '''
+            num_cycles full clock cycles, ending low
+        '''
+        self._tt.clock_cycles(num_cycles, int(freq_hz))
     
             
 
+class BitAttribute(SliceWrapper):
+    '''
+        A named port bit, from add_bit_attribute().  If it lives
+        on a GPIO we drive, and a Clock is started on it, the DUT
+        hands that clock over to PIO on the first toggle, after
+        which writes are ignored (PIO owns the pin) until the 
+        clock is stopped.
+        
+        Bits we read, like uo_out[0], get their edges timed by 
+        PIO when waited on (see ttboard.cocotb.triggers), unless
+        timed_edges is False.
+    '''
+    def __init__(self, name:str, io, bit_idx:int, dut=None):
+        super().__init__(name, io, bit_idx)
+        self._dut = dut
+        self.gpio = None
+        self.hardware_clock = None
+        self.timed_edges = True
+        self._edge_timer = None
+        self._writable = getattr(io, '_bit_masks', None) is not None
+        gpios = getattr(io, 'gpios', None)
+        if gpios is not None and bit_idx < len(gpios):
+            self.gpio = gpios[bit_idx]
+    
+    @property 
+    def edge_timer(self):
+        if self._edge_timer is None:
+            self._edge_timer = plat.PIOEdgeTimer(self.gpio)
+        return self._edge_timer
+    
+    @property 
+    def value(self):
+        return self._io[self.slice_start]
+    
+    @value.setter 
+    def value(self, set_to:int):
+        if self.hardware_clock is not None:
+            return
+        if self._writable and self._dut is not None and self._dut.offload_clocks:
+            clk = Clock.get(self)
+            if clk is not None and self._dut.offload_clock(self, clk):
+                return
+        self._io[self.slice_start] = set_to
+        
+
 class DUT(microcotb.dut.DUT):
     TTIOPortNames = ['uo_out', 'ui_in', 'uio_in', 
                      'uio_out', 'uio_oe_pico']
@@ -57,7 +148,7 @@ class DUT(microcotb.dut.DUT):
         self.tt = tt # give ourselves access to demoboard object
         
         # wrap the bare clock pin
-        self.clk = ClockPin('clk', self.tt.pins.rp_projclk)
+        self.clk = ClockPin('clk', self.tt.pins.rp_projclk, tt)
         self.rst_n = PinWrapper('rst_n', self.tt.rst_n)
         
         
@@ -71,6 +162,215 @@ class DUT(microcotb.dut.DUT):
         # ena may be used in existing tests, does nothing
         self.ena = NoopSignal('ena', 1)
         
+        # clocks on bit attributes run on PIO, where possible
+        self.offload_clocks = plat.IsRP2040
+        self._hardware_clocks = []
+        
+        # see start_trace()
+        self.tracer = None
+        self.trace_failures_to = None
+        self._trace_ids = None
+        
+        # see start_recording()
+        self.recorder = None
+        
+        # see start_combining_writes()
+        self.combiner = None
+        
+        # see start_profiling()
+        self.profiler = None
+        
+        # see snapshot()
+        self._snapshot_decoder = None
+        
+    def new_bit_attribute(self, name:str, source, bit_idx:int):
+        return BitAttribute(name, source, bit_idx, self)
+    
+    def add_bit_attribute(self, name:str, source, bit_idx:int):
+        self._snapshot_decoder = None
+        return super().add_bit_attribute(name, source, bit_idx)
+    
+    def add_slice_attribute(self, name:str, source, idx_or_start:int, slice_end:int=None):
+        self._snapshot_decoder = None
+        return super().add_slice_attribute(name, source, idx_or_start, slice_end)
+    
+    def snapshot(self):
+        '''
+            Read GPIO_IN/OUT/OE once, and get every named signal
+            (ports, clk, rst_n, bit and slice attributes) from 
+            that, see ttboard.cocotb.snapshot
+            @return: a Snapshot, with signals as attributes
+        '''
+        if self._snapshot_decoder is None:
+            self._snapshot_decoder = self._build_snapshot_decoder()
+        return self._snapshot_decoder.snapshot()
+    
+    def _build_snapshot_decoder(self):
+        layout = self.tt.pins.layout
+        decoder = SnapshotDecoder()
+        decoder.add_port('uo_out', RegIn, layout.ports['uo_out'])
+        decoder.add_port('ui_in', RegIn, layout.ports['ui_in'])
+        decoder.add_port('uio_in', RegIn, layout.ports['uio'])
+        decoder.add_port('uio_out', RegIn, layout.ports['uio'])
+        decoder.add_port('uio_oe_pico', RegOE, layout.ports['uio'])
+        decoder.add_bit('clk', RegOut, layout.clock)
+        rst_pin = self.tt.rst_n
+        if not isinstance(rst_pin, MuxedSelection) and rst_pin.gpio_num is not None:
+            # behind the mux, it's not always on its GPIO
+            decoder.add_bit('rst_n', RegIn, rst_pin.gpio_num)
+        
+        ports = list(map(lambda p: (getattr(self, p), p), self.TTIOPortNames))
+        for sig in self.available_io((SliceWrapper,)):
+            for io, pname in ports:
+                if sig._io is io:
+                    decoder.add_slice(sig.name, pname, sig.slice_start, sig.slice_end)
+                    break
+        return decoder
+    
+    def offload_clock(self, bit:BitAttribute, clock:Clock) -> bool:
+        '''
+            Replace clock, started on bit, by a HardwareClock.
+            @return: False if that couldn't be done, and the clock
+                     should stay in python
+        '''
+        pin = self._pin_for_gpio(bit.gpio)
+        if pin is None:
+            return False
+        try:
+            hw = HardwareClock(clock, pin.raw_pin)
+        except (RuntimeError, ValueError) as e:
+            self._log.warning(f'Could not run {bit.name} clock on PIO: {e}')
+            self.offload_clocks = False
+            return False
+        hw.start()
+        bit.hardware_clock = hw
+        self._hardware_clocks.append((bit, hw, pin))
+        return True
+    
+    def stop_hardware_clocks(self):
+        '''
+            Stop any PIO clocks and give their pins back.
+        '''
+        for bit, hw, pin in self._hardware_clocks:
+            hw.stop()
+            bit.hardware_clock = None
+            pin.mode = pin.mode
+        self._hardware_clocks = []
+    
+    def start_trace(self, capacity:int=4096, failures_to:str='trace_{test}.vcd'):
+        '''
+            Record every write to the ports, clk and rst_n, and 
+            every value read from the outputs, in self.tracer (a
+            ttboard.cocotb.trace.SignalTracer) holding the last
+            capacity changes.  Each test starts with an empty trace.
+            
+            @param failures_to: when a test fails, its trace is dumped 
+                        as VCD to this file ({test} is the test name), 
+                        None to leave that to you
+                        
+            Clock bursts are off while tracing, so every edge 
+            makes it into the trace.
+        '''
+        self.stop_trace()
+        tracer = SignalTracer(capacity)
+        ids = dict()
+        ids['clk'] = tracer.attach_pin('clk', self.clk)
+        ids['rst_n'] = tracer.attach_pin('rst_n', self.rst_n)
+        for p in self.TTIOPortNames:
+            ids[p] = tracer.attach_port(p, getattr(self.tt, p))
+        self._trace_ids = ids
+        self.trace_failures_to = failures_to
+        self.tracer = tracer
+        return tracer
+    
+    def stop_trace(self):
+        '''
+            Stop recording. The tracer, and its records, stay 
+            around until the next start_trace().
+        '''
+        if self._trace_ids is None:
+            return
+        self.tracer.detach()
+        self._trace_ids = None
+    
+    def start_recording(self, max_cycles:int=4096):
+        '''
+            Record the inputs and outputs, on every clock, into a
+            ttboard.stream.session.VectorSession, that can be saved and 
+            replayed at hardware speed, see stop_recording().
+            Clock bursts are off while recording.
+        '''
+        self.stop_recording()
+        # undriven, the board's pull-up keeps it out of reset
+        rst_n = self.tt.rst_n
+        in_reset = rst_n.mode == Pins.OUT and not rst_n()
+        self.recorder = SessionRecorder(self.clk, self.rst_n, max_cycles, 
+                                        0 if in_reset else 1)
+        return self.recorder
+    
+    def stop_recording(self):
+        '''
+            @return: the VectorSession recorded, or None
+        '''
+        if self.recorder is None:
+            return None
+        session = self.recorder.stop()
+        self.recorder = None
+        self._log.info(f'Recorded {len(session)} clock cycles')
+        return session
+    
+    def start_combining_writes(self):
+        '''
+            Hold writes to ui_in, uio_in and uio_oe_pico until the 
+            next await (on ttboard.cocotb.triggers) or clock edge, 
+            then commit them all at once, see ttboard.cocotb.combine
+        '''
+        if self.combiner is None:
+            self.combiner = WriteCombiner(self.tt.ui_in, self.tt.uio_in, 
+                                          self.tt.uio_oe_pico, 
+                                          self.tt.pins.rp_projclk.gpio_num)
+        self.combiner.start()
+        self.clk.combiner = self.combiner
+        return self.combiner
+    
+    def stop_combining_writes(self):
+        '''
+            Commit anything held and go back to immediate writes
+        '''
+        if self.combiner is None:
+            return
+        self.clk.combiner = None
+        self.combiner.stop()
+        self.combiner = None
+    
+    def flush_writes(self):
+        if self.combiner is not None and self.combiner.pending:
+            self.combiner.flush()
+    
+    def start_profiling(self):
+        '''
+            Profile every test run from now on: wall time, cycles/s, 
+            awaits by trigger type and GC collections, in self.profiler
+            (a ttboard.cocotb.profiler.Profiler).  A summary is printed
+            once testing is done.
+        '''
+        self.stop_profiling()
+        self.profiler = Profiler(self.clk)
+        return self.profiler
+    
+    def stop_profiling(self):
+        '''
+            Stop profiling.  The profiler, and its TestProfiles, stay 
+            around until the next start_profiling().
+        '''
+        if self.profiler is not None:
+            self.profiler.stop()
+    
+    def _pin_for_gpio(self, gpio:int):
+        for p in self.tt.pins.all:
+            if p.gpio_num == gpio:
+                return p
+        return None
     
     def testing_will_begin(self):
         self._log.debug('About to start a test run')
@@ -84,14 +384,25 @@ class DUT(microcotb.dut.DUT):
         
     def testing_unit_start(self, test:TestCase):
         # override if desired
+        self.stop_hardware_clocks()
+        if self._trace_ids is not None:
+            self.tracer.clear()
+        if self.profiler is not None:
+            self.profiler.test_start(test.name)
         self._log.debug(f'Test {test.name} about to start')
 
 
     def testing_unit_done(self, test:TestCase):
         # override if desired
+        if self.profiler is not None:
+            self.profiler.test_done()
+        self.flush_writes()
+        self.stop_hardware_clocks()
         
         if test.failed:
             self._log.debug(f'{test.name} failed because: {test.failed_msg}')
+            if self._trace_ids is not None and self.trace_failures_to:
+                self._dump_trace(self.trace_failures_to.format(test=test.name))
         else:
             self._log.debug(f'{test.name} passed!')
         
@@ -100,10 +411,41 @@ class DUT(microcotb.dut.DUT):
         # override if desired, but good idea to reset clock pin mode
         # or just call super().testing_unit_done(test) to get it done
         # make sure is an input
+        self.stop_combining_writes()
+        self.stop_hardware_clocks()
         self.tt.pins.rp_projclk.mode = Pins.IN
         
-        self._log.debug('All testing done')
+        if self.profiler is not None:
+            self.profiler.test_done()
+            self.profiler.print_summary()
         
+        self._log.debug('All testing done')
+
+    def write_ports(self, ui_in:int=None, uio_in:int=None, clk:int=None):
+        '''
+            Set any of ui_in, uio_in and clk in the same timestep
+            with a single register write, rather than one
+            write per signal, e.g.
+                dut.write_ports(ui_in=0x42, clk=0)
+        '''
+        self.flush_writes()
+        self.tt.write_ports(ui_in, uio_in, clk)
+        if self._trace_ids is not None:
+            for name, v in [('ui_in', ui_in), ('uio_in', uio_in)]:
+                if v is not None:
+                    self.tracer.record(self._trace_ids[name], v)
+        if clk is not None and self.clk.write_hooks:
+            for hook in self.clk.write_hooks:
+                hook(clk)
+    
+    def _dump_trace(self, path:str):
+        try:
+            with open(path, 'w') as f:
+                self.tracer.write_vcd(f)
+            self._log.warning(f'Trace dumped to {path}')
+        except OSError as e:
+            self._log.error(f'Could not dump trace to {path}: {e}')
+
         
     def __setattr__(self, name:str, value):
         if hasattr(self, name) and name in self.TTIOPortNames:
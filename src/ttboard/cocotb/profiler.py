@@ -0,0 +1,153 @@
+'''
+Created on Oct 18, 2026
+
+Where does the time go, in a test run on the board?
+
+    dut.start_profiling()
+    runner.test(dut)
+
+For every test, this keeps the wall time, the clock cycles simulated
+(on dut.clk, or the fastest clock) and so the cycles achieved per
+second, the number of awaits and the time spent in them, by trigger
+type, and GC collections.  A summary, slowest test first, is printed
+when testing is done:
+
+    test                      wall ms     cycles    cycles/s   gc  awaits (count/ms)
+    test_notes                  61234     262144      4281.0   37  ClockCycles 1024/58210, Timer 12/90
+    ...
+
+Time not spent in awaits is the test's own code (and its logging).
+Awaits are only seen on the ttboard.cocotb.triggers versions of the
+triggers.
+
+On the RP2040 there's no GC collection count: collections are
+counted when the heap in use has shrunk, between samples taken
+on every await, so a few could be missed.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+import gc
+from microcotb.clock import Clock
+from microcotb.time.system import SystemTime
+from ttboard.bench.runner import ticks_us, elapsed_us
+import ttboard.cocotb.triggers as triggers
+
+class TestProfile:
+    def __init__(self, name:str):
+        self.name = name
+        self.wall_us = 0
+        self.cycles = 0
+        self.gc_collections = 0
+        self.awaits = dict() # trigger type -> [count, us]
+
+    @property
+    def cycles_per_sec(self) -> float:
+        if not self.wall_us:
+            return 0
+        return self.cycles * 1000000 / self.wall_us
+
+    @property
+    def await_us(self) -> int:
+        return sum(map(lambda a: a[1], self.awaits.values()))
+
+    def __repr__(self):
+        return f'<TestProfile {self.name} {self.wall_us//1000}ms {self.cycles} cycles>'
+
+
+class Profiler:
+    '''
+        Collects TestProfiles, through the DUT's testing_unit_*
+        calls and the triggers' wait hooks.
+    '''
+    def __init__(self, clk=None):
+        '''
+            @param clk: the signal cycles are counted on (dut.clk)
+        '''
+        self.clk = clk
+        self.profiles = []
+        self._current = None
+        self._wait_start = 0
+        self._heap = 0
+        self._gc_start = 0
+        triggers.WaitHooks.append(self)
+
+    def stop(self):
+        self.test_done()
+        if self in triggers.WaitHooks:
+            triggers.WaitHooks.remove(self)
+
+    def test_start(self, name:str):
+        self.test_done()
+        self._current = TestProfile(name)
+        self._gc_start = self._gc_count()
+        if not hasattr(gc, 'get_stats'):
+            self._heap = gc.mem_alloc()
+        self._sim_start = SystemTime.current().time_in('ns')
+        self._start_us = ticks_us()
+
+    def test_done(self):
+        '''
+            Close the current test, if any.
+        '''
+        prof = self._current
+        if prof is None:
+            return
+        prof.wall_us = elapsed_us(self._start_us)
+        prof.gc_collections += self._gc_count() - self._gc_start
+        clk = None
+        if self.clk is not None:
+            clk = Clock.get(self.clk)
+        if clk is None:
+            clk = Clock.get_fastest()
+        if clk is not None:
+            sim_ns = SystemTime.current().time_in('ns') - self._sim_start
+            prof.cycles = int(sim_ns / clk.period.time_in('ns'))
+        self.profiles.append(prof)
+        self._current = None
+
+    def before_wait(self, trigger):
+        self._sample_heap()
+        self._wait_start = ticks_us()
+
+    def after_wait(self, trigger):
+        prof = self._current
+        if prof is None:
+            return
+        us = elapsed_us(self._wait_start)
+        name = type(trigger).__name__
+        counts = prof.awaits.get(name)
+        if counts is None:
+            prof.awaits[name] = [1, us]
+        else:
+            counts[0] += 1
+            counts[1] += us
+
+    def _gc_count(self) -> int:
+        if hasattr(gc, 'get_stats'):
+            return sum(map(lambda s: s['collections'], gc.get_stats()))
+        # estimated, see _sample_heap
+        return 0
+
+    def _sample_heap(self):
+        if hasattr(gc, 'get_stats') or self._current is None:
+            return
+        heap = gc.mem_alloc()
+        if heap < self._heap:
+            self._current.gc_collections += 1
+        self._heap = heap
+
+    def print_summary(self):
+        '''
+            All tests, slowest first
+        '''
+        header = '{:<24} {:>10} {:>10} {:>11} {:>4}  {}'.format(
+                    'test', 'wall ms', 'cycles', 'cycles/s', 'gc', 'awaits (count/ms)')
+        print(header)
+        print('-'*len(header))
+        for p in sorted(self.profiles, key=lambda p: p.wall_us, reverse=True):
+            awaits = sorted(p.awaits.items(), key=lambda a: a[1][1], reverse=True)
+            awaits = ', '.join(map(lambda a: f'{a[0]} {a[1][0]}/{a[1][1]//1000}', awaits))
+            print('{:<24} {:>10} {:>10} {:>11.1f} {:>4}  {}'.format(
+                    p.name[:24], p.wall_us//1000, p.cycles, p.cycles_per_sec,
+                    p.gc_collections, awaits))
@@ -0,0 +1,73 @@
+'''
+Created on Oct 18, 2026
+
+Records what a DUT testbench does to the project, a clock at a time,
+into a ttboard.stream.session.VectorSession, for replay at hardware
+speed.  Use through the DUT:
+
+    dut.start_recording()
+    ...run the tests...
+    dut.stop_recording().save('/my_tests.ttv')
+
+On every rising edge of dut.clk the inputs (ui_in, the uio pins we
+drive, uio_oe_pico and rst_n) are noted and, once the clock falls,
+the outputs (uo_out and the uio pins the project drives) are read
+and the cycle is added to the session.  Clocks done any other way
+(PIO, PWM) aren't seen.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+import ttboard.util.platform as platform
+from ttboard.stream.session import VectorSession
+import ttboard.log as logging
+log = logging.getLogger(__name__)
+
+class SessionRecorder:
+    def __init__(self, clk, rst_n, max_cycles:int=4096, rst_n_value:int=None):
+        '''
+            @param clk: the DUT's clk (a ClockPin)
+            @param rst_n: the DUT's rst_n (a PinWrapper)
+            @param rst_n_value: current reset state, read from rst_n if None
+        '''
+        self.session = VectorSession(max_cycles)
+        self._clk_pin = clk
+        self._rst_n_pin = rst_n
+        self._clk = platform.read_clock()
+        if rst_n_value is None:
+            rst_n_value = int(rst_n.value)
+        self._rst_n = 1 if rst_n_value else 0
+        self._inputs = None
+        clk.write_hooks.append(self._clock_written)
+        rst_n.write_hooks.append(self._reset_written)
+
+    @property
+    def recording(self) -> bool:
+        return self._clk_pin is not None
+
+    def stop(self) -> VectorSession:
+        if self._clk_pin is not None:
+            self._clk_pin.write_hooks.remove(self._clock_written)
+            self._rst_n_pin.write_hooks.remove(self._reset_written)
+            self._clk_pin = None
+            self._rst_n_pin = None
+        return self.session
+
+    def _reset_written(self, value:int):
+        self._rst_n = 1 if value else 0
+
+    def _clock_written(self, value:int):
+        if value:
+            if not self._clk:
+                oe = platform.read_uio_outputenable()
+                self._inputs = (platform.read_ui_in_byte(),
+                                platform.read_uio_byte() & oe, oe)
+        elif self._clk and self._inputs is not None:
+            ui_in, uio_in, oe = self._inputs
+            self._inputs = None
+            if not self.session.append(ui_in, uio_in, oe, self._rst_n,
+                                       platform.read_uo_out_byte(),
+                                       platform.read_uio_byte() & ~oe & 0xff):
+                log.warn(f'Session full at {self.session.max_cycles} cycles, recording stopped')
+                self.stop()
+        self._clk = 1 if value else 0
@@ -0,0 +1,210 @@
+'''
+Created on Oct 18, 2026
+
+Co-simulation DUT: the same testbenches, run against a python
+behavioral model of the project instead of the chip, so testbench
+logic can be worked on (and run in CI) without a board.
+
+    from ttboard.cocotb.sim import SimDUT
+    from ttboard.sim.model import StepModel
+
+    def step(ui_in, uio_in):
+        return (ui_in ^ 0xff, 0)   # (uo_out, uio_out)
+
+    dut = SimDUT(StepModel(step))
+    dut.add_bit_attribute('some_bit', dut.uo_out, 5)
+    runner.test(dut)
+
+The model is any ttboard.sim.model.DesignModel: reset() on rising
+clock edges while rst_n is low, clock(ui_in, uio_in) on the others,
+inputs_changed() when inputs change in between.  Unlike running the
+desktop DemoBoard with a model attached to the simulated registers
+(ttboard.sim.registers), there is no board here at all: ports read
+and write plain ints, and long ClockCycles waits just step the model.
+
+As on the board, uio_out reads what's on the bidir pins: our
+uio_in where uio_oe_pico is set, the model's uio_out where its
+uio_oe is, 0 elsewhere.  rst_n starts high (pulled up).
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+import microcotb.dut
+from microcotb.dut import NoopSignal
+from microcotb.ports.io import IO
+from ttboard.sim.model import DesignModel, StepModel
+
+class ModelPorts:
+    '''
+        What the project's pins see, between the DUT ports and the model.
+    '''
+    def __init__(self, model:DesignModel):
+        self.model = model
+        self.ui_in = 0
+        self.uio_in = 0
+        self.uio_oe = 0
+        self.clk = 0
+        self.rst_n = 1
+        self.cycles = 0
+
+    def read_ui_in(self) -> int:
+        return self.ui_in
+
+    def write_ui_in(self, v:int):
+        v &= 0xff
+        if v != self.ui_in:
+            self.ui_in = v
+            self.model.inputs_changed(v, self.uio_in & self.uio_oe)
+
+    def read_uo_out(self) -> int:
+        return self.model.uo_out & 0xff
+
+    def read_uio(self) -> int:
+        ours = self.uio_oe
+        theirs = self.model.uio_oe & ~ours
+        return ((self.uio_in & ours) | (self.model.uio_out & theirs)) & 0xff
+
+    def write_uio_in(self, v:int):
+        v &= 0xff
+        if v != self.uio_in:
+            self.uio_in = v
+            self.model.inputs_changed(self.ui_in, v & self.uio_oe)
+
+    def read_uio_oe(self) -> int:
+        return self.uio_oe
+
+    def write_uio_oe(self, v:int):
+        v &= 0xff
+        if v != self.uio_oe:
+            self.uio_oe = v
+            self.model.inputs_changed(self.ui_in, self.uio_in & v)
+
+    def write_clk(self, v:int):
+        v = 1 if v else 0
+        if v and not self.clk:
+            self.step()
+        self.clk = v
+
+    def step(self, num_cycles:int=1):
+        '''
+            Rising edges, inputs held.
+        '''
+        model = self.model
+        self.cycles += num_cycles
+        if not self.rst_n:
+            for _i in range(num_cycles):
+                model.reset()
+            return
+        ui_in = self.ui_in
+        uio_in = self.uio_in & self.uio_oe
+        for _i in range(num_cycles):
+            model.clock(ui_in, uio_in)
+
+
+class SimPin(microcotb.dut.PinWrapper):
+    '''
+        rst_n, or anything else that's just a value
+    '''
+    def __init__(self, name:str, value:int=0):
+        super().__init__(name, None)
+        self._value = value
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, set_to:int):
+        self._value = 1 if set_to else 0
+
+
+class SimResetPin(SimPin):
+    def __init__(self, name:str, ports:ModelPorts):
+        super().__init__(name, ports.rst_n)
+        self._ports = ports
+
+    @property
+    def value(self):
+        return self._ports.rst_n
+
+    @value.setter
+    def value(self, set_to:int):
+        self._ports.rst_n = 1 if set_to else 0
+
+
+class SimClockPin(SimPin):
+    '''
+        Clocks the model on rising edges.  Long ClockCycles()
+        waits (from ttboard.cocotb.triggers) go through burst(),
+        as they would on the board.
+    '''
+    def __init__(self, name:str, ports:ModelPorts):
+        super().__init__(name)
+        self._ports = ports
+        self.allow_bursts = True
+
+    @property
+    def value(self):
+        return self._ports.clk
+
+    @value.setter
+    def value(self, set_to:int):
+        self._ports.write_clk(set_to)
+
+    def can_burst(self, freq_hz:float) -> bool:
+        return True
+
+    def burst(self, num_cycles:int, freq_hz:float):
+        ports = self._ports
+        if ports.clk:
+            ports.clk = 0
+        ports.step(num_cycles)
+
+
+class SimDUT(microcotb.dut.DUT):
+    '''
+        A DUT with the TT ports (uo_out, ui_in, uio_in, uio_out,
+        uio_oe_pico), clk and rst_n, backed by a DesignModel.
+    '''
+    TTIOPortNames = ['uo_out', 'ui_in', 'uio_in',
+                     'uio_out', 'uio_oe_pico']
+
+    def __init__(self, model, name:str='SimDUT'):
+        '''
+            @param model: a DesignModel, or a step function for a StepModel
+        '''
+        super().__init__(name)
+        if not isinstance(model, DesignModel):
+            model = StepModel(model)
+        ports = ModelPorts(model)
+        self.model = model
+        self.ports = ports
+
+        self.clk = SimClockPin('clk', ports)
+        self.rst_n = SimResetPin('rst_n', ports)
+        self.ena = NoopSignal('ena', 1)
+
+        self.uo_out = IO('uo_out', 8, ports.read_uo_out, None)
+        self.ui_in = IO('ui_in', 8, ports.read_ui_in, ports.write_ui_in)
+        self.uio_in = IO('uio_in', 8, ports.read_uio, ports.write_uio_in)
+        self.uio_out = IO('uio_out', 8, ports.read_uio, None)
+        self.uio_oe_pico = IO('uio_oe_pico', 8, ports.read_uio_oe, ports.write_uio_oe)
+
+    @property
+    def cycles(self) -> int:
+        '''
+            Rising clock edges the model has seen
+        '''
+        return self.ports.cycles
+
+    def write_ports(self, ui_in:int=None, uio_in:int=None, clk:int=None):
+        '''
+            As DUT.write_ports(), inputs first, then the clock.
+        '''
+        ports = self.ports
+        if ui_in is not None:
+            ports.write_ui_in(ui_in)
+        if uio_in is not None:
+            ports.write_uio_in(uio_in)
+        if clk is not None:
+            ports.write_clk(clk)
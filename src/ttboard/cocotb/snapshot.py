@@ -0,0 +1,128 @@
+'''
+Created on Oct 18, 2026
+
+Coherent reads of everything on the DUT.
+
+Every dut.uo_out.value, dut.segments.value etc. is its own trip to
+the GPIO registers, so checking a few signals reads the project's
+outputs at a few different times, and they may have changed in
+between.  dut.snapshot() reads GPIO_IN, GPIO_OUT and GPIO_OE once
+each and every named signal--the ports, clk, rst_n and anything
+added with add_bit_attribute()/add_slice_attribute()--decodes from
+those, using masks and shifts worked out ahead of time:
+
+    snap = dut.snapshot()
+    assert snap.segments == digit_segments[snap.prox_select]
+    print(snap.uo_out, snap.clk_config)
+
+Values are plain ints.  Slices of anything other than the DUT's
+own ports aren't in snapshots.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+import ttboard.util.platform as platform
+
+# register index in platform.read_gpio_state()
+RegIn = 0
+RegOut = 1
+RegOE = 2
+
+class Snapshot:
+    '''
+        Register values, as read at one point in time,
+        and the decoder to get signals out of them.
+    '''
+    def __init__(self, regs:tuple, decoder):
+        self.regs = regs
+        self._decoder = decoder
+
+    @property
+    def names(self) -> list:
+        return self._decoder.names
+
+    def __getattr__(self, name:str):
+        # only called for what isn't a real attribute
+        return self._decoder.decode(name, self.regs)
+
+    def __getitem__(self, name:str):
+        return self._decoder.decode(name, self.regs)
+
+    def as_dict(self) -> dict:
+        regs = self.regs
+        decode = self._decoder.decode
+        return dict(map(lambda n: (n, decode(n, regs)), self._decoder.names))
+
+    def __repr__(self):
+        return f'<Snapshot {self.as_dict()}>'
+
+
+class SnapshotDecoder:
+    '''
+        name -> (register, gather function, shift, mask), with
+        the gather pulling the whole port out of the register
+    '''
+    def __init__(self):
+        self._table = dict()
+
+    @property
+    def names(self) -> list:
+        return list(self._table.keys())
+
+    def add_port(self, name:str, reg:int, gpios:list):
+        self._table[name] = (reg, self.gather_function(gpios), 0, (1 << len(gpios)) - 1)
+
+    def add_bit(self, name:str, reg:int, gpio:int):
+        self._table[name] = (reg, None, gpio, 1)
+
+    def add_slice(self, name:str, port:str, start:int, end:int=None):
+        reg, gather, _shift, _mask = self._table[port]
+        if end is None:
+            end = start
+        low = min(start, end)
+        width = abs(start - end) + 1
+        self._table[name] = (reg, gather, low, (1 << width) - 1)
+
+    def has(self, name:str) -> bool:
+        return name in self._table
+
+    def decode(self, name:str, regs:tuple) -> int:
+        try:
+            reg, gather, shift, mask = self._table[name]
+        except KeyError:
+            raise AttributeError(f'No {name} in snapshot')
+        v = regs[reg]
+        if gather is not None:
+            v = gather(v)
+        return (v >> shift) & mask
+
+    @staticmethod
+    def gather_function(gpios:list):
+        '''
+            Function pulling bits gpios[0], gpios[1]... of a
+            register value into bits 0, 1..., a shift and mask
+            per run of consecutive GPIO.
+        '''
+        segs = []
+        start = 0
+        n = len(gpios)
+        for i in range(1, n + 1):
+            if i == n or gpios[i] != gpios[i-1] + 1:
+                segs.append((gpios[start] - start, ((1 << (i - start)) - 1) << start))
+                start = i
+        if min(map(lambda s: s[0], segs)) >= 0:
+            if len(segs) == 1:
+                shift, mask = segs[0]
+                return lambda v: (v >> shift) & mask
+            if len(segs) == 2:
+                (s0, m0), (s1, m1) = segs
+                return lambda v: ((v >> s0) & m0) | ((v >> s1) & m1)
+        def gather(v):
+            r = 0
+            for shift, mask in segs:
+                r |= ((v >> shift) if shift >= 0 else (v << -shift)) & mask
+            return r
+        return gather
+
+    def snapshot(self) -> Snapshot:
+        return Snapshot(platform.read_gpio_state(), self)
@@ -0,0 +1,182 @@
+'''
+Created on Oct 18, 2026
+
+Signal tracer for DUT testbenches running on the board.
+
+When a test fails on the board, all we have is the log.  With
+tracing on, every port write (and every read of the outputs) is
+appended to a preallocated ring buffer, as
+
+    (simulated time since last record, signal id, value)
+
+and, after the fact, dumped as a VCD for gtkwave/surfer, to a
+file on flash or straight over serial:
+
+    dut.start_trace()           # on the DUT, from ttboard.cocotb.dut
+    ...run tests...
+    dut.tracer.write_vcd(open('/trace.vcd', 'w'))
+    dut.tracer.write_vcd(sys.stdout)
+
+Recording only costs a time lookup and a few array stores, and
+the buffer is never grown, so it's fine to leave on.  Times are
+kept in ns, so anything finer than that (TimeValue.BaseUnits
+lowered to ps for fast clocks) is rounded down.  Once the
+buffer is full, the oldest records are dropped.  Repeated values
+(e.g. polling uo_out) are only recorded when they change.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+from array import array
+from microcotb.time.system import SystemTime
+from ttboard.util.vcd import VCDWriter
+
+MaxDelta = 0xffffffff
+
+class SignalTracer:
+    '''
+        Ring buffer of signal changes, in simulated time.
+    '''
+    def __init__(self, capacity:int=4096):
+        self.capacity = capacity
+        self._deltas = array('I', bytearray(4*capacity))
+        self._ids = bytearray(capacity)
+        self._values = bytearray(capacity)
+        self._names = []
+        self._widths = []
+        self._last_values = []
+        self._unhooks = []
+        self.clear()
+
+    def clear(self):
+        '''
+            Drop all records, keep the signals.
+        '''
+        self._head = 0
+        self._count = 0
+        self._base_ns = 0
+        self._last_ns = 0
+        self._offset_ns = 0
+        for i in range(len(self._last_values)):
+            self._last_values[i] = None
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def signals(self) -> list:
+        return list(self._names)
+
+    def add_signal(self, name:str, width:int=8) -> int:
+        '''
+            @return: the id to record() with
+        '''
+        if len(self._names) > 255:
+            raise ValueError('Too many traced signals')
+        self._names.append(name)
+        self._widths.append(width)
+        self._last_values.append(None)
+        return len(self._names) - 1
+
+    def record(self, sig_id:int, value:int):
+        value = int(value) & 0xff
+        if self._last_values[sig_id] == value:
+            return
+        self._last_values[sig_id] = value
+
+        # always ns, whatever TimeValue.BaseUnits, to match the VCD timescale
+        now = int(SystemTime.current().time_in('ns')) + self._offset_ns
+        last = self._last_ns
+        if now < last:
+            # simulated time was reset (new test), keep trace
+            # time running on from where it was
+            self._offset_ns += last - now
+            now = last
+        delta = now - last
+        if delta > MaxDelta:
+            delta = MaxDelta
+        self._last_ns = now
+
+        i = self._head
+        if self._count == self.capacity:
+            # oldest record goes
+            self._base_ns += self._deltas[i]
+        else:
+            self._count += 1
+        self._deltas[i] = delta
+        self._ids[i] = sig_id
+        self._values[i] = value
+        i += 1
+        self._head = 0 if i == self.capacity else i
+
+    def records(self):
+        '''
+            Generator of (time in ns, signal name, value),
+            oldest first
+        '''
+        i = self._head - self._count
+        if i < 0:
+            i += self.capacity
+        t = self._base_ns
+        for _n in range(self._count):
+            t += self._deltas[i]
+            yield (t, self._names[self._ids[i]], self._values[i])
+            i += 1
+            if i == self.capacity:
+                i = 0
+
+    def write_vcd(self, stream):
+        '''
+            Dump the trace as VCD, to anything with a write(str)
+            method (open file, sys.stdout...).
+        '''
+        vcd = VCDWriter(stream, timescale='1ns', module='dut')
+        vcd_ids = dict()
+        for i in range(len(self._names)):
+            vcd_ids[self._names[i]] = vcd.add_signal(self._names[i], self._widths[i])
+        vcd.write_header(f'{self._count} records')
+        t = 0
+        for t, name, value in self.records():
+            vcd.change(t, vcd_ids[name], value)
+        vcd.finish(t)
+
+    def attach_port(self, name:str, io) -> int:
+        '''
+            Trace reads and writes on io (an IO or OutputEnable),
+            through its hooks.
+        '''
+        sig_id = self.add_signal(name, io.port.width)
+        hooks = io.hooks
+        record = self.record
+        hook = lambda v: record(sig_id, v)
+        hooks.add_read_hook(hook)
+        hooks.add_write_hook(hook)
+
+        def unhook():
+            hooks.remove_read_hook(hook)
+            hooks.remove_write_hook(hook)
+        self._unhooks.append(unhook)
+        return sig_id
+
+    def attach_pin(self, name:str, pin) -> int:
+        '''
+            Trace writes to a DUT pin wrapper (clk, rst_n), 
+            through its write_hooks.
+        '''
+        sig_id = self.add_signal(name, 1)
+        record = self.record
+        hook = lambda v: record(sig_id, v)
+        pin.write_hooks.append(hook)
+
+        def unhook():
+            pin.write_hooks.remove(hook)
+        self._unhooks.append(unhook)
+        return sig_id
+
+    def detach(self):
+        '''
+            Stop tracing, the records stay.
+        '''
+        for unhook in self._unhooks:
+            unhook()
+        self._unhooks = []
@@ -0,0 +1,188 @@
+'''
+Created on Oct 18, 2026
+
+microcotb triggers, with a fast path for ClockCycles on the
+DUT's clk, so testbenches only need to change their import:
+
+    from ttboard.cocotb.triggers import RisingEdge, FallingEdge, ClockCycles, Timer
+
+Stepping through a ClockCycles() wait in microcotb means a
+SystemTime advance, and a python clock toggle, per half period.
+When nothing else needs to see those intermediate edges--the only
+other clocks running are on PIO already (see clock.HardwareClock)--
+a long wait on dut.clk is done as a single PIO clock burst
+instead, at the Clock's frequency, and simulated time jumps to
+where the stepping would have left it, with the Clock in the same
+state.  Anything else falls back to the standard, per edge, path.
+
+RisingEdge/FallingEdge on a bit we read (dut.led = uo_out[0], see 
+dut.BitAttribute), when nothing is toggled from python--no clocks, 
+or only HardwareClocks, e.g. a project clocked by PWM or PIO--are
+timed by a PIO state machine (platform.PIOEdgeTimer) instead of 
+polling the port each step.  Simulated time follows real time while
+waiting, and lands exactly on the edge, so get_sim_time() deltas 
+around such waits (pulse widths and the like) are real to within 
+a few ns, rather than to whenever the port happened to be read.
+
+All of these commit any writes held by the DUT's write combining
+(see ttboard.cocotb.combine) before waiting, and let anything in
+WaitHooks (e.g. the profiler) know about the wait.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+from microcotb.clock import Clock
+from microcotb.time.system import SystemTime
+from microcotb.time.value import TimeValue
+import microcotb.triggers.clockcycles
+import microcotb.triggers.edge
+import microcotb.triggers.timer
+from ttboard.cocotb.clock import HardwareClock
+from ttboard.cocotb.combine import WriteCombiner
+import ttboard.util.time as time
+import ttboard.log as logging
+log = logging.getLogger(__name__)
+
+# objects with before_wait(trigger)/after_wait(trigger) methods
+WaitHooks = []
+
+def _before_wait(trigger):
+    WriteCombiner.flush_all()
+    for hook in WaitHooks:
+        hook.before_wait(trigger)
+
+def _after_wait(trigger):
+    for hook in WaitHooks:
+        hook.after_wait(trigger)
+
+class ClockCycles(microcotb.triggers.clockcycles.ClockCycles):
+    BurstMinCycles = 8
+
+    def next(self):
+        _before_wait(self)
+        try:
+            if not self._burst():
+                return super().next()
+        finally:
+            _after_wait(self)
+        raise StopIteration
+
+    def _burst(self) -> bool:
+        sig = self.signal
+        if self.num_cycles < self.BurstMinCycles or not getattr(sig, 'allow_bursts', False):
+            return False
+        clk = Clock.get(sig)
+        if clk is None:
+            return False
+        for other in Clock.all():
+            if other is not clk and not isinstance(other, HardwareClock):
+                # something else toggles as time advances
+                return False
+        freq = 1/clk.period.time_in('sec')
+        if not sig.can_burst(freq):
+            return False
+
+        value = 1 if sig.value else 0
+        transitions = self.num_cycles * 2
+        if (self.rising and value == 0) or (not self.rising and value == 1):
+            transitions -= 1
+        self.num_transitions = transitions
+
+        # bursts are whole cycles, starting and ending low
+        clk.current_signal_value = value
+        remaining = transitions
+        if value:
+            clk.toggle()
+            remaining -= 1
+        if remaining >= 2:
+            sig.burst(remaining // 2, freq)
+            clk.current_signal_value = 0
+        if remaining % 2:
+            clk.toggle()
+
+        # time moves on as it would have, a step at a time, and
+        # the clock knows those toggles have happened
+        span = clk.half_period * transitions
+        clk.next_toggle += span
+        increment = Clock.get_shortest_event_interval()
+        SystemTime.advance(increment * (int(span / increment) + 1))
+        return True
+
+
+class TimedEdge:
+    '''
+        Edge wait through the signal's edge_timer, where possible
+    '''
+    Rising = True
+    CatchUpIntervalUs = 1000
+    
+    def prepare_for_wait(self):
+        _before_wait(self)
+        self._timer = None
+        if self._can_time_edge():
+            sig = self.signal
+            self._sim_start_ns = SystemTime.current().time_in('ns')
+            try:
+                sig.edge_timer.arm(self.Rising)
+                self._timer = sig.edge_timer
+            except RuntimeError as e:
+                log.warn(f'No edge timing for {sig.name}, polling: {e}')
+                sig.timed_edges = False
+            self._real_start_us = time.ticks_us()
+        if self._timer is None:
+            return super().prepare_for_wait()
+    
+    def wait_for_conditions(self):
+        try:
+            self._wait_for_conditions()
+        finally:
+            _after_wait(self)
+    
+    def _wait_for_conditions(self):
+        timer = self._timer
+        if timer is None:
+            return super().wait_for_conditions()
+        try:
+            last_catch_up = 0
+            while True:
+                real_us = time.ticks_diff(time.ticks_us(), self._real_start_us)
+                if timer.fired:
+                    break
+                if real_us - last_catch_up >= self.CatchUpIntervalUs:
+                    # edge is still to come, sim time can follow 
+                    # real time this far (and time out)
+                    self._advance_to(real_us * 1000)
+                    last_catch_up = real_us
+            self._advance_to(timer.elapsed_us * 1000)
+        finally:
+            timer.disarm()
+    
+    def _advance_to(self, since_start_ns:float):
+        delta = int(self._sim_start_ns + since_start_ns - SystemTime.current().time_in('ns'))
+        if delta > 0:
+            SystemTime.advance(TimeValue(delta, 'ns'))
+    
+    def _can_time_edge(self) -> bool:
+        sig = self.signal
+        if getattr(sig, 'gpio', None) is None or not getattr(sig, 'timed_edges', False):
+            return False
+        for clk in Clock.all():
+            if not isinstance(clk, HardwareClock):
+                # edges happen as python toggles the clocks, 
+                # in simulated time
+                return False
+        return True
+
+class RisingEdge(TimedEdge, microcotb.triggers.edge.RisingEdge):
+    Rising = True
+
+class FallingEdge(TimedEdge, microcotb.triggers.edge.FallingEdge):
+    Rising = False
+
+class Timer(microcotb.triggers.timer.Timer):
+    def run_timer(self):
+        _before_wait(self)
+        try:
+            super().run_timer()
+        finally:
+            _after_wait(self)
@@ -31,6 +31,7 @@ class UserProjectConfig:
             - uio_oe_pico (int)
             - uio_in (int)
             - clock_frequency (int) project clock
+            - clock_source (str) pwm or pio, for the project clock
             - rp_clock_frequency (int) RP2040 system clock frequency
             
         all keys are optional.
@@ -43,6 +44,7 @@ class UserProjectConfig:
                          'uio_oe_pico',
                          'uio_in',
                          'clock_frequency',
+                         'clock_source',
                          'rp_clock_frequency']
     
     
@@ -133,6 +135,20 @@ class UserConfig:
             force_demoboard = tt06
             
             
+            # clock_source
+            # how the project clock is generated
+            #  - pwm: may change the RP2040 system clock to get 
+            #         the requested frequency
+            #  - pio: fractional PIO divider, system clock untouched
+            # clock_source = pwm
+            
+            
+            # stats
+            # count mux switches, pin re-inits, port reads/writes
+            # and system clock changes from startup (see tt.stats())
+            # stats = yes
+            
+            
         Each project section is named [SHUTTLE_PROJECT_NAME]
         and will be an instance of, and described by, UserProjectConfig
     '''
@@ -149,7 +165,8 @@ class UserConfig:
             
             
         def_opts = ['mode', 'project', 'start_in_reset', 'log_level',
-                    'rp_clock_frequency', 'force_shuttle', 'force_demoboard']
+                    'rp_clock_frequency', 'force_shuttle', 'force_demoboard',
+                    'stats', 'clock_source']
         for opt in def_opts:
             val = None
             if conf.has_option('DEFAULT', opt):
@@ -199,6 +216,14 @@ class UserConfig:
     def force_demoboard(self):
         return self._get_default_option('force_demoboard')
     
+    @property 
+    def default_clock_source(self):
+        return self._get_default_option('clock_source')
+    
+    @property 
+    def stats(self):
+        return self._get_default_option('stats', False)
+    
     
     @classmethod 
     def string_to_loglevel(cls, loglevname:str):
@@ -23,6 +23,10 @@ from ttboard.pins.pins import Pins
 from ttboard.project_mux import Design
 from ttboard.config.user_config import UserConfig
 import ttboard.util.platform as platform 
+import ttboard.util.stats as stats
+import ttboard.clocking.planner as clock_planner
+from ttboard.clocking.system import SystemClock
+from ttboard.shmoo.results import ShmooResults
 from ttboard.boot.demoboard_detect import DemoboardDetect, DemoboardVersion, DemoboardCarrier
 
 import ttboard.log as logging
@@ -138,11 +142,19 @@ class DemoBoard:
             
             
             
+        if self.user_config.stats:
+            stats.enable()
+        
         self.pins = Globals.pins(mode=mode)
         
         ports = ['uo_out', 'ui_in', 'uio_in', 'uio_out', 'uio_oe_pico']
         for p in ports:
             setattr(self, p, getattr(self.pins, p))
+        
+        if stats.Enabled:
+            # restart, to pick up the ports
+            stats.disable()
+            stats.enable(self.pins)
 
         # Make sure we can read the ROM even if the user has set some of the ui_in DIP switches
         pins_mode = self.pins.mode
@@ -161,7 +173,16 @@ class DemoBoard:
         # internal
         self.shuttle.design_enabled_callback = self.apply_user_config
         self._clock_pwm = None
+        self._clock_pwm_freq = 0
+        self._clock_pwm_duty = 0
         self._clock_pio = None 
+        self._clock_burst = None
+        self._shmoo_results = None
+        
+        # all system clock changes go through here, and we
+        # get to re-jig the PWM clock when they happen
+        self.system_clock = SystemClock.get()
+        self.system_clock.add_consumer(self)
         
         self._project_previously_loaded = {}
         self.load_default_project() 
@@ -310,6 +331,7 @@ class DemoBoard:
             between the changes (in ms)
         '''
         log.debug('clock project once')
+        self.clock_cycles_wait()
         if self.is_auto_clocking:
             self.clock_project_stop()
             
@@ -319,22 +341,157 @@ class DemoBoard:
             time.sleep_ms(msDelay)
         self.clk.toggle()
         
+    def clock_cycles(self, num_cycles:int, freq:int=None, blocking:bool=True):
+        '''
+            Clock the project exactly num_cycles times, using PIO 
+            so bursts of thousands of cycles are cheap, e.g.
+
+                tt.clock_cycles(1000)
+                tt.clock_cycles(50_000, freq=1_000_000, blocking=False)
+                # ... do other stuff
+                tt.clock_cycles_wait()
+
+            Any auto-clocking is stopped.  Once done (on return, if
+            blocking, or after clock_cycles_wait() otherwise) the clock
+            pin is back to being a plain output, low.
+
+            @param num_cycles: number of clock pulses
+            @param freq: clock rate, defaults to max (system clock/2)
+            @param blocking: wait for the burst to complete
+        '''
+        if num_cycles < 1:
+            return
+        self.clock_cycles_wait()
+        if self.is_auto_clocking:
+            self.clock_project_stop()
+        self.pins.project_clk_driven_by_RP2040(True)
+        self.pins.rp_projclk(0)
+        if self._clock_burst is None:
+            self._clock_burst = platform.PIOClockBurst(self.pins.rp_projclk.raw_pin)
+            self.system_clock.add_consumer(self._clock_burst)
+        self._clock_burst.start(num_cycles, freq)
+        if blocking:
+            self.clock_cycles_wait()
+
+    @property
+    def clock_cycles_busy(self) -> bool:
+        '''
+            True while a non-blocking clock_cycles() is in progress
+        '''
+        return self._clock_burst is not None and self._clock_burst.busy
+
+    def clock_cycles_wait(self):
+        '''
+            Wait for any clock_cycles() burst to complete and
+            return the clock pin to SIO, output low.
+        '''
+        if self._clock_burst is None:
+            return
+        self._clock_burst.release()
+
+    def run_vectors(self, stim, capture=None, clocks_per_vector:int=1, capture_uio:bool=False):
+        '''
+            Batch stimulus/response: for each byte in stim, ui_in is
+            set, the project is clocked clocks_per_vector times and
+            uo_out is sampled into capture (followed by uio, if
+            capture_uio is set, so 2 bytes per vector).
+
+            The whole buffer is walked in a single native loop,
+            bypassing the port objects, e.g.
+
+                stim = bytearray(range(256))
+                results = tt.run_vectors(stim)
+
+            @param stim: bytes/bytearray of ui_in values
+            @param capture: optional preallocated bytearray for results
+            @param clocks_per_vector: project clock pulses per vector
+            @param capture_uio: also sample the bidir pins
+            @return: the capture buffer
+        '''
+        stride = 2 if capture_uio else 1
+        if capture is None:
+            capture = bytearray(len(stim)*stride)
+        if not len(stim):
+            return capture
+
+        self._take_project_io_control('Running vectors')
+        platform.apply_vectors(stim, clocks_per_vector, capture, capture_uio)
+
+        # keep port objects' notion of last written value in sync
+        self.ui_in.port.do_force_update_last_value(stim[-1])
+        return capture
+
+    def _take_project_io_control(self, purpose:str):
+        '''
+            Get ready for something other than the port objects
+            to drive ui_in and the project clock: auto-clocking
+            stopped, clock low and driven by the RP2040, mux 
+            (if any) letting project I/O through.
+        '''
+        if self.mode != RPMode.ASIC_RP_CONTROL:
+            log.warn(f'{purpose} in mode {self.mode_str}: ui_in may not be driven')
+
+        self.clock_cycles_wait()
+
+        if self.is_auto_clocking:
+            self.clock_project_stop()
+        self.pins.project_clk_driven_by_RP2040(True)
+        self.clk(0)
+        if self.pins.demoboard_uses_mux:
+            self.pins.muxCtrl.mode_project_IO()
+
+    def write_ports(self, ui_in:int=None, uio_in:int=None, clk:int=None):
+        '''
+            Change any of ui_in, uio_in and the project clock
+            together, with a single register write, so they
+            all hit the pins at the same instant, e.g.
+
+                tt.write_ports(ui_in=0x12, clk=1)
+
+            Ports left as None are untouched.  Only bidir pins
+            configured as outputs (see uio_oe_pico) will actually
+            be driven.
+        '''
+        if ui_in is not None:
+            ui_in = int(ui_in)
+        if uio_in is not None:
+            uio_in = int(uio_in)
+        if clk is not None:
+            clk = 1 if clk else 0
+
+        platform.write_ports(ui_in, uio_in, clk)
+
+        # keep port objects' notion of last written value in sync
+        if ui_in is not None:
+            self.ui_in.port.do_force_update_last_value(ui_in)
+        if uio_in is not None:
+            self.uio_in.port.do_force_update_last_value(uio_in)
+
     def _clock_pwm_deinit(self):
         if self._clock_pwm is None:
             return 
         
         self._clock_pwm.deinit()
         self._clock_pwm = None 
+        self._clock_pwm_freq = 0
         
-    def clock_project_PWM(self, freqHz:int, duty_u16:int=(0xffff/2), quiet:bool=False, max_rp2040_freq:int=133_000_000):
+    def clock_project_PWM(self, freqHz:int, duty_u16:int=(0xffff/2), quiet:bool=False, max_rp2040_freq:int=133_000_000,
+                          use_pio:bool=None):
         '''
             Start an automatic clock for the selected project (using
-            PWM).
+            PWM or PIO).
             @param freqHz: The frequency of the clocking, in Hz, or 0 to disable PWM
-            @param duty_u16: Optional duty cycle (0-0xffff), defaults to 50%
+            @param duty_u16: Optional duty cycle (0-0xffff), defaults to 50% (PWM only)
             @param max_rp2040_freq: Maximum RP2040 frequency, overclocking above 133MHz allows higher clock frequencies
+            @param use_pio: generate the clock with PIO, at the current system clock, rather
+                            than PWM, which may change the system clock to get the requested 
+                            frequency.  Defaults to the clock_source config setting (pwm).
+                            Clocks under 3Hz always use PIO.
         '''
+        if use_pio is None:
+            use_pio = self._clock_source_is_pio(None)
         if freqHz > 0:
+            self.clock_cycles_wait()
             self.pins.project_clk_driven_by_RP2040(True)
             
         
@@ -345,36 +502,88 @@ class DemoBoard:
                 self._clock_pio.stop()
             return 
         
-        if freqHz < 3:
+        if freqHz < 3 or use_pio:
             # make sure we're not PWMing
             self._clock_pwm_deinit()
                 
             if self._clock_pio is None:
                 self._clock_pio = platform.PIOClock(self.pins.rp_projclk.raw_pin)
+                self.system_clock.add_consumer(self._clock_pio)
+            
+            try:
+                self._clock_pio.start(freqHz)
+            except ValueError as e:
+                log.error(f"Could not set project clock PIO: {e}")
+                return None
             
-            self._clock_pio.start(freqHz)
-            log.info(f"Clocking at {freqHz}Hz using PIO clock")
+            actual_freq = self._clock_pio.actual_freq
+            if abs(actual_freq - freqHz) > 1:
+                log.warn(f"Requested {freqHz}Hz clock, actual: {actual_freq}Hz, using PIO clock")
+            else:
+                log.info(f"Clocking at {actual_freq}Hz using PIO clock")
         else:
             # make sure we're not PIOing
             if self._clock_pio is not None:
                 self._clock_pio.stop()
             try:
-                rp2040_sys_clock = self._get_best_rp2040_freq(freqHz, max_rp2040_freq)
-                if rp2040_sys_clock != platform.get_RP_system_clock():
-                    log.info(f'Setting RP2040 system clock to {rp2040_sys_clock}Hz')
-                    platform.set_RP_system_clock(rp2040_sys_clock)
+                plan = clock_planner.plan(freqHz, max_rp2040_freq, self.system_clock.target)
+                self.system_clock.require('project_clock', plan.sys_hz)
                 self._clock_pwm = self.pins.rp_projclk.pwm(freqHz, duty_u16)
+                self._clock_pwm_freq = freqHz
+                self._clock_pwm_duty = duty_u16
+                # use the planned dividers, rather than whatever PWM.freq() came up with
+                platform.pwm_configure(self.pins.rp_projclk.gpio_num, plan.div16, plan.top, duty_u16)
             except  Exception as e:
                 log.error(f"Could not set project clock PWM: {e}")
+                return self._clock_pwm
                 
-            actual_freq = self._clock_pwm.freq()
-            if abs(actual_freq - freqHz) > 1:
-                log.warn(f"Requested {freqHz}Hz clock, actual: {actual_freq}Hz")
+            if abs(plan.error_hz) > 1:
+                log.warn(f"Requested {freqHz}Hz clock, actual: {plan.freq_hz}Hz")
             else:
-                log.info(f"Clocking at {actual_freq}Hz")
+                log.info(f"Clocking at {plan.freq_hz}Hz")
+            if not plan.jitter_free:
+                log.info(f"Project clock has {plan.jitter_ns}ns jitter")
             
         return self._clock_pwm
     
+    def system_clock_changed(self, old_hz:int, new_hz:int):
+        '''
+            SystemClock consumer callback: keep the PWM project
+            clock where it was.
+        '''
+        if self._clock_pwm is None or not self._clock_pwm_freq:
+            return
+        plan = clock_planner.planner().plan_for_system_clock(self._clock_pwm_freq, new_hz)
+        if plan is None:
+            log.error(f'Project clock {self._clock_pwm_freq}Hz impossible at {new_hz}Hz, stopping')
+            self.clock_project_stop()
+            return
+        platform.pwm_configure(self.pins.rp_projclk.gpio_num, plan.div16, plan.top, self._clock_pwm_duty)
+        log.debug(f'Project clock now {plan.freq_hz}Hz')
+    
+    def _clock_source_is_pio(self, project_setting:str=None) -> bool:
+        source = project_setting
+        if source is None:
+            source = self.user_config.default_clock_source
+        if source is None:
+            return False
+        return source.lower() == 'pio'
+    
+    def clock_project_measure(self, window_ms:int=100) -> float:
+        '''
+            Measure the project clock actually on the pin, by counting
+            edges for window_ms, and report it against what was requested.
+            @return: measured frequency, in Hz (None if can't be measured, 
+                     e.g. off-target)
+        '''
+        measured = platform.measure_frequency(self.pins.rp_projclk.raw_pin, window_ms)
+        requested = self.auto_clocking_freq
+        if measured is None:
+            log.warn('Project clock cannot be measured here')
+        else:
+            log.info(f'Project clock measured at {measured}Hz (requested {requested}Hz)')
+        return measured
+    
     def clock_project_stop(self):
         '''
             Stop any started automatic project clocking.  No effect 
@@ -392,68 +601,18 @@ class DemoBoard:
             if present, or RP2040SystemClockDefaultHz
         '''
         # nothing set in project config, assume we want default system clock
-        
-        current_sys_clock = platform.get_RP_system_clock()
-        def_sys_clock = self.user_config.default_rp_clock
-        if def_sys_clock is None:
-            def_sys_clock = platform.RP2040SystemClockDefaultHz 
-        
-        if def_sys_clock != current_sys_clock and def_sys_clock > 0:
-            self.clock_project_stop() # ensure we aren't PWMing
-            log.info(f'Resetting system clock to default {def_sys_clock}Hz')
-            try:
-                platform.set_RP_system_clock(def_sys_clock)
-            except ValueError:
-                log.error(f'Default sys clock setting {def_sys_clock} is invalid?')
+        with self.system_clock.batch():
+            self.system_clock.default_hz = self.user_config.default_rp_clock
+            self.system_clock.release('project_config')
+            self.system_clock.release('project_clock')
     
     
     def _get_best_rp2040_freq(self, freq:int, max_rp2040_freq:int=133_000_000):
-        # Scan the allowed RP2040 frequency range for a frequency
-        # that will divide to the target frequency well
-        min_rp2040_freq = 48_000_000
-    
-        if freq > max_rp2040_freq // 2:
-            raise ValueError("Requested frequency too high")
-        if freq <= min_rp2040_freq // (2**24 - 1):
-            raise ValueError("Requested frequency too low")
-    
-        best_freq = 0
-        best_fracdiv = 2000000000
-        best_div = 0
-    
-        rp2040_freq = min(max_rp2040_freq, freq * (2**24 - 1))
-        if rp2040_freq > 136_000_000:
-            rp2040_freq = (rp2040_freq // 2_000_000) * 2_000_000
-        else:
-            rp2040_freq = (rp2040_freq // 1_000_000) * 1_000_000
-    
-        while rp2040_freq >= 48_000_000 and rp2040_freq >= 1.9 * freq:
-            next_rp2040_freq = rp2040_freq - 1_000_000
-            if next_rp2040_freq > 136_000_000:
-                next_rp2040_freq = rp2040_freq - 2_000_000
-    
-            # Work out the closest multiple of 2 divisor that could be used
-            pwm_divisor = max((rp2040_freq // (2 * freq)) * 2, 2)
-            if abs(int(rp2040_freq / pwm_divisor + 0.5) - freq) > abs(
-                int(rp2040_freq / (pwm_divisor + 2) + 0.5) - freq
-            ):
-                pwm_divisor += 2
-    
-            # Check if the target freq will be acheived
-            fracdiv = abs(rp2040_freq / freq - pwm_divisor)
-            if freq == rp2040_freq // pwm_divisor:
-                return rp2040_freq
-            elif fracdiv < best_fracdiv:
-                best_fracdiv = fracdiv
-                best_freq = rp2040_freq
-                best_div = pwm_divisor
-    
-            rp2040_freq = next_rp2040_freq
-    
-        if best_fracdiv >= 1.0 / 256:
-            print(f"freq_jitter_free={best_freq // best_div}")
-    
-        return best_freq
+        '''
+            RP2040 system clock that will divide to the target frequency best
+            (see ttboard.clocking.planner)
+        '''
+        return clock_planner.plan(freq, max_rp2040_freq, self.system_clock.target).sys_hz
     
     
     
@@ -494,11 +653,12 @@ class DemoBoard:
             # nothing to do for specific project, 
             # ensure clocks are all behaving nicely
             
-            self.reset_system_clock()
-            self.clock_project_stop()
-            self._first_encouter_reset(design)
-            if design.clock_hz:
-                self.clock_project_PWM(design.clock_hz)
+            with self.system_clock.batch():
+                self.reset_system_clock()
+                self.clock_project_stop()
+                self._first_encouter_reset(design)
+                if design.clock_hz:
+                    self.clock_project_PWM(self._clock_limited(design, design.clock_hz))
             return 
         
         projConfig = self.user_config.project(design.name)
@@ -548,32 +708,72 @@ class DemoBoard:
                             self.uio_in[i] = 1
                             
         
-        current_sys_clock = platform.get_RP_system_clock()
-        if projConfig.has('rp_clock_frequency'):
-            sys_clk_hz = projConfig.rp_clock_frequency
-            if sys_clk_hz != current_sys_clock:
-                self.clock_project_stop() # ensure we aren't PWMing
-                log.info(f'Setting system clock to {sys_clk_hz}Hz')
-                try:
-                    platform.set_RP_system_clock(sys_clk_hz)
-                except ValueError:
-                    log.error(f"Could not set system clock to requested {sys_clk_hz}Hz")
-        else:
+        # system clock and project clock settled together, so
+        # the system clock changes (at most) once
+        with self.system_clock.batch():
             self.reset_system_clock()
-                    
-        if projConfig.has('clock_frequency'):
-            if self.mode == RPMode.ASIC_MANUAL_INPUTS:
-                log.info('In "manual inputs" mode but clock freq set--setting up for CLK/RST RP ctrl')
-                self.pins.project_clk_driven_by_RP2040(True)
-            self.clock_project_PWM(projConfig.clock_frequency)
-        else:
-            self.clock_project_stop()
+            if projConfig.has('rp_clock_frequency'):
+                self.system_clock.require('project_config', projConfig.rp_clock_frequency)
+                        
+            if projConfig.has('clock_frequency'):
+                if self.mode == RPMode.ASIC_MANUAL_INPUTS:
+                    log.info('In "manual inputs" mode but clock freq set--setting up for CLK/RST RP ctrl')
+                    self.pins.project_clk_driven_by_RP2040(True)
+                self.clock_project_PWM(self._clock_limited(design, projConfig.clock_frequency), 
+                                       use_pio=self._clock_source_is_pio(projConfig.clock_source))
+            else:
+                self.clock_project_stop()
             
         
         if not startInReset:
             self._first_encouter_reset(design)
             
             
+    @property 
+    def shmoo_results(self) -> ShmooResults:
+        '''
+            Measured max project clocks, per design (see ttboard.shmoo)
+        '''
+        if self._shmoo_results is None:
+            self._shmoo_results = ShmooResults()
+        return self._shmoo_results
+    
+    def _clock_limited(self, design:Design, freqHz:int) -> int:
+        limit = self.shmoo_results.max_hz(design.name)
+        if limit is not None and freqHz > limit:
+            log.warn(f'"{design.name}" measured max clock is {limit}Hz, using that rather than {freqHz}Hz')
+            return limit
+        return freqHz
+            
+    @property 
+    def stats_enabled(self) -> bool:
+        return stats.Enabled
+    
+    @stats_enabled.setter 
+    def stats_enabled(self, enable:bool):
+        '''
+            Turn hot-path counters on/off.  When off (the 
+            default) nothing is instrumented at all.
+        '''
+        if enable:
+            stats.enable(self.pins)
+        else:
+            stats.disable()
+    
+    def stats(self, quiet:bool=False) -> dict:
+        '''
+            Summary of mux switches, pin re-inits, port reads/writes,
+            project mux resets and system clock changes since stats 
+            were enabled (or reset), printed unless quiet.
+            @return: dict of name -> (count, total_us)
+        '''
+        if not quiet:
+            print(stats.report())
+        return stats.summary()
+    
+    def stats_reset(self):
+        stats.reset()
+    
     def dump(self):
         '''
             Prints out current state of the GPIO
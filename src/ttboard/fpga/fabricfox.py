@@ -16,6 +16,7 @@ from rp2 import PIO, StateMachine, asm_pio
 import utime
 from ttboard.pins.gpio_map import GPIOMap
 from ttboard.demoboard import DemoBoard
+from ttboard.pio.resources import PIOResources
 DoDummyClocks = True
 def pin_indices():
     '''
@@ -99,7 +100,9 @@ def spi_transferPIO(filepath: str, freq: int = 1_000_000):
     print(f"Configuring PIO with frequency: {pio_freq} Hz")
 
     # Configure PIO state machine
-    sm = StateMachine(0, spi_write, freq=pio_freq, sideset_base=Pin(pins_idx['sck']), 
+    resources = PIOResources.get()
+    sm_id = resources.claim_sm('fpga_loader', spi_write)
+    sm = StateMachine(sm_id, spi_write, freq=pio_freq, sideset_base=Pin(pins_idx['sck']), 
                       out_base=Pin(pins_idx['mosi']))
     
     # Clear FIFO and ensure state machine is reset
@@ -176,6 +179,7 @@ def spi_transferPIO(filepath: str, freq: int = 1_000_000):
         ss.high()
         sm.restart()
         sm = None
+        resources.release('fpga_loader')
         # sck.init(mode=Pin.OUT, pull=None)
         # mosi.init(mode=Pin.OUT)
 
@@ -8,7 +8,6 @@ import os
 from ttboard.boot.shuttle_properties import HardcodedShuttle
 import ttboard.log as logging
 log = logging.getLogger(__name__)
-import ttboard.fpga.fabricfox as fpgaloader
 class BitStream:
     def __init__(self, loader, filepath:str, name:str, clock_hz:int=100):
         self._filepath = filepath
@@ -88,6 +87,8 @@ class FPGAMux:
         self.reset_and_clock_mux()
         self.enabled = design
         
+        # only pull in the loader (and rp2) when actually needed
+        import ttboard.fpga.fabricfox as fpgaloader
         fpgaloader.spi_transferPIO(design.file)
         
         if self.design_enabled_callback is not None:
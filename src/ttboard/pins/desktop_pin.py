@@ -5,13 +5,16 @@ Created on Jan 22, 2024
 @copyright: Copyright (C) 2024 Pat Deegan, https://psychogenic.com
 '''
 
-import logging 
-log = logging.getLogger(__name__)
+import ttboard.util.platform as platform
+import ttboard.sim.registers as regs
 
 class Pin:
     '''
         Stub class for desktop testing,
         i.e. where machine module DNE
+
+        Backed by the simulated register file (platform.mem32)
+        so pins and the port accessors agree on GPIO state.
     '''
     OUT = 1
     IN = 2
@@ -22,27 +25,41 @@ class Pin:
     OPEN_DRAIN = 7
     def __init__(self, gpio:int, direction:int=0, mode:int=0, pull:int=0):
         self.gpio = gpio
+        self._mask = 1 << gpio
         self.dir = direction
-        self.val = 0 
-        
+        if mode:
+            # called as Pin(gpio, mode=X), like machine.Pin
+            direction = mode
+        if direction:
+            self.init(direction, pull)
+
+    @property
+    def val(self):
+        return self.value()
+
     def value(self, setTo:int = None):
         if setTo is not None:
-            log.debug(f'Setting GPIO {self.gpio} to {setTo}')
-            self.val = setTo 
-        return self.val
-        
+            if setTo:
+                platform.mem32[regs.GPIO_OUT_SET] = self._mask
+            else:
+                platform.mem32[regs.GPIO_OUT_CLR] = self._mask
+            return
+        return 1 if platform.mem32[regs.GPIO_IN] & self._mask else 0
+
     def init(self, direction:int, pull:int=None):
-        log.debug(f'Setting GPIO {self.gpio} to direction {direction}')
         self.dir = direction
-        
-    def toggle(self):
-        if self.val:
-            self.val = 0
+        if direction == self.OUT:
+            platform.mem32[regs.GPIO_OE_SET] = self._mask
         else:
-            self.val = 1
+            platform.mem32[regs.GPIO_OE_CLR] = self._mask
+        if pull is not None:
+            platform.mem32.set_pull_up(self.gpio, pull == self.PULL_UP)
+
+    def toggle(self):
+        platform.mem32[regs.GPIO_OUT_XOR] = self._mask
 
     def __call__(self, value:int=None):
         if value is not None:
-            self.val = value
+            self.value(value)
             return
-        return self.val
+        return self.value()
@@ -36,6 +36,7 @@ import ttboard.pins.gpio_map as gp
 from ttboard.pins.standard import StandardPin
 from ttboard.pins.muxed import MuxedPin, MuxedPinInfo
 from ttboard.pins.mux_control import MuxControl
+import ttboard.pins.port_compiler as port_compiler
 
 from ttboard.ports.io import IO as VerilogIOPort
 from ttboard.ports.oe import OutputEnable as VerilogOEPort
@@ -150,13 +151,21 @@ class Pins:
         
     
     def _init_ioports(self):
+        # specialize the platform accessors for this board's
+        # layout, before the ports grab references to them
+        layout = port_compiler.install(gp.GPIOMap)
+        if layout is None:
+            layout = port_compiler.PortLayout.from_gpio_map(gp.GPIOMap)
+        self.layout = layout
+        
         # Note: these are named according the the ASICs point of view
         # we can write ui_in, we read uo_out
+        # ports get their GPIO, for fast bit writes and edge timing
         port_defs = [
-            ('uo_out',  8, platform.read_uo_out_byte, None),
-            ('ui_in',   8, platform.read_ui_in_byte, platform.write_ui_in_byte),
-            ('uio_in',  8, platform.read_uio_byte, platform.write_uio_byte),
-            ('uio_out', 8, platform.read_uio_byte, None)
+            ('uo_out',  8, platform.read_uo_out_byte, None, layout.ports['uo_out']),
+            ('ui_in',   8, platform.read_ui_in_byte, platform.write_ui_in_byte, layout.ports['ui_in']),
+            ('uio_in',  8, platform.read_uio_byte, platform.write_uio_byte, layout.ports['uio']),
+            ('uio_out', 8, platform.read_uio_byte, None, layout.ports['uio'])
             ]
         self._ports = dict()
         for pd in port_defs:
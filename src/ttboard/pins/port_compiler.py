@@ -0,0 +1,335 @@
+'''
+Created on Oct 18, 2026
+
+Port accessor compiler.
+
+The fast read_/write_ port functions in platform are all about
+scattering/gathering bits between a byte and wherever those bits
+live in the GPIO registers.  Rather than hand-coding the shifts for
+one board layout, this looks at a GPIOMap, figures out the runs of
+contiguous pins for each port, and generates the accessors with all
+masks and shifts folded in as constants, e.g. for ui_in on TT06
+
+    segments: bits 0-3 @ GPIO 9, bits 4-7 @ GPIO 17
+    def read_ui_in_byte():
+        v = mem32[0xd0000004]
+        return ((v >> 9) & 0xf) | ((v >> 13) & 0xf0)
+
+On the RP2040 these get compiled with @micropython.native and
+installed into platform (see install()), replacing the defaults,
+before the Pins sets up its ports, along with the @micropython.viper
+loop behind platform.apply_vectors().  Off-target, the same code runs
+against the simulated register file.
+
+What isn't generated assumes the TT04/TT06 layout (StandardPorts):
+the PIO programs used for streaming (StreamEngine falls back to
+apply_vectors on other layouts) and the logic analyzer's sample
+format (the PIOSampler refuses other layouts).  Check with
+layout.is_standard.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+import ttboard.util.platform as platform
+import ttboard.log as logging
+log = logging.getLogger(__name__)
+
+# SIO register addresses, 2.3.1.7 in rp2040_datasheet
+GPIO_IN = 0xd0000004
+GPIO_OUT = 0xd0000010
+GPIO_OUT_SET = 0xd0000014
+GPIO_OUT_CLR = 0xd0000018
+GPIO_OUT_XOR = 0xd000001c
+GPIO_OE = 0xd0000020
+
+# where the hand-written defaults in platform, the streaming PIO
+# programs and the analyzer sample words expect the ports to be
+StandardPorts = {
+    'ui_in': [9, 10, 11, 12, 17, 18, 19, 20],
+    'uo_out': [5, 6, 7, 8, 13, 14, 15, 16],
+    'uio': [21, 22, 23, 24, 25, 26, 27, 28]
+}
+StandardClock = 0
+
+class PortLayout:
+    '''
+        Where each bit of the TT ports lives, for a given GPIOMap.
+
+        ports maps port name ('ui_in', 'uo_out', 'uio') to a list
+        of 8 GPIO numbers, bit 0 first.
+    '''
+    PortNames = ['ui_in', 'uo_out', 'uio']
+
+    def __init__(self, ports:dict, clock:int):
+        for pname in self.PortNames:
+            if pname not in ports or len(ports[pname]) != 8 or None in ports[pname]:
+                raise ValueError(f'Incomplete port layout for {pname}')
+        self.ports = ports
+        self.clock = clock
+
+    @classmethod
+    def from_gpio_map(cls, gpio_map):
+        '''
+            Derive layout from a GPIOMap class.  Muxed pins
+            are named like cena_uo_out1, so the port bit
+            is taken from the end of the pin name.
+        '''
+        ports = {}
+        for pname in cls.PortNames:
+            ports[pname] = [None]*8
+        for name, gpio in gpio_map.all().items():
+            for pname in cls.PortNames:
+                for i in range(8):
+                    bit_name = f'{pname}{i}'
+                    if name == bit_name or name.endswith(f'_{bit_name}'):
+                        ports[pname][i] = gpio
+        return cls(ports, gpio_map.project_clock())
+
+    @property
+    def is_standard(self) -> bool:
+        '''
+            Whether this is the TT04/TT06 layout
+        '''
+        return self.clock == StandardClock and \
+            all(map(lambda p: self.ports[p] == StandardPorts[p], self.PortNames))
+
+    def segments(self, port:str):
+        '''
+            Runs of consecutive bits on consecutive GPIO
+            @return: list of (first bit, first gpio, width)
+        '''
+        gpios = self.ports[port]
+        segs = []
+        start = 0
+        for i in range(1, 9):
+            if i == 8 or gpios[i] != gpios[i-1] + 1:
+                segs.append((start, gpios[start], i - start))
+                start = i
+        return segs
+
+    def gpio_mask(self, port:str) -> int:
+        m = 0
+        for gpio in self.ports[port]:
+            m |= (1 << gpio)
+        return m
+
+    def gather_expr(self, port:str, reg_var:str='v') -> str:
+        '''
+            Expression pulling the port byte out of a register value
+        '''
+        terms = []
+        for bit, gpio, width in self.segments(port):
+            mask = ((1 << width) - 1) << bit
+            shift = gpio - bit
+            if shift > 0:
+                terms.append(f'(({reg_var} >> {shift}) & {hex(mask)})')
+            elif shift < 0:
+                terms.append(f'(({reg_var} << {-shift}) & {hex(mask)})')
+            else:
+                terms.append(f'({reg_var} & {hex(mask)})')
+        return ' | '.join(terms)
+
+    def scatter_expr(self, port:str, val_var:str='val') -> str:
+        '''
+            Expression placing a port byte at its GPIO positions
+        '''
+        terms = []
+        for bit, gpio, width in self.segments(port):
+            mask = ((1 << width) - 1) << bit
+            shift = gpio - bit
+            if shift > 0:
+                terms.append(f'(({val_var} & {hex(mask)}) << {shift})')
+            elif shift < 0:
+                terms.append(f'(({val_var} & {hex(mask)}) >> {-shift})')
+            else:
+                terms.append(f'({val_var} & {hex(mask)})')
+        return ' | '.join(terms)
+
+    def __eq__(self, other):
+        return self.ports == other.ports and self.clock == other.clock
+
+    def __repr__(self):
+        return f'<PortLayout {self.ports} clk {self.clock}>'
+
+
+def generate_source(layout:PortLayout, decorator:str=None) -> str:
+    '''
+        Python source for all the port accessors, expecting
+        a mem32 global with machine.mem32 semantics.
+    '''
+    ui_mask = hex(layout.gpio_mask('ui_in'))
+    uio_mask = hex(layout.gpio_mask('uio'))
+    clk_mask = hex(1 << layout.clock)
+    reg_in = hex(GPIO_IN)
+    reg_out = hex(GPIO_OUT)
+    reg_xor = hex(GPIO_OUT_XOR)
+    reg_oe = hex(GPIO_OE)
+    funcs = []
+
+    for port, read_name in [('ui_in', 'read_ui_in_byte'), ('uo_out', 'read_uo_out_byte'), ('uio', 'read_uio_byte')]:
+        gather = layout.gather_expr(port)
+        funcs.append([
+            f'def {read_name}():',
+            f'    v = mem32[{reg_in}]',
+            f'    return {gather}'])
+
+    for port, write_name in [('ui_in', 'write_ui_in_byte'), ('uo_out', 'write_uo_out_byte'), ('uio', 'write_uio_byte')]:
+        mask = hex(layout.gpio_mask(port))
+        scatter = layout.scatter_expr(port)
+        funcs.append([
+            f'def {write_name}(val):',
+            f'    mem32[{reg_xor}] = (mem32[{reg_out}] ^ ({scatter})) & {mask}'])
+
+    gather = layout.gather_expr('uio')
+    scatter = layout.scatter_expr('uio')
+    funcs.append([
+        'def read_uio_outputenable():',
+        f'    v = mem32[{reg_oe}]',
+        f'    return {gather}'])
+    funcs.append([
+        'def write_uio_outputenable(val):',
+        f'    mem32[{reg_oe}] = (mem32[{reg_oe}] & ~{uio_mask}) | ({scatter})'])
+
+    funcs.append([
+        'def read_clock():',
+        f'    return (mem32[{reg_out}] >> {layout.clock}) & 1'])
+    funcs.append([
+        'def write_clock(val):',
+        '    if val:',
+        f'        mem32[{hex(GPIO_OUT_SET)}] = {clk_mask}',
+        '    else:',
+        f'        mem32[{hex(GPIO_OUT_CLR)}] = {clk_mask}'])
+
+    scatter_ui = layout.scatter_expr('ui_in', 'ui_in')
+    scatter_uio = layout.scatter_expr('uio', 'uio')
+    funcs.append([
+        'def write_ports(ui_in=None, uio=None, clk=None):',
+        '    mask = 0',
+        '    val = 0',
+        '    if ui_in is not None:',
+        f'        mask |= {ui_mask}',
+        f'        val |= {scatter_ui}',
+        '    if uio is not None:',
+        f'        mask |= {uio_mask}',
+        f'        val |= {scatter_uio}',
+        '    if clk is not None:',
+        f'        mask |= {clk_mask}',
+        '        if clk:',
+        f'            val |= {clk_mask}',
+        f'    mem32[{reg_xor}] = (mem32[{reg_out}] ^ val) & mask'])
+
+    src = [f'# generated for {layout}']
+    for f in funcs:
+        if decorator is not None:
+            src.append(f'@{decorator}')
+        src.extend(f)
+        src.append('')
+    return '\n'.join(src)
+
+
+def generate_vector_source(layout:PortLayout, decorator:str=None) -> str:
+    '''
+        Python source for _apply_vectors(), the loop behind
+        platform.apply_vectors(), written for viper: it expects
+        ptr32/ptr8 (provided by the namespace, off-target).
+    '''
+    clk_mask = hex(1 << layout.clock)
+    src = [f'# generated for {layout}']
+    if decorator is not None:
+        src.append(f'@{decorator}')
+    src.extend([
+        'def _apply_vectors(stim, clocks_per_vector:int, capture, stride:int) -> int:',
+        '    # SIO registers, as 32-bit words from 0xd0000000:',
+        '    # [1] GPIO_IN, [4] GPIO_OUT, [5] GPIO_OUT_SET,',
+        '    # [6] GPIO_OUT_CLR, [7] GPIO_OUT_XOR',
+        '    sio = ptr32(0xd0000000)',
+        '    src = ptr8(stim)',
+        '    dst = ptr8(capture)',
+        '    num_vectors = int(len(stim))',
+        '    i = 0',
+        '    while i < num_vectors:',
+        '        v = int(src[i])',
+        f'        sio[7] = (sio[4] ^ ({layout.scatter_expr("ui_in", "v")})) & {hex(layout.gpio_mask("ui_in"))}',
+        '        c = 0',
+        '        while c < clocks_per_vector:',
+        f'            sio[5] = {clk_mask}',
+        f'            sio[6] = {clk_mask}',
+        '            c += 1',
+        '        allin = sio[1]',
+        f'        dst[i*stride] = {layout.gather_expr("uo_out", "allin")}',
+        '        if stride > 1:',
+        f'            dst[i*stride + 1] = {layout.gather_expr("uio", "allin")}',
+        '        i += 1',
+        '    return num_vectors',
+        ''])
+    return '\n'.join(src)
+
+
+def compile_vector_loop(layout:PortLayout, namespace:dict=None, decorator:str=None):
+    '''
+        Compile _apply_vectors for layout.
+        @param namespace: globals for it, which need ptr32/ptr8
+                          unless it's compiled as viper
+        @return: the function
+    '''
+    namespace = dict() if namespace is None else dict(namespace)
+    if decorator is not None:
+        import micropython
+        namespace['micropython'] = micropython
+    exec(generate_vector_source(layout, decorator), namespace)
+    return namespace['_apply_vectors']
+
+
+AccessorNames = [
+    'read_ui_in_byte', 'read_uo_out_byte', 'read_uio_byte',
+    'write_ui_in_byte', 'write_uo_out_byte', 'write_uio_byte',
+    'read_uio_outputenable', 'write_uio_outputenable',
+    'read_clock', 'write_clock', 'write_ports'
+]
+
+def compile_accessors(layout:PortLayout, mem32, decorator:str=None) -> dict:
+    '''
+        Compile the accessors against the given mem32.
+        @return: dict of name -> function
+    '''
+    namespace = {'mem32': mem32}
+    if decorator is not None:
+        import micropython
+        namespace['micropython'] = micropython
+    src = generate_source(layout, decorator)
+    exec(src, namespace)
+    funcs = {}
+    for name in AccessorNames:
+        funcs[name] = namespace[name]
+    return funcs
+
+def install(gpio_map) -> PortLayout:
+    '''
+        Replace the platform port accessors (and, on the RP2040,
+        the apply_vectors loop) with versions specialized for
+        gpio_map.  Must happen before Pins grabs references to them.
+        Off-target, they're compiled against the simulated 
+        register file.
+    '''
+    if platform.IsRP2040:
+        import machine
+        mem32 = machine.mem32
+        decorator = 'micropython.native'
+    else:
+        mem32 = platform.mem32
+        decorator = None
+    layout = PortLayout.from_gpio_map(gpio_map)
+    try:
+        funcs = compile_accessors(layout, mem32, decorator)
+        if platform.IsRP2040:
+            funcs['_apply_vectors'] = compile_vector_loop(layout, decorator='micropython.viper')
+    except Exception as e:
+        if not layout.is_standard:
+            # the defaults would be poking the wrong pins
+            raise RuntimeError(f'Could not compile port accessors for {gpio_map}: {e}')
+        log.error(f'Could not compile port accessors, keeping defaults: {e}')
+        return None
+    for name, f in funcs.items():
+        setattr(platform, name, f)
+    log.debug(f'Port accessors compiled for {gpio_map}')
+    return layout
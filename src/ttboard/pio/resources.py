@@ -0,0 +1,244 @@
+'''
+Created on Oct 18, 2026
+
+Shared PIO and DMA resources.  The RP2040 has 8 state machines, on
+two PIO blocks with 32 instructions of program memory each, and 12
+DMA channels.  Everything in the SDK that uses them--project clocks,
+clock bursts, frequency measurement, streaming, the logic analyzer,
+the FPGA loader--gets them from here, rather than hard-coding
+StateMachine(0, ...), so they can all run side by side.
+
+    res = PIOResources.get()
+    sm_id = res.claim_sm(self, _my_prog)     # any state machine with room for _my_prog
+    sm = rp2.StateMachine(sm_id, _my_prog, ...)
+    dma = res.claim_dma(self)
+    ...
+    res.release(self)  # stops the state machine, frees the program
+                       # memory (if nobody else uses it) and the DMA
+
+A preferred sm_id may be passed to claim_sm(); if it's taken, any
+other free state machine (with room for the program on its PIO) is
+handed out instead, so callers must use the id returned.
+
+Programs are tracked per PIO block, with the state machines using
+them, and removed from instruction memory when the last one is
+released.  Running out of anything raises a RuntimeError naming
+the current owners.
+
+Off-target, this is just the bookkeeping, with DMA "channels" being
+channel numbers.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+import ttboard.util.platform as platform
+import ttboard.log as logging
+log = logging.getLogger(__name__)
+
+if platform.IsRP2040:
+    import rp2
+
+NumPIO = 2
+StateMachinesPerPIO = 4
+NumStateMachines = NumPIO * StateMachinesPerPIO
+InstructionMemorySize = 32
+NumDMAChannels = 12
+
+class PIOResources:
+    _PIOResourcesSingleton = None
+
+    @classmethod
+    def get(cls):
+        '''
+            Get (or create) the PIOResources singleton
+        '''
+        if cls._PIOResourcesSingleton is None:
+            cls._PIOResourcesSingleton = cls()
+        return cls._PIOResourcesSingleton
+
+    def __init__(self):
+        self._sm_owners = [None] * NumStateMachines
+        self._sm_programs = [None] * NumStateMachines
+        # per PIO block: list of [program, size, users]
+        self._programs = [[] for _i in range(NumPIO)]
+        self._dma = dict() # channel -> (owner, handle)
+
+    def claim_sm(self, owner, program=None, sm_id:int=None, pio:int=None) -> int:
+        '''
+            Get a state machine.
+            @param owner: whatever is claiming it, used to release later
+            @param program: the PIO program it will run (to check/track
+                            instruction memory), if known
+            @param sm_id: preferred state machine, 0-7
+            @param pio: only consider state machines on this PIO block
+            @return: the state machine id to use
+            @raise RuntimeError: if nothing suitable is free
+        '''
+        if sm_id is not None and self._sm_owners[sm_id] == owner:
+            # already ours, maybe with a new program
+            if self._fits(sm_id // StateMachinesPerPIO, program, sm_id):
+                self._set_program(sm_id, program)
+                return sm_id
+            self.release_sm(sm_id)
+
+        for sm in self._candidates(program, sm_id, pio):
+            if self._sm_owners[sm] is not None:
+                continue
+            if not self._fits(sm // StateMachinesPerPIO, program):
+                continue
+            self._sm_owners[sm] = owner
+            self._set_program(sm, program)
+            log.debug(f'State machine {sm} claimed by {owner}')
+            return sm
+        raise RuntimeError(f'No free PIO state machine for {owner} ({self.report()})')
+
+    def release_sm(self, sm_id:int):
+        '''
+            Stop state machine sm_id and free it, along with its program
+            if nothing else is using that.
+        '''
+        if self._sm_owners[sm_id] is None:
+            return
+        if platform.IsRP2040:
+            rp2.StateMachine(sm_id).active(0)
+        self._set_program(sm_id, None)
+        self._sm_owners[sm_id] = None
+
+    def claim_dma(self, owner):
+        '''
+            Get a DMA channel.
+            @return: an rp2.DMA (just a channel number, off-target)
+            @raise RuntimeError: if none are free
+        '''
+        if len(self._dma) >= NumDMAChannels:
+            raise RuntimeError(f'No free DMA channel for {owner} ({self.report()})')
+        if platform.IsRP2040:
+            handle = rp2.DMA()
+            channel = handle.channel
+        else:
+            channel = 0
+            while channel in self._dma:
+                channel += 1
+            handle = channel
+        self._dma[channel] = (owner, handle)
+        return handle
+
+    def release_dma(self, handle):
+        channel = handle.channel if platform.IsRP2040 else handle
+        if channel not in self._dma:
+            return
+        del self._dma[channel]
+        if platform.IsRP2040:
+            handle.active(0)
+            handle.close()
+
+    def release(self, owner):
+        '''
+            Free everything owner has claimed.
+        '''
+        for sm in range(NumStateMachines):
+            if self._sm_owners[sm] == owner:
+                self.release_sm(sm)
+        for channel in list(self._dma.keys()):
+            if self._dma[channel][0] == owner:
+                self.release_dma(self._dma[channel][1])
+
+    def owner(self, sm_id:int):
+        return self._sm_owners[sm_id]
+
+    def instructions_free(self, pio:int) -> int:
+        used = 0
+        for p in self._programs[pio]:
+            used += p[1]
+        return InstructionMemorySize - used
+
+    @property
+    def free_state_machines(self) -> list:
+        return list(filter(lambda sm: self._sm_owners[sm] is None, range(NumStateMachines)))
+
+    @property
+    def free_dma_channels(self) -> int:
+        return NumDMAChannels - len(self._dma)
+
+    def report(self) -> str:
+        parts = []
+        for sm in range(NumStateMachines):
+            if self._sm_owners[sm] is not None:
+                parts.append(f'sm{sm}: {self._owner_name(self._sm_owners[sm])}')
+        for channel in sorted(self._dma.keys()):
+            parts.append(f'dma{channel}: {self._owner_name(self._dma[channel][0])}')
+        for pio in range(NumPIO):
+            parts.append(f'pio{pio} {self.instructions_free(pio)} instructions free')
+        return ', '.join(parts)
+
+    def _candidates(self, program, sm_id:int, pio:int) -> list:
+        # preferred first, then blocks that already hold the program, then the rest
+        order = []
+        if sm_id is not None:
+            order.append(sm_id)
+        loaded = list(filter(lambda p: self._find_program(p, program) is not None, range(NumPIO)))
+        for p in loaded + list(filter(lambda p: p not in loaded, range(NumPIO))):
+            for i in range(StateMachinesPerPIO):
+                sm = p * StateMachinesPerPIO + i
+                if sm not in order:
+                    order.append(sm)
+        if pio is not None:
+            order = list(filter(lambda sm: sm // StateMachinesPerPIO == pio, order))
+        return order
+
+    def _fits(self, pio:int, program, sm_id:int=None) -> bool:
+        if program is None or self._find_program(pio, program) is not None:
+            return True
+        free = self.instructions_free(pio)
+        if sm_id is not None:
+            # the program being replaced will go, if it's the only user
+            old = self._find_program(pio, self._sm_programs[sm_id])
+            if old is not None and old[2] == 1:
+                free += old[1]
+        return self._program_size(program) <= free
+
+    def _set_program(self, sm_id:int, program):
+        old = self._sm_programs[sm_id]
+        if old is program:
+            return
+        pio = sm_id // StateMachinesPerPIO
+        self._sm_programs[sm_id] = program
+        if old is not None:
+            entry = self._find_program(pio, old)
+            entry[2] -= 1
+            if entry[2] == 0:
+                self._programs[pio].remove(entry)
+                if platform.IsRP2040:
+                    rp2.StateMachine(sm_id).active(0)
+                    rp2.PIO(pio).remove_program(old)
+        if program is not None:
+            entry = self._find_program(pio, program)
+            if entry is None:
+                self._programs[pio].append([program, self._program_size(program), 1])
+            else:
+                entry[2] += 1
+
+    def _find_program(self, pio:int, program):
+        if program is None:
+            return None
+        for entry in self._programs[pio]:
+            if entry[0] is program:
+                return entry
+        return None
+
+    @staticmethod
+    def _program_size(program) -> int:
+        # rp2.asm_pio programs are lists, instructions first
+        try:
+            return len(program[0])
+        except (TypeError, IndexError):
+            return 0
+
+    @staticmethod
+    def _owner_name(owner) -> str:
+        if isinstance(owner, str):
+            return owner
+        return type(owner).__name__
+
+    def __repr__(self):
+        return f'<PIOResources {self.report()}>'
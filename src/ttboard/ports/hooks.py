@@ -0,0 +1,130 @@
+'''
+Created on Oct 18, 2026
+
+Hooks on a port's reads and writes.
+
+Several things want to see, or get in the way of, what goes
+through a port: the tracer records every value, write combining
+holds writes until the next await, stats counts and times the
+accessors.  Rather than each of them swapping out the port's
+signal_read/signal_write (and having to be undone in just the
+right order), they all register here:
+
+    io.hooks.add_write_hook(lambda v: print(f'wrote {v}'))
+    io.hooks.hold(holder)   # holder.held, holder.held_write(v)
+
+With nothing registered, the port has its plain accessors, and
+bit writes on IO ports take their fast path (see ports.io).
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+
+class PortHooks:
+    def __init__(self, port):
+        self.port = port
+        self._base_read = port.signal_read
+        self._base_write = port.signal_write
+        self._read = self._base_read
+        self._write = self._base_write
+        self.read_hooks = []
+        self.write_hooks = []
+        self.holder = None
+        # anything at all in the way of the plain accessors
+        self.active = False
+
+    @property
+    def read(self):
+        '''
+            The accessor actually reading the port (may be
+            replaced, e.g. by stats, and put back after)
+        '''
+        return self._read
+
+    @read.setter
+    def read(self, func):
+        self._read = func
+        self._update()
+
+    @property
+    def write(self):
+        '''
+            The accessor actually writing the port
+        '''
+        return self._write
+
+    @write.setter
+    def write(self, func):
+        self._write = func
+        self._update()
+
+    def add_read_hook(self, hook):
+        '''
+            hook(value) is called with every value read
+        '''
+        self.read_hooks.append(hook)
+        self._update()
+
+    def remove_read_hook(self, hook):
+        if hook in self.read_hooks:
+            self.read_hooks.remove(hook)
+        self._update()
+
+    def add_write_hook(self, hook):
+        '''
+            hook(value) is called with every value written,
+            before the write (or hold)
+        '''
+        self.write_hooks.append(hook)
+        self._update()
+
+    def remove_write_hook(self, hook):
+        if hook in self.write_hooks:
+            self.write_hooks.remove(hook)
+        self._update()
+
+    def hold(self, holder):
+        '''
+            Writes go to holder.held_write(v) rather than the
+            port, and reads return holder.held, unless None.
+        '''
+        if self.holder is not None and self.holder is not holder:
+            raise RuntimeError(f'{self.port.name} writes already held')
+        self.holder = holder
+        self._update()
+
+    def release(self, holder):
+        if self.holder is holder:
+            self.holder = None
+        self._update()
+
+    def _update(self):
+        port = self.port
+        hooked = self.holder is not None or len(self.read_hooks) or len(self.write_hooks)
+        self.active = bool(hooked or self._read is not self._base_read
+                           or self._write is not self._base_write)
+        if hooked:
+            port.signal_read = self._hooked_read if self._read is not None else None
+            port.signal_write = self._hooked_write if self._write is not None else None
+        else:
+            port.signal_read = self._read
+            port.signal_write = self._write
+
+    def _hooked_read(self):
+        holder = self.holder
+        if holder is not None and holder.held is not None:
+            v = holder.held
+        else:
+            v = self._read()
+        for hook in self.read_hooks:
+            hook(v)
+        return v
+
+    def _hooked_write(self, v):
+        for hook in self.write_hooks:
+            hook(v)
+        holder = self.holder
+        if holder is not None:
+            holder.held_write(v)
+        else:
+            self._write(v)
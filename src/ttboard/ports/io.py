@@ -4,7 +4,75 @@ Created on Nov 21, 2024
 @author: Pat Deegan
 @copyright: Copyright (C) 2024 Pat Deegan, https://psychogenic.com
 '''
-import microcotb.ports.io  
+import microcotb.ports.io
+import ttboard.util.platform as platform
+from ttboard.ports.hooks import PortHooks
 
 class IO(microcotb.ports.io.IO):
-    pass
\ No newline at end of file
+    '''
+        An IO port that, when told which GPIO each bit lives on,
+        handles bit and slice writes, e.g.
+
+            tt.ui_in[7] = 1
+            tt.ui_in[3:0] = 0b1010
+
+        by writing precomputed GPIO masks straight to the SIO
+        SET/CLR (or XOR) registers, rather than reading the whole
+        port, modifying a LogicArray and writing it all back.
+
+        Anything else (LogicArray/Logic values, open-ended slices...)
+        goes through the standard microcotb path.
+
+        Read-only ports keep their gpios too, for the edge timing
+        in ttboard.cocotb.triggers.
+        
+        Anything watching or holding writes does so through
+        hooks (see ports.hooks), and while it does, bit writes
+        take the standard path, so they're seen too.
+    '''
+    def __init__(self, name:str, width:int, read_signal_fn=None, write_signal_fn=None, gpios:list=None):
+        super().__init__(name, width, read_signal_fn, write_signal_fn)
+        self.gpios = gpios
+        self._bit_masks = None
+        self.hooks = PortHooks(self.port)
+        if gpios is not None and write_signal_fn is not None:
+            self._bit_masks = list(map(lambda g: 1 << g, gpios))
+
+    def __setitem__(self, key, value):
+        masks = self._bit_masks
+        if masks is None or self.hooks.active or not isinstance(value, int):
+            return super().__setitem__(key, value)
+
+        port = self.port
+        if isinstance(key, int):
+            if key < 0 or key >= len(masks):
+                return super().__setitem__(key, value)
+            if value:
+                platform.gpio_out_set(masks[key])
+                port.do_force_update_last_value(port.last_value | (1 << key))
+            else:
+                platform.gpio_out_clr(masks[key])
+                port.do_force_update_last_value(port.last_value & ~(1 << key))
+            return
+
+        if not isinstance(key, slice):
+            return super().__setitem__(key, value)
+
+        hi = key.start
+        lo = key.stop
+        if hi is None or lo is None or key.step is not None \
+           or lo < 0 or hi < lo or hi >= len(masks) \
+           or value < 0 or value >= (1 << (hi - lo + 1)):
+            # let the standard path deal with (or complain about) these
+            return super().__setitem__(key, value)
+
+        mask = 0
+        gpio_val = 0
+        for i in range(hi - lo + 1):
+            m = masks[lo + i]
+            mask |= m
+            if value & (1 << i):
+                gpio_val |= m
+        platform.gpio_out_masked(mask, gpio_val)
+        port_mask = ((1 << (hi - lo + 1)) - 1) << lo
+        port.do_force_update_last_value((port.last_value & ~port_mask) | (value << lo))
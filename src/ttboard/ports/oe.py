@@ -6,6 +6,7 @@ Created on Nov 21, 2024
 '''
 from microcotb.types.handle import LogicObject
 from microcotb.types.ioport import IOPort
+from ttboard.ports.hooks import PortHooks
 
 
 
@@ -14,6 +15,7 @@ class OutputEnable(LogicObject):
         port = IOPort(name, width, read_byte_fn, write_byte_fn)
         super().__init__(port)
         self.port = port
+        self.hooks = PortHooks(port)
         
     
     def __repr__(self):
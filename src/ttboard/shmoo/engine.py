@@ -0,0 +1,221 @@
+'''
+Created on Oct 18, 2026
+
+Frequency shmoo: find the highest project clock at which a design
+still works, e.g.
+
+    from ttboard.shmoo.engine import Shmoo, CounterProbe
+
+    tt.shuttle.tt_um_test.enable()
+    result = Shmoo(tt, max_sys_hz=300_000_000).run(CounterProbe(tt))
+    print(result.max_hz)
+
+The project is clocked at full speed (by PIO), so the project clock
+is a fixed fraction of the system clock, and it's the system clock
+that gets swept: a binary search over every system clock the PLL can
+produce (see clocking.planner), which assumes that once a design
+fails it won't pass again at higher clocks.  The best point is then
+re-checked a few times, stepping down if it turns out to be flaky.
+
+Probes are anything callable as probe(project_clock_hz), returning
+True/False or a number of errors (0 for a pass).  A
+sys_per_project attribute says how many system clocks there are
+per project clock, if not 2 (the PIO clock burst).  Exceptions
+count as failures.
+
+Above ~266MHz the flash divisor is raised (by the SystemClock), and
+whatever happens the system clock and flash divisor are put back
+afterwards.
+
+Results are stored, per design (see results.py), and the DemoBoard
+won't clock a project above its measured maximum.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+from ttboard.demoboard import DemoBoard
+import ttboard.clocking.planner as clock_planner
+from ttboard.shmoo.results import ShmooResult, ShmooResults
+import ttboard.log as logging
+log = logging.getLogger(__name__)
+
+
+class CounterProbe:
+    '''
+        For counter designs, like tt_um_test: clock the project
+        a number of times at full speed and check uo_out advanced
+        by exactly that many counts (mod 256).
+    '''
+    sys_per_project = 2
+    def __init__(self, tt:DemoBoard, clocks:int=256*64 + 1, repeats:int=10):
+        self.tt = tt
+        self.clocks = clocks
+        self.repeats = repeats
+
+    def __call__(self, freq_hz:int) -> int:
+        tt = self.tt
+        errors = 0
+        for _i in range(self.repeats):
+            last = int(tt.uo_out.value)
+            tt.clock_cycles(self.clocks)
+            if int(tt.uo_out.value) != (last + self.clocks) & 0xff:
+                errors += 1
+        return errors
+
+
+class VectorProbe:
+    '''
+        Reset the project, stream stim through it at full speed
+        (StreamEngine, project clock is system clock/4) and count
+        captures that don't match expected.
+    '''
+    sys_per_project = 4
+    def __init__(self, tt:DemoBoard, stim, expected, clocks_per_vector:int=1,
+                 mask:int=0xff, reset:bool=True):
+        from ttboard.stream.engine import StreamEngine
+        if len(stim) != len(expected):
+            raise ValueError('Need one expected value per vector')
+        self.tt = tt
+        self.stim = stim
+        self.expected = expected
+        self.clocks_per_vector = clocks_per_vector
+        self.mask = mask
+        self.reset = reset
+        self._engine = StreamEngine(tt)
+        self._capture = bytearray(len(stim))
+
+    def __call__(self, freq_hz:int) -> int:
+        tt = self.tt
+        if self.reset:
+            tt.reset_project(True)
+            tt.clock_cycles(4)
+            tt.reset_project(False)
+        got = self._engine.run(self.stim, self._capture, self.clocks_per_vector)
+        errors = 0
+        mask = self.mask
+        for i in range(len(got)):
+            if (got[i] ^ self.expected[i]) & mask:
+                errors += 1
+        return errors
+
+
+class Shmoo:
+    def __init__(self, tt:DemoBoard=None, results:ShmooResults=None,
+                 min_sys_hz:int=48_000_000, max_sys_hz:int=266_000_000, confirm:int=2):
+        '''
+            @param tt: the DemoBoard, defaults to DemoBoard.get()
+            @param results: where to store results, defaults to the DemoBoard's
+            @param min_sys_hz: lowest system clock to try
+            @param max_sys_hz: highest system clock to try (overclocking!)
+            @param confirm: number of times the best point is re-checked
+        '''
+        if tt is None:
+            tt = DemoBoard.get()
+        self.tt = tt
+        self.results = results if results is not None else tt.shmoo_results
+        self.min_sys_hz = min_sys_hz
+        self.max_sys_hz = max_sys_hz
+        self.confirm = confirm
+        self._points = []
+
+    def system_clocks(self, sys_per_project:int=2, min_hz:int=None, max_hz:int=None) -> list:
+        '''
+            Candidate system clocks, lowest first, limited to the
+            given project clock range, if any.
+        '''
+        lo = self.min_sys_hz
+        hi = self.max_sys_hz
+        if min_hz is not None:
+            lo = max(lo, min_hz * sys_per_project)
+        if max_hz is not None:
+            hi = min(hi, max_hz * sys_per_project)
+        clocks = []
+        for c in clock_planner.planner().system_clocks:
+            if lo <= c[0] <= hi:
+                clocks.append(c[0])
+        clocks.reverse()
+        return clocks
+
+    def run(self, probe, design:str=None, min_hz:int=None, max_hz:int=None, save:bool=True) -> ShmooResult:
+        '''
+            Find the max passing project clock for the enabled (or named) design.
+            @param probe: pass/fail callable, see module doc
+            @param design: name to store results under, defaults to the enabled project
+            @param min_hz: lowest project clock of interest
+            @param max_hz: highest project clock of interest
+            @param save: store the result
+        '''
+        if design is None:
+            if self.tt.shuttle.enabled is None:
+                raise RuntimeError('No project enabled, and no design name given')
+            design = self.tt.shuttle.enabled.name
+        sys_per = getattr(probe, 'sys_per_project', 2)
+        candidates = self.system_clocks(sys_per, min_hz, max_hz)
+        if not len(candidates):
+            raise ValueError('No system clocks in range')
+
+        self._points = []
+        self.tt.clock_project_stop()
+        try:
+            best = self._search(probe, candidates, sys_per)
+        finally:
+            self.tt.system_clock.release('shmoo')
+
+        if best is None:
+            log.warn(f'{design} failed even at {candidates[0] // sys_per}Hz')
+            result = ShmooResult(design, 0, 0, self._probe_name(probe), self._points)
+        else:
+            result = ShmooResult(design, best // sys_per, best, self._probe_name(probe), self._points)
+            log.info(f'{design} max project clock: {result.max_hz}Hz')
+        if save:
+            self.results.record(result)
+        return result
+
+    def _search(self, probe, candidates:list, sys_per:int) -> int:
+        if not self._trial(probe, candidates[0], sys_per):
+            return None
+        lo = 0
+        hi = len(candidates) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self._trial(probe, candidates[mid], sys_per):
+                lo = mid
+            else:
+                hi = mid - 1
+
+        # make sure it wasn't a fluke
+        best = lo
+        while best >= 0:
+            ok = True
+            for _i in range(self.confirm):
+                if not self._trial(probe, candidates[best], sys_per):
+                    ok = False
+                    break
+            if ok:
+                return candidates[best]
+            best -= 1
+        return None
+
+    def _trial(self, probe, sys_hz:int, sys_per:int) -> bool:
+        self.tt.system_clock.require('shmoo', sys_hz)
+        freq = sys_hz // sys_per
+        try:
+            r = probe(freq)
+        except Exception as e:
+            log.warn(f'Probe failed at {freq}Hz: {e}')
+            r = False
+        if r is True:
+            errors = 0
+        elif r is False:
+            errors = 1
+        else:
+            errors = int(r)
+        self._points.append((freq, errors))
+        log.info(f'{freq}Hz: {"pass" if not errors else "FAIL"} ({errors} errors)')
+        return errors == 0
+
+    @staticmethod
+    def _probe_name(probe) -> str:
+        if hasattr(probe, '__name__'):
+            return probe.__name__
+        return type(probe).__name__
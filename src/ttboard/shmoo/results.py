@@ -0,0 +1,126 @@
+'''
+Created on Oct 18, 2026
+
+Per-design shmoo results, kept as JSON so they survive reboots:
+
+    {
+        "tt_um_test": {
+            "max_hz": 66000000,
+            "sys_hz": 132000000,
+            "probe": "CounterProbe",
+            "points": [[48000000, 0], [66000000, 0], [70000000, 3]]
+        }
+    }
+
+The DemoBoard uses max_hz to cap project clocks on enable.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+import json
+import ttboard.util.platform as platform
+import ttboard.log as logging
+log = logging.getLogger(__name__)
+
+DefaultResultsFile = 'shmoo.json'
+
+class ShmooResult:
+    def __init__(self, design:str, max_hz:int, sys_hz:int, probe:str, points:list=None):
+        '''
+            @param design: project name
+            @param max_hz: highest passing project clock, or 0 if nothing passed
+            @param sys_hz: system clock used to get max_hz
+            @param probe: what was used to decide pass/fail
+            @param points: list of (project clock, errors) tried
+        '''
+        self.design = design
+        self.max_hz = max_hz
+        self.sys_hz = sys_hz
+        self.probe = probe
+        self.points = points if points is not None else []
+
+    @property
+    def passed(self) -> bool:
+        return self.max_hz > 0
+
+    def to_dict(self) -> dict:
+        return {
+            'max_hz': self.max_hz,
+            'sys_hz': self.sys_hz,
+            'probe': self.probe,
+            'points': list(map(lambda p: [p[0], p[1]], self.points))
+        }
+
+    @classmethod
+    def from_dict(cls, design:str, d:dict):
+        return cls(design, d.get('max_hz', 0), d.get('sys_hz', 0), d.get('probe', ''),
+                   list(map(lambda p: (p[0], p[1]), d.get('points', []))))
+
+    def __repr__(self):
+        return f'<ShmooResult {self.design} max {self.max_hz}Hz ({len(self.points)} points)>'
+
+
+class ShmooResults:
+    '''
+        All stored results, loaded lazily from path.
+    '''
+    def __init__(self, path:str=DefaultResultsFile):
+        self.path = path
+        self._results = None
+
+    def _load(self):
+        if self._results is not None:
+            return
+        self._results = dict()
+        if not platform.isfile(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            for design, d in data.items():
+                self._results[design] = ShmooResult.from_dict(design, d)
+        except (OSError, ValueError) as e:
+            log.error(f'Could not load shmoo results from {self.path}: {e}')
+
+    def get(self, design:str) -> ShmooResult:
+        self._load()
+        return self._results.get(design)
+
+    def max_hz(self, design:str) -> int:
+        '''
+            Measured max project clock for design, or None if never shmoo'd
+            (or nothing passed).
+        '''
+        r = self.get(design)
+        if r is None or not r.passed:
+            return None
+        return r.max_hz
+
+    def record(self, result:ShmooResult, save:bool=True):
+        self._load()
+        self._results[result.design] = result
+        if save:
+            self.save()
+
+    def forget(self, design:str, save:bool=True):
+        self._load()
+        if design in self._results:
+            del self._results[design]
+            if save:
+                self.save()
+
+    def save(self):
+        self._load()
+        data = dict()
+        for design, r in self._results.items():
+            data[design] = r.to_dict()
+        with open(self.path, 'w') as f:
+            json.dump(data, f)
+
+    @property
+    def designs(self) -> list:
+        self._load()
+        return list(self._results.keys())
+
+    def __repr__(self):
+        return f'<ShmooResults {self.path}: {self.designs}>'
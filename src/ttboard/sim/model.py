@@ -0,0 +1,104 @@
+'''
+Created on Oct 18, 2026
+
+Behavioral models of projects, for running the SDK off-target.
+
+Subclass DesignModel, implement clock() (and reset(), usually), 
+then attach it to the simulated register file:
+
+    class Counter(DesignModel):
+        def reset(self):
+            self.uo_out = 0
+        def clock(self, ui_in:int, uio_in:int):
+            self.uo_out = (self.uo_out + 1) & 0xff
+
+    platform.mem32.attach_model(Counter())
+
+From then on, anything clocking the project through the pins 
+or ports (tt.clock_project_once(), dut.clk, run_vectors...) 
+drives the model, and uo_out/uio reads see its outputs.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+
+class DesignModel:
+    '''
+        Outputs are the uo_out, uio_out and uio_oe attributes, 
+        which are sampled after each call to reset(), clock() 
+        and inputs_changed().
+    '''
+    def __init__(self):
+        self.uo_out = 0
+        self.uio_out = 0
+        self.uio_oe = 0
+
+    def reset(self):
+        '''
+            Called on rising clock edges while rst_n is low.
+        '''
+        pass
+
+    def clock(self, ui_in:int, uio_in:int):
+        '''
+            Called on rising clock edges, out of reset.
+            @param ui_in: inputs byte
+            @param uio_in: value of bidir pins driven by the RP2040
+        '''
+        pass
+
+    def inputs_changed(self, ui_in:int, uio_in:int):
+        '''
+            Called when inputs change between clock edges, 
+            override for combinational outputs.
+        '''
+        pass
+
+    def run_vectors(self, stim, capture=None, clocks_per_vector:int=1, 
+                    capture_uio:bool=False, uio_in:int=0):
+        '''
+            The model's side of StreamEngine.run()/platform.apply_vectors(): 
+            for each ui_in in stim, clock clocks_per_vector times and 
+            note uo_out (and the uio the model drives, if capture_uio).
+            Reference models do this in bulk where they can.
+            @param uio_in: value of bidir pins driven by the RP2040, throughout
+            @return: the capture buffer
+        '''
+        stride = 2 if capture_uio else 1
+        if capture is None:
+            capture = bytearray(len(stim)*stride)
+        for i in range(len(stim)):
+            ui_in = stim[i]
+            self.inputs_changed(ui_in, uio_in)
+            for _c in range(clocks_per_vector):
+                self.clock(ui_in, uio_in)
+            capture[i*stride] = self.uo_out & 0xff
+            if capture_uio:
+                oe = self.uio_oe
+                capture[i*stride + 1] = ((self.uio_out & oe) | (uio_in & ~oe)) & 0xff
+        return capture
+
+
+class StepModel(DesignModel):
+    '''
+        A DesignModel from a plain function, called on every 
+        clock edge out of reset:
+        
+            def step(ui_in:int, uio_in:int):
+                ...
+                return (uo_out, uio_out)
+        
+        with uio_oe fixed.
+    '''
+    def __init__(self, step, uio_oe:int=0, reset_outputs:tuple=(0, 0)):
+        super().__init__()
+        self.step = step
+        self.uio_oe = uio_oe
+        self.reset_outputs = reset_outputs
+        self.reset()
+
+    def reset(self):
+        self.uo_out, self.uio_out = self.reset_outputs
+
+    def clock(self, ui_in:int, uio_in:int):
+        self.uo_out, self.uio_out = self.step(ui_in, uio_in)
@@ -0,0 +1,153 @@
+'''
+Created on Oct 18, 2026
+
+Reference models of the projects the SDK itself tests with, for
+co-simulation (SimDUT, or platform.mem32.attach_model()) and to
+generate expected values on the board, e.g. for a streaming
+compare after a reset:
+
+    from ttboard.sim.reference import FactoryTestModel
+    from ttboard.shmoo.engine import VectorProbe
+
+    stim = bytearray([1]*4096)   # counter mode
+    model = FactoryTestModel()
+    model.reset()                # as the probe does, before streaming
+    expected = model.run_vectors(stim)
+    probe = VectorProbe(tt, stim, expected)
+
+TTTestModel is tt_um_test: an 8 bit counter on uo_out.
+
+FactoryTestModel is tt_um_factory_test:
+  * ui_in[0] high: counter mode, uo_out and uio_out both count, the
+    project drives uio;
+  * ui_in[0] low: loopback, uo_out follows uio_in (combinational),
+    uio are all inputs.
+Its reset goes through a synchronizer, so the counter only starts
+on the second rising edge after rst_n goes high.
+
+For whole runs where the outputs are counts, run_vectors() builds
+a period of the sequence and tiles it over the capture buffer,
+rather than stepping the model a clock at a time.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+from ttboard.sim.model import DesignModel
+
+def fill_tiled(out, pattern, num_bytes:int):
+    '''
+        Repeat pattern over the first num_bytes of out,
+        with a handful of slice copies.
+    '''
+    mv = memoryview(out)
+    filled = min(len(pattern), num_bytes)
+    mv[:filled] = memoryview(pattern)[:filled]
+    while filled < num_bytes:
+        chunk = min(filled, num_bytes - filled)
+        mv[filled:filled + chunk] = mv[:chunk]
+        filled += chunk
+    return out
+
+
+class TTTestModel(DesignModel):
+    '''
+        tt_um_test: uo_out counts rising clock edges.
+    '''
+    # uio_out is the count too, when counting
+    CountsOnUIO = False
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        # rising edges before counting starts (reset synchronizer)
+        self.reset_lag = 0
+        self._inputs = (0, 0)
+
+    def reset(self):
+        self.count = 0
+        self._outputs(*self._inputs)
+
+    def clock(self, ui_in:int, uio_in:int):
+        if self.reset_lag:
+            self.reset_lag -= 1
+        else:
+            self.count = (self.count + 1) & 0xff
+        self._outputs(ui_in, uio_in)
+
+    def inputs_changed(self, ui_in:int, uio_in:int):
+        self._outputs(ui_in, uio_in)
+
+    def _outputs(self, ui_in:int, uio_in:int):
+        self._inputs = (ui_in, uio_in)
+        self.uo_out = self.count
+
+    def counting(self, ui_in:int) -> bool:
+        '''
+            Whether uo_out is the count, for this ui_in
+        '''
+        return True
+
+    def run_vectors(self, stim, capture=None, clocks_per_vector:int=1,
+                    capture_uio:bool=False, uio_in:int=0):
+        n = len(stim)
+        if not n or not self._all_counting(stim):
+            return super().run_vectors(stim, capture, clocks_per_vector, capture_uio, uio_in)
+        stride = 2 if capture_uio else 1
+        if capture is None:
+            capture = bytearray(n*stride)
+
+        # count after vector i is count + (i+1)*clocks - lag, the
+        # sequence repeats every 256 vectors (or some divisor of that)
+        lag = min(self.reset_lag, clocks_per_vector)
+        start = self.count + clocks_per_vector - lag
+        uio = self.CountsOnUIO
+        pattern = bytearray(256*stride)
+        for i in range(256):
+            c = (start + i*clocks_per_vector) & 0xff
+            pattern[i*stride] = c
+            if capture_uio:
+                pattern[i*stride + 1] = c if uio else (uio_in & ~self.uio_oe & 0xff)
+        fill_tiled(capture, pattern, n*stride)
+
+        self.reset_lag -= lag
+        self.count = (start + (n - 1)*clocks_per_vector) & 0xff
+        self._outputs(stim[n - 1], uio_in)
+        return capture
+
+    def _all_counting(self, stim) -> bool:
+        counting = self.counting
+        for v in stim:
+            if not counting(v):
+                return False
+        return True
+
+
+class FactoryTestModel(TTTestModel):
+    '''
+        tt_um_factory_test, counter or loopback depending on ui_in[0]
+    '''
+    CountsOnUIO = True
+
+    def reset(self):
+        self.reset_lag = 1
+        super().reset()
+
+    def _outputs(self, ui_in:int, uio_in:int):
+        self._inputs = (ui_in, uio_in)
+        if ui_in & 1:
+            self.uo_out = self.count
+            self.uio_out = self.count
+            self.uio_oe = 0xff
+        else:
+            self.uo_out = uio_in
+            self.uio_out = 0
+            self.uio_oe = 0
+
+    def counting(self, ui_in:int) -> bool:
+        return (ui_in & 1) != 0
+
+    def loopback(self, uio_in) -> bytearray:
+        '''
+            Expected uo_out for each of uio_in, in loopback mode
+        '''
+        return bytearray(uio_in)
@@ -0,0 +1,160 @@
+'''
+Created on Oct 18, 2026
+
+Simulated RP2040 SIO register file, standing in for
+machine.mem32 off-target.
+
+GPIO_OUT (and its SET/CLR/XOR aliases) and GPIO_OE behave like 
+the real thing.  GPIO_IN is computed from the pads: a pin the RP 
+drives (OE set) reads back its output value, otherwise it reads 
+whatever is driving it externally (an attached DesignModel, or 
+drive()) or, failing that, its pull-up.
+
+Any other address is just plain memory.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+
+GPIO_IN = 0xd0000004
+GPIO_OUT = 0xd0000010
+GPIO_OUT_SET = 0xd0000014
+GPIO_OUT_CLR = 0xd0000018
+GPIO_OUT_XOR = 0xd000001c
+GPIO_OE = 0xd0000020
+GPIO_OE_SET = 0xd0000024
+GPIO_OE_CLR = 0xd0000028
+GPIO_OE_XOR = 0xd000002c
+
+GPIOMask = 0x3fffffff # 30 GPIO
+
+class SIORegisterFile:
+    def __init__(self):
+        self.gpio_out = 0
+        self.gpio_oe = 0
+        self.pull_up = 0
+        self.ext_value = 0
+        self.ext_mask = 0
+        self._memory = dict()
+        self._model = None
+
+    @property
+    def gpio_in(self) -> int:
+        oe = self.gpio_oe
+        ext = self.ext_mask & ~oe
+        return ((self.gpio_out & oe) 
+                | (self.ext_value & ext)
+                | (self.pull_up & ~(oe | ext))) & GPIOMask
+
+    def __getitem__(self, addr:int) -> int:
+        if addr == GPIO_IN:
+            return self.gpio_in
+        if addr == GPIO_OUT:
+            return self.gpio_out
+        if addr == GPIO_OE:
+            return self.gpio_oe
+        return self._memory.get(addr, 0)
+
+    def __setitem__(self, addr:int, val:int):
+        val &= 0xffffffff
+        if addr == GPIO_OUT_XOR:
+            self.gpio_out = (self.gpio_out ^ val) & GPIOMask
+        elif addr == GPIO_OUT_SET:
+            self.gpio_out = (self.gpio_out | val) & GPIOMask
+        elif addr == GPIO_OUT_CLR:
+            self.gpio_out &= ~val
+        elif addr == GPIO_OUT:
+            self.gpio_out = val & GPIOMask
+        elif addr == GPIO_OE:
+            self.gpio_oe = val & GPIOMask
+        elif addr == GPIO_OE_SET:
+            self.gpio_oe = (self.gpio_oe | val) & GPIOMask
+        elif addr == GPIO_OE_CLR:
+            self.gpio_oe &= ~val
+        elif addr == GPIO_OE_XOR:
+            self.gpio_oe = (self.gpio_oe ^ val) & GPIOMask
+        else:
+            self._memory[addr] = val
+            return
+
+        if self._model is not None:
+            self._model_update()
+
+    def set_pull_up(self, gpio:int, enable:bool):
+        if enable:
+            self.pull_up |= (1 << gpio)
+        else:
+            self.pull_up &= ~(1 << gpio)
+
+    def drive(self, mask:int, value:int):
+        '''
+            Externally drive the pins in mask to value, 
+            e.g. to play the part of the ASIC. mask 0 
+            releases everything.
+        '''
+        self.ext_mask = mask & GPIOMask
+        self.ext_value = value & mask
+
+    def reset(self):
+        '''
+            Back to power-on state, model detached.
+        '''
+        self.__init__()
+
+    @property
+    def model(self):
+        return self._model
+
+    def attach_model(self, model, gpio_map=None):
+        '''
+            Have model play the part of the project.
+            @param model: a ttboard.sim.model.DesignModel
+            @param gpio_map: board layout, defaults to the active GPIOMap
+        '''
+        # import here: platform imports this module
+        from ttboard.pins.port_compiler import PortLayout
+        import ttboard.pins.gpio_map as gp
+        if gpio_map is None:
+            gpio_map = gp.GPIOMap
+        layout = PortLayout.from_gpio_map(gpio_map)
+        self._gather_ui_in = eval('lambda v: ' + layout.gather_expr('ui_in'))
+        self._gather_uio = eval('lambda v: ' + layout.gather_expr('uio'))
+        self._scatter_uo_out = eval('lambda val: ' + layout.scatter_expr('uo_out'))
+        self._scatter_uio = eval('lambda val: ' + layout.scatter_expr('uio'))
+        self._uo_out_mask = layout.gpio_mask('uo_out')
+        self._clk_bit = 1 << layout.clock
+        # board has a pull-up on reset, so undriven means not in reset
+        self._rst_bit = 1 << gpio_map.project_reset()
+        self._last_clk = 0
+        self._last_inputs = None
+        self._model = model
+        self._apply_model_outputs()
+
+    def detach_model(self):
+        self._model = None
+        self.drive(0, 0)
+
+    def _model_update(self):
+        model = self._model
+        driven = self.gpio_out & self.gpio_oe
+        clk = 1 if driven & self._clk_bit else 0
+        ui_in = self._gather_ui_in(self.gpio_in)
+        uio_in = self._gather_uio(driven)
+        if clk and not self._last_clk:
+            if (self.gpio_oe & self._rst_bit) and not (driven & self._rst_bit):
+                model.reset()
+            else:
+                model.clock(ui_in, uio_in)
+            self._last_inputs = (ui_in, uio_in)
+            self._apply_model_outputs()
+        elif self._last_inputs != (ui_in, uio_in):
+            self._last_inputs = (ui_in, uio_in)
+            model.inputs_changed(ui_in, uio_in)
+            self._apply_model_outputs()
+        self._last_clk = clk
+
+    def _apply_model_outputs(self):
+        model = self._model
+        uio_oe = self._scatter_uio(model.uio_oe)
+        self.ext_mask = self._uo_out_mask | uio_oe
+        self.ext_value = self._scatter_uo_out(model.uo_out) | (self._scatter_uio(model.uio_out) & uio_oe)
@@ -0,0 +1,253 @@
+'''
+Created on Oct 18, 2026
+
+Stimulus/response streaming at hardware speed.
+
+A PIO program pulls ui_in vectors from its TX FIFO, presents each
+one on the (non-contiguous) ui_in pins, pulses the project clock
+and samples uo_out--optionally uio too--into its RX FIFO.  Both
+FIFOs are fed/drained by DMA, so nothing runs in python while a
+buffer is being streamed, e.g.
+
+    from ttboard.stream.engine import StreamEngine
+
+    tt.shuttle.tt_um_factory_test.enable()
+    eng = StreamEngine()
+    results = eng.run(bytearray([1]*4096))
+
+The project clock runs at (PIO clock)/4 (2 cycles high, 2 low), so
+~30MHz at the default 125MHz system clock.  Pass freq to slow the
+state machine down.
+
+On the desktop, or on a board whose GPIO layout isn't the TT04/TT06
+one the PIO programs are written for, this falls back to
+platform.apply_vectors, so results are the same, just not as fast.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+
+from ttboard.demoboard import DemoBoard
+from ttboard.pio.resources import PIOResources
+import ttboard.util.platform as platform
+import ttboard.util.time as time
+import ttboard.log as logging
+log = logging.getLogger(__name__)
+
+if platform.IsRP2040:
+    import rp2
+    import machine
+
+    # All these are relative to the TT04/TT06 demoboard
+    # GPIO layout:
+    #   clk: GPIO 0, side-set
+    #   ui_in: GPIO 9-12 and 17-20, out pins 9..20 (so 12 pins)
+    #       where GPIO 13-16 (uo_out high nibble) are left as inputs
+    #   uo_out: GPIO 5-8 and 13-16, in pins from 5
+    #   uio: GPIO 21-28
+    # ISR/OSR both shift right, so the captured byte(s) end up at the
+    # *top* of the word pushed to the RX FIFO--DMA reads from RXF + 3
+    # (or + 2, for 16 bit transfers) to get at them.
+    _OutInit = (rp2.PIO.OUT_LOW,)*4 + (rp2.PIO.IN_LOW,)*4 + (rp2.PIO.OUT_LOW,)*4
+
+    @rp2.asm_pio(sideset_init=rp2.PIO.OUT_LOW, out_init=_OutInit,
+                 in_shiftdir=rp2.PIO.SHIFT_RIGHT, out_shiftdir=rp2.PIO.SHIFT_RIGHT)
+    def _stream_prog():
+        # y holds clocks_per_vector - 1, preloaded
+        wrap_target()
+        pull(block)             .side(0)
+        # scatter the byte: low nibble -> bit 0, high nibble -> bit 8
+        out(x, 4)
+        in_(x, 4)
+        in_(null, 4)
+        out(x, 4)
+        in_(x, 4)
+        in_(null, 20)
+        mov(pins, isr)
+        mov(isr, null)
+        mov(x, y)
+        label("clock_loop")
+        nop()                   .side(1) [1]
+        jmp(x_dec, "clock_loop").side(0) [1]
+        # sample uo_out, gather its two nibbles
+        mov(osr, pins)
+        in_(osr, 4)
+        out(null, 8)
+        in_(osr, 4)
+        push(block)
+        wrap()
+
+    @rp2.asm_pio(sideset_init=rp2.PIO.OUT_LOW, out_init=_OutInit,
+                 in_shiftdir=rp2.PIO.SHIFT_RIGHT, out_shiftdir=rp2.PIO.SHIFT_RIGHT)
+    def _stream_prog_uio():
+        # same as above, but also captures uio
+        wrap_target()
+        pull(block)             .side(0)
+        out(x, 4)
+        in_(x, 4)
+        in_(null, 4)
+        out(x, 4)
+        in_(x, 4)
+        in_(null, 20)
+        mov(pins, isr)
+        mov(isr, null)
+        mov(x, y)
+        label("clock_loop")
+        nop()                   .side(1) [1]
+        jmp(x_dec, "clock_loop").side(0) [1]
+        mov(osr, pins)
+        in_(osr, 4)
+        out(null, 8)
+        in_(osr, 4)
+        out(null, 8)
+        in_(osr, 8)
+        push(block)
+        wrap()
+
+
+
+class StreamEngine:
+    '''
+        Streams a buffer of ui_in vectors through the project,
+        one vector per project clock (or clocks_per_vector),
+        capturing uo_out (and optionally uio) for each.
+
+        Same contract as DemoBoard.run_vectors, but using
+        PIO + DMA on the RP2040.
+    '''
+    PIOBase = [0x50200000, 0x50300000]
+
+    def __init__(self, tt:DemoBoard=None, sm_id:int=4, freq:int=None, timeout_ms:int=5000):
+        '''
+            @param tt: the DemoBoard, defaults to DemoBoard.get()
+            @param sm_id: preferred state machine, 0-7 (4-7 are on PIO1), 
+                          another is used if it's taken
+            @param freq: PIO clock, defaults to system clock (project clock is 1/4 of this)
+            @param timeout_ms: how long to wait for a stream to complete
+        '''
+        if tt is None:
+            tt = DemoBoard.get()
+        self.tt = tt
+        self.sm_id = sm_id
+        self.freq = freq
+        self.timeout_ms = timeout_ms
+        self._warned_layout = False
+
+    @property
+    def pio_index(self):
+        return self.sm_id // 4
+
+    @property
+    def sm_index(self):
+        return self.sm_id % 4
+
+    @property
+    def txf_addr(self):
+        return self.PIOBase[self.pio_index] + 0x10 + 4*self.sm_index
+
+    @property
+    def rxf_addr(self):
+        return self.PIOBase[self.pio_index] + 0x20 + 4*self.sm_index
+
+    @property
+    def dreq_tx(self):
+        return 8*self.pio_index + self.sm_index
+
+    @property
+    def dreq_rx(self):
+        return 8*self.pio_index + 4 + self.sm_index
+
+    @property
+    def pio_supported(self) -> bool:
+        '''
+            The PIO programs are hard-wired for the TT04/TT06
+            layout, on other boards run() uses apply_vectors.
+        '''
+        if not self.tt.pins.layout.is_standard:
+            if not self._warned_layout:
+                log.warn('Board layout unlike TT04/TT06: streaming with apply_vectors, not PIO')
+                self._warned_layout = True
+            return False
+        return True
+
+    def run(self, stim, capture=None, clocks_per_vector:int=1, capture_uio:bool=False):
+        '''
+            Stream stim through the project.
+            @param stim: bytes/bytearray of ui_in values
+            @param capture: optional preallocated bytearray for results
+            @param clocks_per_vector: project clock pulses per vector
+            @param capture_uio: also sample the bidir pins (2 bytes per vector)
+            @return: the capture buffer
+        '''
+        stride = 2 if capture_uio else 1
+        if capture is None:
+            capture = bytearray(len(stim)*stride)
+        if clocks_per_vector < 1:
+            raise ValueError('clocks_per_vector must be >= 1')
+        if not len(stim):
+            return capture
+
+        self.tt._take_project_io_control('Streaming vectors')
+        if not platform.IsRP2040 or not self.pio_supported:
+            platform.apply_vectors(stim, clocks_per_vector, capture, capture_uio)
+        else:
+            platform._vector_capture_stride(stim, capture, capture_uio)
+            try:
+                self._stream(stim, capture, clocks_per_vector, capture_uio)
+            finally:
+                # leave ui_in as last presented, then give pins back to SIO
+                platform.write_ui_in_byte(stim[-1])
+                self._restore_pins()
+
+        self.tt.ui_in.port.do_force_update_last_value(stim[-1])
+        return capture
+
+    def _stream(self, stim, capture, clocks_per_vector:int, capture_uio:bool):
+        prog = _stream_prog_uio if capture_uio else _stream_prog
+        kwargs = {
+            'sideset_base': machine.Pin(0),
+            'out_base': machine.Pin(9),
+            'in_base': machine.Pin(5)
+        }
+        if self.freq is not None:
+            kwargs['freq'] = self.freq
+        resources = PIOResources.get()
+        self.sm_id = resources.claim_sm(self, prog, self.sm_id)
+        try:
+            sm = rp2.StateMachine(self.sm_id, prog, **kwargs)
+
+            sm.put(clocks_per_vector - 1)
+            sm.exec('pull()')
+            sm.exec('out(y, 32)')
+
+            dma_tx = resources.claim_dma(self)
+            dma_rx = resources.claim_dma(self)
+            dma_rx.config(
+                read=self.rxf_addr + (2 if capture_uio else 3),
+                write=capture,
+                count=len(stim),
+                ctrl=dma_rx.pack_ctrl(size=(1 if capture_uio else 0),
+                                      inc_read=False, treq_sel=self.dreq_rx),
+                trigger=True)
+            dma_tx.config(
+                read=stim,
+                write=self.txf_addr,
+                count=len(stim),
+                ctrl=dma_tx.pack_ctrl(size=0, inc_write=False, treq_sel=self.dreq_tx),
+                trigger=True)
+
+            sm.active(1)
+            start = time.ticks_ms()
+            while dma_rx.active():
+                if time.ticks_diff(time.ticks_ms(), start) > self.timeout_ms:
+                    raise RuntimeError(f'Stream timed out ({dma_rx.count} vectors left)')
+        finally:
+            resources.release(self)
+
+    def _restore_pins(self):
+        # StateMachine init handed these GPIO over to PIO,
+        # re-init'ing the pins puts them back on SIO
+        for p in self.tt.pins.all:
+            gpio = p.gpio_num
+            if gpio is not None and (gpio == 0 or (gpio >= 9 and gpio <= 20)):
+                p.mode = p.mode
@@ -0,0 +1,191 @@
+'''
+Created on Oct 18, 2026
+
+Recorded DUT sessions, as regression vectors.
+
+A testbench run through ttboard.cocotb is slow--every step is
+interpreted python--but what it does to the project is deterministic.
+dut.start_recording() captures, for every project clock, the inputs
+presented on the rising edge and the outputs seen after the falling
+edge, into a VectorSession, which can be saved to a compact binary
+file and replayed later at hardware speed:
+
+    session = dut.stop_recording()
+    session.save('/factory_test.ttv')
+    ...
+    session = VectorSession.load('/factory_test.ttv')
+    result = SessionReplay().run(session)
+    if not result.passed:
+        print(result)   # first cycle that didn't match
+
+Replay streams ui_in through the StreamEngine (PIO+DMA), one vector
+per clock, in runs where rst_n, uio_in and uio_oe_pico stay put,
+setting those between runs.  This assumes a synchronous design,
+that only looks at its inputs on the rising edge of clk.
+
+The file is a header, followed by one plane of cycle-count bytes per
+field (ui_in, uio_in, uio_oe, flags, uo_out, uio_out), so ui_in and
+the expected outputs are ready to stream as-is.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+import struct
+import ttboard.log as logging
+log = logging.getLogger(__name__)
+
+FileMagic = b'TTVR'
+FileVersion = 1
+HeaderFormat = '<4sBBHI'
+FlagResetN = 0x01
+
+class VectorSession:
+    '''
+        Per clock inputs and expected outputs,
+        in preallocated planes.
+    '''
+    Fields = ['ui_in', 'uio_in', 'uio_oe', 'flags', 'uo_out', 'uio_out']
+
+    def __init__(self, max_cycles:int=4096):
+        self.max_cycles = max_cycles
+        self.num_cycles = 0
+        self.ui_in = bytearray(max_cycles)
+        self.uio_in = bytearray(max_cycles)
+        self.uio_oe = bytearray(max_cycles)
+        self.flags = bytearray(max_cycles)
+        self.uo_out = bytearray(max_cycles)
+        self.uio_out = bytearray(max_cycles)
+
+    def __len__(self):
+        return self.num_cycles
+
+    @property
+    def full(self) -> bool:
+        return self.num_cycles >= self.max_cycles
+
+    def append(self, ui_in:int, uio_in:int, uio_oe:int, rst_n:int, uo_out:int, uio_out:int) -> bool:
+        '''
+            Add a clock cycle.
+            @return: False if the session is full
+        '''
+        i = self.num_cycles
+        if i >= self.max_cycles:
+            return False
+        self.ui_in[i] = ui_in
+        self.uio_in[i] = uio_in
+        self.uio_oe[i] = uio_oe
+        self.flags[i] = FlagResetN if rst_n else 0
+        self.uo_out[i] = uo_out
+        self.uio_out[i] = uio_out
+        self.num_cycles = i + 1
+        return True
+
+    def cycle(self, i:int) -> dict:
+        return dict(map(lambda f: (f, getattr(self, f)[i]), self.Fields))
+
+    def runs(self):
+        '''
+            Generator of (start, end, uio_in, uio_oe, rst_n)
+            for each stretch of cycles with the same
+            rst_n/uio settings.
+        '''
+        start = 0
+        n = self.num_cycles
+        while start < n:
+            uio_in = self.uio_in[start]
+            uio_oe = self.uio_oe[start]
+            flags = self.flags[start]
+            end = start + 1
+            while end < n and self.uio_in[end] == uio_in \
+                    and self.uio_oe[end] == uio_oe and self.flags[end] == flags:
+                end += 1
+            yield (start, end, uio_in, uio_oe, 1 if flags & FlagResetN else 0)
+            start = end
+
+    def save(self, path:str):
+        n = self.num_cycles
+        with open(path, 'wb') as f:
+            f.write(struct.pack(HeaderFormat, FileMagic, FileVersion, len(self.Fields), 0, n))
+            for field in self.Fields:
+                f.write(memoryview(getattr(self, field))[:n])
+
+    @classmethod
+    def load(cls, path:str):
+        with open(path, 'rb') as f:
+            header = f.read(struct.calcsize(HeaderFormat))
+            magic, version, num_fields, _rsvd, n = struct.unpack(HeaderFormat, header)
+            if magic != FileMagic or version != FileVersion or num_fields != len(cls.Fields):
+                raise ValueError(f'{path} is not a recorded session')
+            session = cls(n)
+            for field in cls.Fields:
+                plane = getattr(session, field)
+                if f.readinto(plane) != n:
+                    raise ValueError(f'{path} is truncated')
+            session.num_cycles = n
+        return session
+
+    def __repr__(self):
+        return f'<VectorSession {self.num_cycles} cycles>'
+
+
+class ReplayResult:
+    def __init__(self, num_cycles:int, mismatch:int=None, expected:tuple=None, got:tuple=None):
+        self.num_cycles = num_cycles
+        self.mismatch = mismatch
+        self.expected = expected
+        self.got = got
+
+    @property
+    def passed(self) -> bool:
+        return self.mismatch is None
+
+    def __repr__(self):
+        if self.passed:
+            return f'<ReplayResult {self.num_cycles} cycles OK>'
+        return f'<ReplayResult mismatch @ cycle {self.mismatch}: uo_out/uio expected {self.expected[0]:02x}/{self.expected[1]:02x}, got {self.got[0]:02x}/{self.got[1]:02x}>'
+
+
+class SessionReplay:
+    '''
+        Re-applies a VectorSession to the project, at
+        hardware speed, checking the outputs.
+    '''
+    def __init__(self, tt=None, engine=None):
+        '''
+            @param tt: the DemoBoard, defaults to DemoBoard.get()
+            @param engine: a StreamEngine, to choose its state machine/speed
+        '''
+        from ttboard.stream.engine import StreamEngine
+        if engine is None:
+            engine = StreamEngine(tt)
+        self.engine = engine
+        self.tt = engine.tt
+
+    def run(self, session:VectorSession) -> ReplayResult:
+        '''
+            Replay session, stopping at the first mismatch.
+        '''
+        tt = self.tt
+        capture = bytearray(2*session.max_cycles)
+        for start, end, uio_in, uio_oe, rst_n in session.runs():
+            tt.uio_oe_pico.value = uio_oe
+            tt.uio_in.value = uio_in
+            tt.reset_project(not rst_n)
+            stim = memoryview(session.ui_in)[start:end]
+            self.engine.run(stim, memoryview(capture)[:2*(end - start)], capture_uio=True)
+            mismatch = self._check(session, start, end, capture)
+            if mismatch is not None:
+                return mismatch
+        log.info(f'Replayed {len(session)} cycles, all match')
+        return ReplayResult(len(session))
+
+    def _check(self, session:VectorSession, start:int, end:int, capture) -> ReplayResult:
+        for i in range(start, end):
+            j = 2*(i - start)
+            oe = session.uio_oe[i]
+            got = (capture[j], capture[j + 1] & ~oe & 0xff)
+            expected = (session.uo_out[i], session.uio_out[i])
+            if got != expected:
+                log.warn(f'Replay mismatch at cycle {i}')
+                return ReplayResult(len(session), i, expected, got)
+        return None
@@ -12,6 +12,21 @@ import microcotb.platform
 IsRP2040 = microcotb.platform.IsRP2040
 
 
+def _vector_capture_stride(stim, capture, capture_uio:bool):
+    # each vector captures uo_out, optionally followed by uio
+    stride = 2 if capture_uio else 1
+    if len(capture) < len(stim)*stride:
+        raise ValueError(f'capture buffer too small: need {len(stim)*stride} bytes, have {len(capture)}')
+    return stride
+
+
+def _pio_resources():
+    # the shared PIO/DMA allocator (ttboard.pio.resources), which
+    # imports this module, so only pulled in once something needs it
+    from ttboard.pio.resources import PIOResources
+    return PIOResources.get()
+
+
 if IsRP2040:
     '''
         low-level machine related methods.
@@ -42,6 +57,10 @@ if IsRP2040:
             tt.muxCtrl.mode_project_IO()
                 to behave normally.
         
+        These are the defaults: when Pins is created, 
+        ttboard.pins.port_compiler replaces them with versions 
+        generated from the detected GPIOMap.
+        
         The machine native stuff below uses 
         direct access to mem32 to go fastfastfast
         but this is pretty opaque.  For ref, here are 
@@ -59,6 +78,7 @@ if IsRP2040:
     '''
     import rp2
     import machine
+    import time
     
     
     def pin_as_input(gpio_index:int, pull:int=None):
@@ -69,54 +89,307 @@ if IsRP2040:
     def dump_portset(p:str, v:int):
         print(f'ps {p}: {bin(v)}')
         return
-    @rp2.asm_pio(set_init=rp2.PIO.OUT_HIGH)
-    def _pio_toggle_pin():
+    @rp2.asm_pio(sideset_init=rp2.PIO.OUT_LOW)
+    def _pio_clock_fast():
+        # one state machine cycle high, one low
         wrap_target()
-        set(pins, 1)
-        mov(y, osr)
-        label("delay1")
-        jmp(y_dec, "delay1")  # Delay
-        set(pins, 0)
-        mov(y, osr)
-        label("delay2")
-        jmp(y_dec, "delay2")  # Delay
+        nop()                   .side(1)
+        nop()                   .side(0)
         wrap()
+    
+    @rp2.asm_pio(sideset_init=rp2.PIO.OUT_LOW)
+    def _pio_clock_delay():
+        # half periods of delay+2 cycles, delay held in OSR
+        wrap_target()
+        mov(y, osr)             .side(1)
+        label("high")
+        jmp(y_dec, "high")      .side(1)
+        mov(y, osr)             .side(0)
+        label("low")
+        jmp(y_dec, "low")       .side(0)
+        wrap()
+    
+    @rp2.asm_pio()
+    def _pio_edge_counter():
+        # x counts down once per rising edge on in_base
+        mov(x, invert(null))
+        label("count")
+        wait(1, pin, 0)
+        wait(0, pin, 0)
+        jmp(x_dec, "count")
         
     class PIOClock:
-        def __init__(self, pin):
+        '''
+            Project clock generated by a PIO state machine, anywhere 
+            from fractions of a Hz to half the system clock, without 
+            touching the system clock.  See clocking.planner.plan_pio.
+        '''
+        PIOBase = [0x50200000, 0x50300000]
+        def __init__(self, pin, sm_id:int=0):
             self.freq = 0
             self.pin = pin
+            self.sm_id = sm_id
+            self.plan = None
             self._current_pio = None 
             
-        def start(self, freq_hz:int):
-            self.freq = freq_hz 
-            
+        def start(self, freq_hz):
+            from ttboard.clocking.planner import plan_pio, PIOClockPlan
             self.stop()
-            if self.freq <= 0:
+            if freq_hz <= 0:
                 return
-                
-            set_RP_system_clock(100_000_000)
-            if self._current_pio is None:
-                self._current_pio = rp2.StateMachine(
-                    0,
-                    _pio_toggle_pin,
-                    freq=2000,
-                    set_base=self.pin,
-                )
             
-            # Set the delay: 1000 cycles per hz minus 2 cycles for the set/mov instructions
-            self._current_pio.put(int(500 * (2 / self.freq) - 2))
-            self._current_pio.exec("pull()")
+            plan = plan_pio(freq_hz, machine.freq())
+            if plan.program == PIOClockPlan.Fast:
+                prog = _pio_clock_fast
+            else:
+                prog = _pio_clock_delay
+            
+            self.sm_id = _pio_resources().claim_sm(self, prog, self.sm_id)
+            self.pin.value(0)
+            self._current_pio = rp2.StateMachine(self.sm_id, prog, 
+                                                 freq=max(plan.sys_hz * 256 // plan.div256, plan.sys_hz // 65535 + 1), 
+                                                 sideset_base=self.pin)
+            # StateMachine only takes a frequency, set the exact divider 
+            # (SMx_CLKDIV: INT in 31:16, FRAC in 15:8, INT 0 means 65536)
+            pio = self.sm_id // 4
+            sm = self.sm_id % 4
+            machine.mem32[self.PIOBase[pio] + 0xc8 + 0x18*sm] = (plan.div256 & 0xffffff) << 8
+            if plan.program == PIOClockPlan.Delay:
+                self._current_pio.put(plan.delay)
+                self._current_pio.exec("pull()")
             self._current_pio.active(1)
+            self.freq = freq_hz
+            self.plan = plan
+        
+        @property 
+        def actual_freq(self) -> float:
+            if self.plan is None:
+                return 0
+            return self.plan.freq_hz
+        
+        def system_clock_changed(self, old_hz:int, new_hz:int):
+            # divider was worked out for the old clock
+            if self.freq:
+                self.start(self.freq)
             
         def stop(self):
-            if self._current_pio is None or not self.freq:
+            if self._current_pio is None:
                 return 
             
             self._current_pio.active(0)
+            _pio_resources().release(self)
             self.freq = 0
+            self.plan = None
             self._current_pio = None
             self.pin.init(machine.Pin.IN)
+            
+    def measure_frequency(pin, window_ms:int=100, sm_id:int=2) -> float:
+        '''
+            Count rising edges on pin, using a PIO state machine, for
+            window_ms.  Works whether the pin is driven by SIO, PWM or
+            another state machine, up to ~sysclk/4.
+            @return: frequency in Hz
+        '''
+        resources = _pio_resources()
+        owner = 'measure_frequency'
+        sm_id = resources.claim_sm(owner, _pio_edge_counter, sm_id)
+        try:
+            sm = rp2.StateMachine(sm_id, _pio_edge_counter, in_base=pin)
+            sm.active(1)
+            time.sleep_ms(window_ms)
+            sm.active(0)
+            sm.exec("mov(isr, x)")
+            sm.exec("push()")
+            edges = 0xffffffff - sm.get()
+        finally:
+            resources.release(owner)
+        return edges * 1000 / window_ms
+    
+    # x counts down every 2 cycles from start, primed (pin low) 
+    # or not, until the rising edge on jmp_pin, then it's pushed
+    @rp2.asm_pio()
+    def _pio_rising_edge_timer():
+        mov(x, invert(null))
+        label("prime")
+        jmp(pin, "high")
+        jmp("wait_high")
+        label("high")
+        jmp(x_dec, "prime")
+        label("wait_high")
+        jmp(pin, "edge")
+        jmp(x_dec, "wait_high")
+        label("edge")
+        mov(isr, x)
+        push()
+        label("halt")
+        jmp("halt")
+    
+    # same, for a falling edge
+    @rp2.asm_pio()
+    def _pio_falling_edge_timer():
+        mov(x, invert(null))
+        label("prime")
+        jmp(pin, "wait_low")
+        jmp(x_dec, "prime")
+        label("wait_low")
+        jmp(pin, "high")
+        jmp("edge")
+        label("high")
+        jmp(x_dec, "wait_low")
+        label("edge")
+        mov(isr, x)
+        push()
+        label("halt")
+        jmp("halt")
+    
+    class PIOEdgeTimer:
+        '''
+            Times a single edge on a GPIO we read (uo_out, uio), 
+            from arm(), with a PIO state machine counting 2 system
+            clock cycles per step, so the edge time is good to a 
+            few ns no matter how late we get around to checking
+            fired.  The pin itself is left alone.
+        '''
+        def __init__(self, gpio:int, sm_id:int=3):
+            self.gpio = gpio
+            self.sm_id = sm_id
+            self._sm = None
+            self._count = None
+            self._sysclk = 0
+            
+        def arm(self, rising:bool):
+            '''
+                Start watching for the next rising (or falling) edge.  
+                Like RisingEdge/FallingEdge, if the pin is already 
+                high (low) it needs to go low (high) first.
+            '''
+            self.disarm()
+            prog = _pio_rising_edge_timer if rising else _pio_falling_edge_timer
+            self.sm_id = _pio_resources().claim_sm(self, prog, self.sm_id)
+            self._sysclk = machine.freq()
+            self._count = None
+            self._sm = rp2.StateMachine(self.sm_id, prog, freq=self._sysclk, 
+                                        jmp_pin=machine.Pin(self.gpio))
+            self._sm.active(1)
+            
+        @property 
+        def fired(self) -> bool:
+            if self._count is not None:
+                return True
+            if self._sm is None or not self._sm.rx_fifo():
+                return False
+            self._count = 0xffffffff - self._sm.get()
+            return True
+            
+        @property 
+        def elapsed_us(self) -> float:
+            '''
+                Time from arm() to the edge, once fired
+            '''
+            if not self.fired:
+                return None
+            return self._count * 2000000 / self._sysclk
+        
+        def disarm(self):
+            if self._sm is None:
+                return
+            self.fired # keep any edge seen
+            self._sm.active(0)
+            _pio_resources().release(self)
+            self._sm = None
+    
+    # clocks x+1 times, as fast as the state machine runs
+    # (1 cycle high, 1 low), then pushes a 0 to say it's done
+    @rp2.asm_pio(sideset_init=rp2.PIO.OUT_LOW, autopull=True, pull_thresh=32, 
+                 autopush=True, push_thresh=32)
+    def _pio_clock_burst():
+        out(x, 32)              .side(0)
+        label("clock_loop")
+        nop()                   .side(1)
+        jmp(x_dec, "clock_loop").side(0)
+        in_(null, 32)           .side(0)
+    
+    class PIOClockBurst:
+        '''
+            Emits exactly N clock pulses on pin, using PIO.
+            The pin belongs to the state machine from start() 
+            until release(), which hands it back to SIO as 
+            an output, low.
+        '''
+        def __init__(self, pin, sm_id:int=1):
+            self.pin = pin
+            self.sm_id = sm_id
+            self._sm = None
+            self._sm_freq = 0
+            self._expected_ms = 0
+            # burst started, and not yet wait()ed on
+            self._running = False
+            
+        @property 
+        def busy(self) -> bool:
+            return self._running and not self._sm.rx_fifo()
+        
+        def start(self, num_cycles:int, freq:int=None):
+            '''
+                @param num_cycles: clock pulses to emit
+                @param freq: clock frequency, None for max (system clock/2)
+            '''
+            if num_cycles < 1:
+                return
+            sysclk = machine.freq()
+            sm_freq = sysclk if freq is None else 2*int(freq)
+            if sm_freq > sysclk or sm_freq < (sysclk // 65536) + 1:
+                raise ValueError(f'Clock burst freq must be between {(sysclk // 131072) + 1} and {sysclk//2}Hz')
+            
+            self.wait()
+            if self._sm is None or sm_freq != self._sm_freq:
+                self.sm_id = _pio_resources().claim_sm(self, _pio_clock_burst, self.sm_id)
+                # make sure SIO leaves it low, when we're done
+                self.pin.value(0)
+                self._sm = rp2.StateMachine(self.sm_id, _pio_clock_burst, 
+                                            freq=sm_freq, sideset_base=self.pin)
+                self._sm_freq = sm_freq
+                self._sm.active(1)
+                
+            self._expected_ms = (num_cycles * 2000) // sm_freq
+            self._start_ms = time.ticks_ms()
+            self._sm.put(num_cycles - 1)
+            self._running = True
+            
+        def wait(self, timeout_ms:int=None):
+            '''
+                Block until the current burst is complete
+            '''
+            if not self._running:
+                return
+            if timeout_ms is None:
+                timeout_ms = self._expected_ms + 100
+            while not self._sm.rx_fifo():
+                if time.ticks_diff(time.ticks_ms(), self._start_ms) > timeout_ms:
+                    raise RuntimeError('Clock burst did not complete')
+            while self._sm.rx_fifo():
+                self._sm.get()
+            self._running = False
+        
+        def system_clock_changed(self, old_hz:int, new_hz:int):
+            # state machine divider is set on init, force a new one
+            self.wait()
+            self._sm_freq = 0
+        
+        def release(self):
+            '''
+                Wait for completion, stop the state machine and
+                give the pin back to SIO, output low.
+            '''
+            if self._sm is None:
+                return
+            self.wait()
+            self._sm.active(0)
+            _pio_resources().release(self)
+            self._sm = None
+            self._sm_freq = 0
+            self.pin.init(machine.Pin.OUT)
+            self.pin.value(0)
     
     def isfile(file_path:str):
         try:
@@ -130,6 +403,36 @@ if IsRP2040:
     def set_RP_system_clock(freqHz:int):
         machine.freq(int(freqHz))
     
+    def set_flash_divisor(div:int) -> bool:
+        '''
+            QSPI flash clock divisor, needs raising before 
+            overclocking much beyond ~266MHz.
+            @return: False if this firmware can't do it
+        '''
+        flash = rp2.Flash()
+        if not hasattr(flash, 'set_divisor'):
+            return False
+        flash.set_divisor(div)
+        return True
+    
+    def pwm_configure(gpio:int, div16:int, top:int, duty_u16:int):
+        '''
+            Set a PWM slice's divider (in 16ths) and wrap directly, 
+            for the channel on gpio, which must already be set up as 
+            PWM (machine.PWM).
+        '''
+        # PWM registers, 4.5.3 in rp2040_datasheet: CSR, DIV, CTR, CC, TOP
+        base = 0x40050000 + 0x14*((gpio >> 1) & 7)
+        level = ((top + 1) * int(duty_u16)) >> 16
+        machine.mem32[base + 0x04] = div16
+        machine.mem32[base + 0x10] = top
+        cc = machine.mem32[base + 0x0c]
+        if gpio & 1:
+            cc = (cc & 0xffff) | (level << 16)
+        else:
+            cc = (cc & 0xffff0000) | level
+        machine.mem32[base + 0x0c] = cc
+    
     @micropython.native
     def write_ui_in_byte(val):
         # dump_portset('ui_in', val)
@@ -146,8 +449,10 @@ if IsRP2040:
         
     @micropython.native
     def read_ui_in_byte():
-        # just read the high and low nibbles from GPIO and combine into a byte
-        return ( (machine.mem32[0xd0000004] & (0xf << 17)) >> (17-4)) | ((machine.mem32[0xd0000004] & (0xf << 9)) >> 9)
+        # just read the high and low nibbles from GPIO and combine into a byte,
+        # from a single read so they're coherent
+        v = machine.mem32[0xd0000004]
+        return ((v & (0xf << 17)) >> (17-4)) | ((v & (0xf << 9)) >> 9)
     
     
     @micropython.native
@@ -197,29 +502,26 @@ if IsRP2040:
     
     @micropython.native
     def read_uo_out_byte():
-        
-        # sample code to deal with differences between 
-        # PCBs, not actually required as we didn't move anything
-        # after all!
-        # global PCBVERSION_TT06
-        # all_io = machine.mem32[0xd0000004]
-        #if PCBVERSION_TT06 is None:
-        #    import ttboard.boot.demoboard_detect as dbdet
-        #    PCBVERSION_TT06 = True if dbdet.DemoboardDetect.PCB == dbdet.DemoboardVersion.TT06 else False
-        
-        #if PCBVERSION_TT06:
-        #    # gpio output bits are
-        #    # 0x1e1e0 == 0b11110000111100000 so GPIO5-8 and GPIO 13-17
-        #    val =  ((all_io & (0xf << 13)) >> (13 - 4)) | ((all_io & (0xf << 5)) >> 5)
-        #else:
-        # just read the high and low nibbles from GPIO and combine into a byte
-        return ( (machine.mem32[0xd0000004] & (0xf << 13)) >> (13-4)) | ((machine.mem32[0xd0000004] & (0xf << 5)) >> 5)
+        # layout differences between PCBs are handled by 
+        # ttboard.pins.port_compiler, which replaces all 
+        # these accessors at boot
+        # just read the high and low nibbles from GPIO and combine into a byte,
+        # from a single read so they're coherent
+        v = machine.mem32[0xd0000004]
+        return ((v & (0xf << 13)) >> (13-4)) | ((v & (0xf << 5)) >> 5)
     
     
     @micropython.native
     def read_clock():
         # clock is on GPIO 0
         return (machine.mem32[0xd0000010] & 1)
+    
+    @micropython.native
+    def read_gpio_state():
+        # GPIO_IN, GPIO_OUT and GPIO_OE, a single read of each,
+        # see ttboard.cocotb.snapshot
+        return (machine.mem32[0xd0000004], machine.mem32[0xd0000010], 
+                machine.mem32[0xd0000020])
        
     @micropython.native
     def write_clock(val):
@@ -231,86 +533,310 @@ if IsRP2040:
             machine.mem32[0xd0000018] = 1 # clear bit 0
         
     
+    @micropython.native
+    def gpio_out_set(mask):
+        machine.mem32[0xd0000014] = mask
+    
+    @micropython.native
+    def gpio_out_clr(mask):
+        machine.mem32[0xd0000018] = mask
+    
+    @micropython.native
+    def gpio_out_masked(mask, val):
+        # only bits in mask change, in a single write
+        machine.mem32[0xd000001c] = (machine.mem32[0xd0000010] ^ val) & mask
+    
+    @micropython.native
+    def write_ports(ui_in=None, uio=None, clk=None):
+        # build a single mask/value pair for all the ports
+        # being written, same bit scatter as the write_*_byte
+        # functions, and commit with one GPIO_OUT_XOR write
+        # so everything changes on the same edge
+        mask = 0
+        val = 0
+        if ui_in is not None:
+            mask |= 0x1E1E00
+            val |= ((ui_in & 0xF) << 9) | ((ui_in & 0xF0) << 13)
+        if uio is not None:
+            mask |= 0x1FE00000
+            val |= ((uio & 0xFF) << 21)
+        if clk is not None:
+            mask |= 1
+            if clk:
+                val |= 1
+        machine.mem32[0xd000001c] = (machine.mem32[0xd0000010] ^ val) & mask
+    
+    @micropython.viper
+    def _apply_vectors(stim, clocks_per_vector:int, capture, stride:int) -> int:
+        # TT04/TT06 layout, clock on GPIO 0: port_compiler.install() 
+        # swaps in a version generated for the board actually in use
+        # SIO registers, as 32-bit words from 0xd0000000:
+        # [1] GPIO_IN, [4] GPIO_OUT, [5] GPIO_OUT_SET, 
+        # [6] GPIO_OUT_CLR, [7] GPIO_OUT_XOR
+        sio = ptr32(0xd0000000)
+        src = ptr8(stim)
+        dst = ptr8(capture)
+        num_vectors = int(len(stim))
+        i = 0
+        while i < num_vectors:
+            # same scatter as write_ui_in_byte: GPIO 9-12 and 17-20
+            v = int(src[i])
+            v = ((v & 0xF) << 9) | ((v & 0xF0) << 13)
+            sio[7] = (sio[4] ^ v) & 0x1E1E00
+            c = 0
+            while c < clocks_per_vector:
+                sio[5] = 1 # clock high
+                sio[6] = 1 # clock low
+                c += 1
+            
+            # same gather as read_uo_out_byte/read_uio_byte, 
+            # from a single read of GPIO_IN
+            allin = sio[1]
+            dst[i*stride] = ((allin >> 5) & 0xF) | ((allin >> 9) & 0xF0)
+            if stride > 1:
+                dst[i*stride + 1] = (allin >> 21) & 0xFF
+            i += 1
+        return num_vectors
+    
+    def apply_vectors(stim, clocks_per_vector:int, capture, capture_uio:bool=False):
+        '''
+            Walk a whole buffer of ui_in stimulus, in a single viper loop.
+            For each byte in stim: ui_in is written, the project clock 
+            is pulsed clocks_per_vector times and uo_out (followed by uio, 
+            if capture_uio) is sampled into capture.
+            
+            Assumes the clock pin is an RP2040-driven output and that
+            any mux is set for project I/O.
+            @return: number of vectors applied
+        '''
+        stride = _vector_capture_stride(stim, capture, capture_uio)
+        return _apply_vectors(stim, int(clocks_per_vector), capture, stride)
+        
+    
     
 else:
+    '''
+        Off-target, the same register-level accessors run against 
+        a simulated SIO register file (platform.mem32), which the
+        desktop Pin stubs use too, so everything sees a consistent
+        set of GPIO.  Attach a behavioral model to have something 
+        play the part of the project, e.g.
+            platform.mem32.attach_model(MyModel())
+        see ttboard.sim
+    '''
     import os.path 
+    from ttboard.sim.registers import SIORegisterFile
     isfile = os.path.isfile
     
+    mem32 = SIORegisterFile()
+    
     class PIOClock:
-        def __init__(self, pin):
+        def __init__(self, pin, sm_id:int=0):
             self.freq = 0
             self.pin = pin
+            self.sm_id = sm_id
+            self.plan = None
             
-        def start(self, freq_hz:int):
+        def start(self, freq_hz):
+            from ttboard.clocking.planner import plan_pio
+            self.stop()
+            if freq_hz <= 0:
+                return
+            self.plan = plan_pio(freq_hz, get_RP_system_clock())
+            self.sm_id = _pio_resources().claim_sm(self, sm_id=self.sm_id)
             self.freq = freq_hz 
-            print(f"(mock) PIO clock @ {freq_hz}Hz")
+        
+        @property 
+        def actual_freq(self) -> float:
+            if self.plan is None:
+                return 0
+            return self.plan.freq_hz
+        
+        def system_clock_changed(self, old_hz:int, new_hz:int):
+            if self.freq:
+                self.start(self.freq)
             
         def stop(self):
+            _pio_resources().release(self)
             self.freq = 0
-            print("PIO clock stop")
+            self.plan = None
+    
+    def measure_frequency(pin, window_ms:int=100, sm_id:int=2) -> float:
+        # nothing is really clocking, off-target
+        return None
+    
+    class PIOEdgeTimer:
+        '''
+            Off-target: samples the pin (in the simulated GPIO_IN)
+            whenever fired is checked, timing the edge to when it
+            was first seen.
+        '''
+        def __init__(self, gpio:int, sm_id:int=3):
+            self.gpio = gpio
+            self.sm_id = sm_id
+            self._armed = False
+            self._rising = True
+            self._primed = False
+            self._start_us = 0
+            self._elapsed_us = None
+            
+        def arm(self, rising:bool):
+            import ttboard.util.time as time
+            self.disarm()
+            self.sm_id = _pio_resources().claim_sm(self, sm_id=self.sm_id)
+            self._rising = rising
+            self._primed = False
+            self._elapsed_us = None
+            self._armed = True
+            self._start_us = time.ticks_us()
+            self.fired
+            
+        @property 
+        def fired(self) -> bool:
+            if self._elapsed_us is not None:
+                return True
+            if not self._armed:
+                return False
+            import ttboard.util.time as time
+            level = (mem32[0xd0000004] >> self.gpio) & 1
+            if not self._primed:
+                self._primed = level != self._rising
+                return False
+            if level != self._rising:
+                return False
+            self._elapsed_us = time.ticks_diff(time.ticks_us(), self._start_us)
+            return True
+        
+        @property 
+        def elapsed_us(self) -> float:
+            if not self.fired:
+                return None
+            return self._elapsed_us
+        
+        def disarm(self):
+            if not self._armed:
+                return
+            self._armed = False
+            _pio_resources().release(self)
+            
+    class PIOClockBurst:
+        '''
+            Off-target: just toggles the clock, which 
+            also drives any attached model.
+        '''
+        def __init__(self, pin, sm_id:int=1):
+            self.pin = pin
+            self.sm_id = sm_id
+            self.busy = False
+            
+        def start(self, num_cycles:int, freq:int=None):
+            self.sm_id = _pio_resources().claim_sm(self, sm_id=self.sm_id)
+            for _i in range(num_cycles):
+                write_clock(1)
+                write_clock(0)
+                
+        def wait(self, timeout_ms:int=None):
+            return
+        
+        def system_clock_changed(self, old_hz:int, new_hz:int):
+            return
+        
+        def release(self):
+            _pio_resources().release(self)
+            write_clock(0)
+            
     def pin_as_input(gpio_index:int, pull:int=None):
         from ttboard.pins.upython import Pin
         return Pin(gpio_index, Pin.IN, pull=pull)
+    _desktop_system_clock = RP2040SystemClockDefaultHz
     def get_RP_system_clock():
-        return RP2040SystemClockDefaultHz
+        return _desktop_system_clock
     def set_RP_system_clock(freqHz:int):
-        global RP2040SystemClockDefaultHz
-        print(f"Set machine clock to {freqHz}")
-        RP2040SystemClockDefaultHz = freqHz
+        global _desktop_system_clock
+        _desktop_system_clock = int(freqHz)
+    
+    def set_flash_divisor(div:int) -> bool:
+        return True
+    
+    def pwm_configure(gpio:int, div16:int, top:int, duty_u16:int):
+        return
         
-    _inbyte = 0
     def write_ui_in_byte(val):
-        global _inbyte 
-        print(f'Sim write_input_byte {val}')
-        _inbyte = val
+        val = ((val & 0xF) << 9) | ((val & 0xF0) << 17-4)
+        mem32[0xd000001c] = (mem32[0xd0000010] ^ val) & 0x1E1E00
 
     def read_ui_in_byte():
-        print('Sim read_output_byte')
-        return _inbyte
-
+        v = mem32[0xd0000004]
+        return ((v >> 9) & 0xF) | ((v >> 13) & 0xF0)
 
-    _uio_byte = 0
     def write_uio_byte(val):
-        global _uio_byte
-        print(f'Sim write_bidir_byte {val}')
-        _uio_byte = val
-
-        
+        mem32[0xd000001c] = (mem32[0xd0000010] ^ ((val & 0xFF) << 21)) & 0x1FE00000
         
     def read_uio_byte():
-        print('Sim read_output_byte')
-        return _uio_byte
+        return (mem32[0xd0000004] >> 21) & 0xFF
     
-    _outbyte = 0
     def write_uo_out_byte(val):
-        global _outbyte 
-        print(f'Sim write_output_byte {val}')
-        _outbyte = val
+        val = ((val & 0xF) << 5) | ((val & 0xF0) << 13-4)
+        mem32[0xd000001c] = (mem32[0xd0000010] ^ val) & 0x1E1E0
     
     def read_uo_out_byte():
-        global _outbyte 
-        v = _outbyte 
-        #_outbyte += 1
-        print('Sim read_output_byte')
-        return v
+        v = mem32[0xd0000004]
+        return ((v >> 5) & 0xF) | ((v >> 9) & 0xF0)
     
-    _uio_oe_pico = 0
     def read_uio_outputenable():
-        print('Sim read_bidir_outputenable')
-        return _uio_oe_pico
+        return (mem32[0xd0000020] >> 21) & 0xFF
 
     def write_uio_outputenable(val):
-        global _uio_oe_pico
-        print(f'Sim write_bidir_outputenable {val}')
-        _uio_oe_pico = val
+        mem32[0xd0000020] = (mem32[0xd0000020] & ~0x1FE00000) | ((val & 0xFF) << 21)
     
-    _clk_pin = 0
     def read_clock():
-        return _clk_pin
+        return mem32[0xd0000010] & 1
+    
+    def read_gpio_state():
+        return (mem32[0xd0000004], mem32[0xd0000010], mem32[0xd0000020])
        
     def write_clock(val):
-        global _clk_pin
-        _clk_pin = val
+        if val:
+            mem32[0xd0000014] = 1
+        else:
+            mem32[0xd0000018] = 1
+    
+    def gpio_out_set(mask):
+        mem32[0xd0000014] = mask
+    
+    def gpio_out_clr(mask):
+        mem32[0xd0000018] = mask
+    
+    def gpio_out_masked(mask, val):
+        mem32[0xd000001c] = (mem32[0xd0000010] ^ val) & mask
+    
+    def write_ports(ui_in=None, uio=None, clk=None):
+        mask = 0
+        val = 0
+        if ui_in is not None:
+            mask |= 0x1E1E00
+            val |= ((ui_in & 0xF) << 9) | ((ui_in & 0xF0) << 13)
+        if uio is not None:
+            mask |= 0x1FE00000
+            val |= ((uio & 0xFF) << 21)
+        if clk is not None:
+            mask |= 1
+            if clk:
+                val |= 1
+        mem32[0xd000001c] = (mem32[0xd0000010] ^ val) & mask
+        
+    def apply_vectors(stim, clocks_per_vector:int, capture, capture_uio:bool=False):
+        stride = _vector_capture_stride(stim, capture, capture_uio)
+        for i in range(len(stim)):
+            write_ui_in_byte(stim[i])
+            for _c in range(clocks_per_vector):
+                write_clock(1)
+                write_clock(0)
+            capture[i*stride] = read_uo_out_byte()
+            if capture_uio:
+                capture[i*stride + 1] = read_uio_byte()
+        return len(stim)
+
         
     
     
@@ -0,0 +1,132 @@
+'''
+Created on Oct 18, 2026
+
+Hot-path counters: how many mux switches, pin re-inits, port
+reads/writes and system clock changes something triggered, and
+how long was spent in each.
+
+    tt.stats_enabled = True
+    run_my_test(tt)
+    tt.stats()
+    tt.stats_reset()
+
+Nothing is counted unless enabled, and when disabled the counted
+functions are the originals--the wrappers are patched in by
+enable() and removed by disable(), so there is no cost at all
+to having this around.
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+import ttboard.util.platform as platform
+import ttboard.util.time as time
+import ttboard.log as logging
+log = logging.getLogger(__name__)
+
+Enabled = False
+
+# name -> [count, total_us]
+_counters = dict()
+
+# (object, attribute, original) for everything patched
+_patches = []
+
+def counted(name:str, func):
+    '''
+        Wrap func so calls are counted, and timed, under name.
+    '''
+    if name not in _counters:
+        _counters[name] = [0, 0]
+    entry = _counters[name]
+    def wrapper(*args, **kwargs):
+        start = time.ticks_us()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            entry[0] += 1
+            entry[1] += time.ticks_diff(time.ticks_us(), start)
+    return wrapper
+
+def patch(obj, attr:str, name:str):
+    '''
+        Replace obj.attr with a counted version, remembering
+        the original for disable().
+    '''
+    original = getattr(obj, attr)
+    if original is None:
+        return
+    _patches.append((obj, attr, original))
+    setattr(obj, attr, counted(name, original))
+
+def patch_property_setter(cls, attr:str, name:str):
+    '''
+        Count writes to property attr of class cls.
+    '''
+    original = getattr(cls, attr)
+    _patches.append((cls, attr, original))
+    setattr(cls, attr, property(original.fget, counted(name, original.fset)))
+
+def enable(pins=None):
+    '''
+        Start counting.  Port reads/writes are counted
+        for the ports held by pins, if provided.  That
+        includes bit writes, which go the slow way (whole 
+        port read and write) while counted.
+    '''
+    global Enabled
+    if Enabled:
+        return
+    from ttboard.pins.mux_control import MuxControl
+    from ttboard.pins.standard import StandardPin
+    from ttboard.project_mux import ProjectMux
+
+    patch(MuxControl, 'select', 'mux select')
+    patch_property_setter(StandardPin, 'mode', 'pin mode')
+    patch(ProjectMux, 'reset_and_clock_mux', 'project mux')
+    patch(platform, 'set_RP_system_clock', 'system clock')
+    if pins is not None:
+        for pname in ['uo_out', 'ui_in', 'uio_in', 'uio_out', 'uio_oe_pico']:
+            # through the port's hooks, so bit writes skip
+            # their fast path and get counted too
+            hooks = getattr(pins, pname).hooks
+            patch(hooks, 'read', f'{pname} read')
+            patch(hooks, 'write', f'{pname} write')
+    Enabled = True
+    log.info('Stats enabled')
+
+def disable():
+    '''
+        Stop counting and restore the originals.  Counts
+        are kept until reset().
+    '''
+    global Enabled
+    while len(_patches):
+        obj, attr, original = _patches.pop()
+        setattr(obj, attr, original)
+    Enabled = False
+
+def reset():
+    for entry in _counters.values():
+        entry[0] = 0
+        entry[1] = 0
+
+def summary() -> dict:
+    '''
+        @return: dict of name -> (count, total_us), for
+        counters that have seen any calls
+    '''
+    ret = dict()
+    for name, entry in _counters.items():
+        if entry[0]:
+            ret[name] = (entry[0], entry[1])
+    return ret
+
+def report() -> str:
+    lines = [f'{"":24} {"count":>10} {"total ms":>12} {"us/call":>10}']
+    stats = summary()
+    for name in sorted(stats.keys()):
+        count, total_us = stats[name]
+        lines.append(f'{name:24} {count:10d} {total_us/1000:12.3f} {total_us/count:10.1f}')
+    if not len(stats):
+        lines.append('(nothing counted)' if Enabled else '(stats not enabled)')
+    return '\n'.join(lines)
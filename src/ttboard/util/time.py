@@ -16,4 +16,10 @@ if not IsRP2040:
         sleep(v/1000000)
         
     def ticks_us():
-        return int(time())
+        return int(time()*1000000)
+    
+    def ticks_ms():
+        return int(time()*1000)
+    
+    def ticks_diff(a, b):
+        return a - b
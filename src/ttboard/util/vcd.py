@@ -0,0 +1,100 @@
+'''
+Created on Oct 18, 2026
+
+Minimal VCD (value change dump) writer, enough to get
+captures into gtkwave/surfer.  No dependencies, so it
+runs on the RP2040 as well as the desktop.
+
+    vcd = VCDWriter(open('out.vcd', 'w'), timescale='1ns')
+    uo = vcd.add_signal('uo_out', 8)
+    vcd.write_header()
+    vcd.change(0, uo, 0x12)
+    vcd.change(40, uo, 0x13)
+    vcd.finish(80)
+
+@author: Pat Deegan
+@copyright: Copyright (C) 2026 Pat Deegan, https://psychogenic.com
+'''
+
+class VCDWriter:
+    def __init__(self, stream, timescale:str='1ns', module:str='tt'):
+        '''
+            @param stream: anything with a write(str) method
+            @param timescale: VCD timescale, timestamps are in these units
+            @param module: name of the scope holding the signals
+        '''
+        self.stream = stream
+        self.timescale = timescale
+        self.module = module
+        self._signals = []
+        self._widths = dict()
+        self._last = dict()
+        self._time = None
+
+    def add_signal(self, name:str, width:int=1):
+        '''
+            Declare a signal, before write_header().
+            @return: the identifier to use with change()
+        '''
+        if self._time is not None:
+            raise RuntimeError('Signals must be added before header is written')
+        sig_id = self._make_id(len(self._signals))
+        self._signals.append((sig_id, name, width))
+        self._widths[sig_id] = width
+        return sig_id
+
+    def write_header(self, comment:str=None):
+        w = self.stream.write
+        if comment is not None:
+            w(f'$comment {comment} $end\n')
+        w(f'$timescale {self.timescale} $end\n')
+        w(f'$scope module {self.module} $end\n')
+        for sig_id, name, width in self._signals:
+            if width > 1:
+                name = f'{name} [{width-1}:0]'
+            w(f'$var wire {width} {sig_id} {name} $end\n')
+        w('$upscope $end\n')
+        w('$enddefinitions $end\n')
+        self._time = -1
+
+    def change(self, timestamp:int, sig_id:str, value:int):
+        '''
+            Record value for signal at timestamp.  Timestamps must
+            not go backwards, and values that haven't changed
+            are dropped.
+        '''
+        if self._time is None:
+            self.write_header()
+        if self._last.get(sig_id) == value:
+            return
+        if timestamp != self._time:
+            if timestamp < self._time:
+                raise ValueError(f'VCD time going backwards ({timestamp} < {self._time})')
+            self.stream.write(f'#{timestamp}\n')
+            self._time = timestamp
+        self._last[sig_id] = value
+        if self._widths[sig_id] == 1:
+            self.stream.write(f'{value & 1}{sig_id}\n')
+        else:
+            self.stream.write(f'b{bin(value)[2:]} {sig_id}\n')
+
+    def finish(self, timestamp:int=None):
+        '''
+            Optionally mark the end time.  The stream is left
+            open, it belongs to the caller.
+        '''
+        if self._time is None:
+            self.write_header()
+        if timestamp is not None and timestamp > self._time:
+            self.stream.write(f'#{timestamp}\n')
+            self._time = timestamp
+
+    @staticmethod
+    def _make_id(idx:int):
+        # printable ASCII, from '!' (33) to '~' (126)
+        sig_id = ''
+        while True:
+            sig_id += chr(33 + (idx % 94))
+            idx = idx // 94
+            if not idx:
+                return sig_id
@@ -0,0 +1,85 @@
+import io
+from ttboard.analyzer.analyzer import LogicAnalyzer
+from ttboard.analyzer.sampler import DesktopSampler
+from ttboard.analyzer.trigger import PatternTrigger, EdgeTrigger
+import ttboard.analyzer.samples as samples
+
+
+def counter_source(count:int):
+    # uo_out counting, uio[0] toggling
+    return [samples.to_raw(i & 0xff, i & 1) for i in range(count)]
+
+
+def test_raw_sample_roundtrip():
+    for v in [0, 0x1234, 0xffff, 0xa55a]:
+        assert samples.decode(samples.encode(v)) == v
+    # uo_out[4] is GPIO 13, uio[0] is GPIO 21
+    assert samples.to_raw(0x10, 0x01) == (1 << (13 - 5)) | (1 << (21 - 5))
+
+
+def test_pattern_trigger_pre_post():
+    la = LogicAnalyzer(rate_hz=1000, ring_size=64,
+                       sampler=DesktopSampler(1000, counter_source(500), chunk=7))
+    cap = la.capture(PatternTrigger(200, mask=0xff), pre=10, post=20)
+    
+    assert len(cap) == 30
+    assert cap.trigger_index == 10
+    assert cap.uo_out(cap.trigger_index) == 200
+    assert [cap.uo_out(i) for i in range(len(cap))] == list(range(190, 220))
+
+
+def test_edge_trigger_and_missing_trigger():
+    la = LogicAnalyzer(rate_hz=1000, ring_size=64,
+                       sampler=DesktopSampler(1000, counter_source(40)))
+    cap = la.capture(EdgeTrigger(8, EdgeTrigger.Falling), pre=0, post=4)
+    # uio[0] goes 0 -> 1 -> 0, first falling at sample 2
+    assert cap.uo_out(0) == 2 and cap.uio(0) == 0
+    
+    la = LogicAnalyzer(rate_hz=1000, ring_size=64,
+                       sampler=DesktopSampler(1000, counter_source(40)))
+    assert la.capture(PatternTrigger(0xff, mask=0xff), post=4) is None
+
+
+def test_vcd_output():
+    la = LogicAnalyzer(rate_hz=1_000_000, ring_size=64,
+                       sampler=DesktopSampler(1_000_000, counter_source(8)))
+    cap = la.capture(pre=0, post=4)
+    out = io.StringIO()
+    cap.write_vcd(out)
+    vcd = out.getvalue()
+    
+    assert '$var wire 8 ! uo_out [7:0] $end' in vcd
+    assert '$enddefinitions $end' in vcd
+    assert '#3000\nb11 !\n' in vcd
+    assert vcd.endswith('#4000\n')
+
+
+class LevelOnlySampler(DesktopSampler):
+    # like the PIO sampler: only single bit conditions
+    def can_trigger(self, trigger):
+        return trigger.condition is not None
+
+
+def test_wide_pattern_searched_after_ring_fills():
+    sampler = LevelOnlySampler(1000, counter_source(500), chunk=7)
+    la = LogicAnalyzer(rate_hz=1000, ring_size=64, sampler=sampler)
+    cap = la.capture(PatternTrigger(40, mask=0xff), pre=5, post=10)
+    assert [cap.uo_out(i) for i in range(len(cap))] == list(range(35, 50))
+    assert cap.trigger_index == 5
+    # stopped once the ring was full
+    assert sampler.stop() == 64
+    # later than one ring in, it's not seen
+    la = LogicAnalyzer(rate_hz=1000, ring_size=64,
+                       sampler=LevelOnlySampler(1000, counter_source(500)))
+    assert la.capture(PatternTrigger(100, mask=0xff), post=4) is None
+
+
+def test_trigger_conditions():
+    from ttboard.analyzer.trigger import Trigger
+    assert Trigger().condition == ('now', None)
+    assert Trigger().matches(None, 0)
+    assert PatternTrigger(0x80, mask=0x80).condition == ('high', 7)
+    assert PatternTrigger(0, mask=0x100).condition == ('low', 8)
+    assert PatternTrigger(0x80, mask=0x81).condition is None
+    assert EdgeTrigger(9, EdgeTrigger.Either).condition == ('either', 9)
+    assert [samples.gpio(b) for b in (0, 4, 8)] == [5, 13, 21]
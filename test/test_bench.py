@@ -0,0 +1,36 @@
+import os
+from ttboard.bench.runner import Benchmark, BenchRunner, BenchResult, compare, save, load
+
+
+def test_runner_reaches_min_time_and_counts_ops():
+    calls = {'n': 0, 'setup': 0, 'teardown': 0}
+    def f():
+        calls['n'] += 1
+    def setup():
+        calls['setup'] += 1
+    def teardown():
+        calls['teardown'] += 1
+    
+    runner = BenchRunner(min_time_ms=5)
+    res = runner.run([Benchmark('count', f, ops_per_call=3, setup=setup, teardown=teardown),
+                      Benchmark('other', f)], only='count')
+    
+    assert len(res) == 1
+    assert res[0].name == 'count'
+    assert res[0].elapsed_us >= 5000
+    assert res[0].ops % 3 == 0
+    assert calls['setup'] == 1 and calls['teardown'] == 1
+
+
+def test_save_load_compare(tmp_path):
+    results = [BenchResult('fast', 1000, 1000), BenchResult('slow', 1000, 1000)]
+    path = os.path.join(tmp_path, 'base.json')
+    save(results, path)
+    baseline = load(path)
+    assert baseline['fast']['ops_per_sec'] == 1_000_000
+    
+    now = [BenchResult('fast', 1000, 950), BenchResult('slow', 1000, 2000), 
+           BenchResult('new', 10, 10)]
+    regressions = compare(now, baseline, tolerance_pct=10)
+    assert [r[0] for r in regressions] == ['slow']
+    assert round(regressions[0][1]) == -50
@@ -0,0 +1,63 @@
+import pytest
+from ttboard.clocking.planner import ClockPlanner
+
+
+def test_system_clocks_are_reachable():
+    planner = ClockPlanner()
+    clocks = planner.system_clocks
+    assert clocks[0][0] >= 133_000_000
+    for sys_hz, vco, pd1, pd2 in clocks:
+        assert 750_000_000 <= vco <= 1_600_000_000
+        assert vco == sys_hz * pd1 * pd2
+        assert sys_hz % 1000 == 0
+
+
+def test_plans_exact_and_cached():
+    planner = ClockPlanner(cache_size=2)
+    p = planner.plan(10_000_000)
+    assert p.sys_hz <= 133_000_000
+    assert p.freq_hz == 10_000_000
+    assert p.jitter_free and p.cycles % 2 == 0
+    assert p.sys_hz * 16 == p.div16 * (p.top + 1) * 10_000_000
+    assert planner.plan(10_000_000) is p
+    
+    planner.plan(1000)
+    planner.plan(2000)
+    assert planner.plan(10_000_000) is not p
+    
+    # current system clock kept if it does the job
+    assert planner.plan(1_000_000, current_sys_hz=125_000_000).sys_hz == 125_000_000
+
+
+def test_plan_limits():
+    planner = ClockPlanner()
+    with pytest.raises(ValueError):
+        planner.plan(70_000_000)
+    assert planner.plan(70_000_000, max_sys_hz=200_000_000).sys_hz == 140_000_000
+    with pytest.raises(ValueError):
+        planner.plan(1)
+    
+    div16, top = planner.pwm_divisors(65536*3)
+    assert div16 == 3 << 4 and top == 65535
+    # prime, so needs the fractional divider
+    div16, top = planner.pwm_divisors(100003)
+    assert div16 & 0xf
+    assert planner.pwm_divisors(65537*256) == (None, None)
+
+
+def test_pio_plans_cover_full_range():
+    from ttboard.clocking.planner import plan_pio, PIOClockPlan
+    sys_hz = 125_000_000
+    for freq in [0.05, 1, 1000, 10_000_000, 62_500_000]:
+        p = plan_pio(freq, sys_hz)
+        assert p.sys_hz == sys_hz
+        assert abs(p.error_hz) / freq < 1e-4
+    
+    assert plan_pio(0.5, sys_hz).program == PIOClockPlan.Delay
+    assert plan_pio(0.5, sys_hz).jitter_free
+    fast = plan_pio(10_000_000, sys_hz)
+    assert fast.program == PIOClockPlan.Fast
+    assert fast.div256 == 6*256 + 64 and not fast.jitter_free
+    
+    with pytest.raises(ValueError):
+        plan_pio(63_000_000, sys_hz)
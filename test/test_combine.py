@@ -0,0 +1,119 @@
+import asyncio
+import pytest
+import ttboard.util.platform as platform
+from microcotb.clock import Clock
+from microcotb.time.system import SystemTime
+from ttboard.ports.io import IO
+from ttboard.ports.oe import OutputEnable
+from ttboard.cocotb.combine import WriteCombiner
+from ttboard.cocotb.dut import ClockPin
+from ttboard.cocotb.triggers import Timer
+
+
+@pytest.fixture
+def ports(monkeypatch):
+    platform.mem32.reset()
+    platform.mem32[0xd0000024] = 0x1E1E00 | 1
+    SystemTime.reset()
+    Clock.clear_all()
+    commits = []
+    masked = platform.gpio_out_masked
+    def counting(mask, val):
+        commits.append(mask)
+        masked(mask, val)
+    monkeypatch.setattr(platform, 'gpio_out_masked', counting)
+    ui_in = IO('ui_in', 8, platform.read_ui_in_byte, platform.write_ui_in_byte,
+               gpios=[9, 10, 11, 12, 17, 18, 19, 20])
+    uio_in = IO('uio_in', 8, platform.read_uio_byte, platform.write_uio_byte,
+                gpios=list(range(21, 29)))
+    oe = OutputEnable('uio_oe_pico', 8, platform.read_uio_outputenable,
+                      platform.write_uio_outputenable)
+    combiner = WriteCombiner(ui_in, uio_in, oe)
+    combiner.start()
+    yield combiner, ui_in, uio_in, oe, commits
+    combiner.stop()
+    platform.mem32.reset()
+
+
+def test_writes_held_until_await(ports):
+    combiner, ui_in, uio_in, oe, commits = ports
+    oe.value = 0x0f
+    ui_in.value = 0x12
+    ui_in[7] = 1
+    uio_in.value = 0x05
+    # nothing on the pins yet, but reads see the new values
+    assert platform.read_ui_in_byte() == 0 and platform.read_uio_outputenable() == 0
+    assert int(ui_in.value) == 0x92
+
+    async def wait():
+        await Timer(1, 'us')
+    asyncio.run(wait())
+    assert commits == [0x1E1E00 | 0x1FE00000]
+    assert platform.read_ui_in_byte() == 0x92
+    assert platform.read_uio_outputenable() == 0x0f
+    assert platform.read_uio_byte() == 0x05
+    assert combiner.commits == 1 and combiner.writes >= 4
+    assert not combiner.pending
+
+
+def test_clock_edges_and_held_writes(ports):
+    combiner, ui_in, _uio, _oe, commits = ports
+    clk = ClockPin('clk', None)
+    clk.combiner = combiner
+    ui_in.value = 0x34
+    clk.value = 1
+    # inputs first, then the rising edge on its own
+    assert commits == [0x1E1E00, 1]
+    assert platform.read_ui_in_byte() == 0x34 and platform.read_clock() == 1
+    assert not combiner.pending
+    ui_in.value = 0x56
+    clk.value = 0
+    # falling edge carries them
+    assert commits == [0x1E1E00, 1, 0x1E1E00 | 1]
+    assert platform.read_ui_in_byte() == 0x56 and platform.read_clock() == 0
+    clk.value = 1
+    assert len(commits) == 3 and platform.read_clock() == 1
+    clk.value = 0
+
+
+def test_stop_commits_and_restores(ports):
+    combiner, ui_in, _uio, _oe, _commits = ports
+    ui_in.value = 0x55
+    combiner.stop()
+    assert platform.read_ui_in_byte() == 0x55
+    assert ui_in._bit_masks is not None
+    ui_in.value = 0x66
+    assert platform.read_ui_in_byte() == 0x66
+
+
+def test_tracer_and_combiner_torn_down_in_any_order(ports):
+    from ttboard.cocotb.trace import SignalTracer
+    combiner, ui_in, _uio, _oe, _commits = ports
+    combiner.stop()
+    tracer = SignalTracer(16)
+    tracer.attach_port('ui_in', ui_in)
+    combiner.start()
+    tracer.detach()
+    # still held, and no longer traced
+    ui_in.value = 0x11
+    assert combiner.pending and platform.read_ui_in_byte() == 0
+    assert len(tracer) == 0
+    combiner.stop()
+    assert platform.read_ui_in_byte() == 0x11
+    ui_in.value = 0x22
+    ui_in[0] = 1
+    assert platform.read_ui_in_byte() == 0x23
+    assert len(tracer) == 0
+    assert ui_in.port.signal_write is platform.write_ui_in_byte
+    assert not ui_in.hooks.active
+
+    # and the other way round
+    combiner.start()
+    tracer = SignalTracer(16)
+    tracer.attach_port('ui_in', ui_in)
+    combiner.stop()
+    ui_in.value = 0x33
+    assert platform.read_ui_in_byte() == 0x33
+    assert list(map(lambda r: r[2], tracer.records()))[-1] == 0x33
+    tracer.detach()
+    assert not ui_in.hooks.active
@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import pytest
+import ttboard.util.platform as platform
+from microcotb.clock import Clock
+from microcotb.time.system import SystemTime
+from ttboard.ports.io import IO
+from ttboard.pio.resources import PIOResources
+from ttboard.cocotb.dut import BitAttribute
+from ttboard.cocotb.triggers import RisingEdge, FallingEdge
+
+UOOut = [5, 6, 7, 8, 13, 14, 15, 16]
+
+@pytest.fixture
+def led():
+    platform.mem32.reset()
+    SystemTime.reset()
+    Clock.clear_all()
+    uo_out = IO('uo_out', 8, platform.read_uo_out_byte, None, gpios=UOOut)
+    yield BitAttribute('led', uo_out, 1)
+    Clock.clear_all()
+    platform.mem32.reset()
+
+
+def drive_later(delay_s:float, value:int):
+    mask = 1 << UOOut[1]
+    t = threading.Timer(delay_s, platform.mem32.drive, (mask, mask if value else 0))
+    t.start()
+    return t
+
+
+def test_edge_timed_in_real_time(led):
+    assert led.gpio == 6
+    platform.mem32.drive(1 << 6, 0)
+    t = drive_later(0.03, 1)
+    async def wait_rise():
+        await RisingEdge(led)
+    asyncio.run(wait_rise())
+    t.join()
+    assert led.value == 1
+    assert 25 <= SystemTime.current().time_in('ms') < 60
+
+    start = SystemTime.current().time_in('ms')
+    t = drive_later(0.02, 0)
+    async def wait_fall():
+        await FallingEdge(led)
+    asyncio.run(wait_fall())
+    t.join()
+    assert 15 <= SystemTime.current().time_in('ms') - start < 45
+    assert len(PIOResources.get().free_state_machines) == 8
+
+
+def test_python_clocks_poll(led):
+    clk_io = IO('ui_in', 8, platform.read_ui_in_byte, platform.write_ui_in_byte)
+    Clock(clk_io, 10, 'us').start()
+    platform.mem32.drive(1 << 6, 1 << 6)
+    async def wait_fall():
+        await FallingEdge(led)
+    t = drive_later(0.02, 0)
+    asyncio.run(wait_fall())
+    t.join()
+    # stepped in 5us half periods, nothing to do with real time
+    assert SystemTime.current().time_in('ns') % 5000 == 0
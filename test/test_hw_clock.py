@@ -0,0 +1,71 @@
+import pytest
+import ttboard.util.platform as platform
+import ttboard.util.time as time
+from microcotb.clock import Clock
+from microcotb.time.system import SystemTime
+from microcotb.time.value import TimeValue
+from ttboard.ports.io import IO
+from ttboard.pio.resources import PIOResources
+from ttboard.cocotb.dut import BitAttribute
+from ttboard.cocotb.clock import HardwareClock
+
+
+class OffloadingDUT:
+    offload_clocks = True
+    def __init__(self):
+        self.clocks = []
+    def offload_clock(self, bit, clock):
+        hw = HardwareClock(clock, pin=None)
+        hw.start()
+        bit.hardware_clock = hw
+        self.clocks.append(hw)
+        return True
+
+
+@pytest.fixture
+def ui_in():
+    platform.mem32.reset()
+    platform.mem32[0xd0000024] = 0x1E1E00
+    SystemTime.reset()
+    Clock.clear_all()
+    yield IO('ui_in', 8, platform.read_ui_in_byte, platform.write_ui_in_byte,
+             gpios=[9, 10, 11, 12, 17, 18, 19, 20])
+    Clock.clear_all()
+    platform.mem32.reset()
+
+
+def test_bit_attribute_writes(ui_in):
+    bit = BitAttribute('pulse', ui_in, 5)
+    assert bit.gpio == 18
+    bit.value = 1
+    assert platform.read_ui_in_byte() == 0x20
+    assert bit.value == 1
+
+
+def test_clock_handed_to_pio(ui_in):
+    dut = OffloadingDUT()
+    bit = BitAttribute('pulse', ui_in, 0, dut)
+    Clock(bit, 2, 'ms').start()
+
+    SystemTime.advance(TimeValue(2, 'ms'))
+    hw = Clock.get(bit)
+    assert isinstance(hw, HardwareClock) and dut.clocks == [hw]
+    assert hw.freq_hz == pytest.approx(500)
+    assert len(PIOResources.get().free_state_machines) == 7
+
+    # PIO owns the pin now
+    bit.value = 1
+    assert platform.read_ui_in_byte() & 1 == 0
+
+    # simulated time can't run ahead of real time
+    start = time.ticks_us()
+    SystemTime.advance(TimeValue(20, 'ms'))
+    assert time.ticks_diff(time.ticks_us(), start) >= 15000
+
+    hw.stop()
+    assert len(PIOResources.get().free_state_machines) == 8
+
+    # and once stopped, it no longer holds simulated time back
+    start = time.ticks_us()
+    SystemTime.advance(TimeValue(200, 'ms'))
+    assert time.ticks_diff(time.ticks_us(), start) < 100000
@@ -0,0 +1,54 @@
+import pytest
+from ttboard.pio.resources import PIOResources
+
+
+def program(size):
+    # shaped like an rp2.asm_pio program: instructions first
+    return [[0]*size, -1, -1]
+
+
+def test_state_machines_and_program_memory():
+    res = PIOResources()
+    big = program(20)
+    small = program(8)
+
+    a = res.claim_sm('a', big, sm_id=0)
+    assert a == 0
+    # preferred one is taken, so another is handed out
+    b = res.claim_sm('b', big, sm_id=0)
+    assert b != 0 and b // 4 == 0
+    assert res.instructions_free(0) == 12
+    # won't fit next to big on PIO0
+    c = res.claim_sm('c', program(16), sm_id=1)
+    assert c // 4 == 1
+    d = res.claim_sm('d', small)
+    assert d // 4 == 0
+
+    res.release('a')
+    assert res.owner(0) is None
+    assert res.instructions_free(0) == 4
+    res.release('b')
+    assert res.instructions_free(0) == 24
+
+    # same owner, new program, same state machine
+    assert res.claim_sm('d', big, sm_id=d) == d
+    assert res.instructions_free(0) == 12
+
+
+def test_exhaustion_and_dma():
+    res = PIOResources()
+    for i in range(8):
+        res.claim_sm(f'o{i}')
+    with pytest.raises(RuntimeError):
+        res.claim_sm('more')
+    res.release('o3')
+    assert res.claim_sm('more') == 3
+
+    channels = [res.claim_dma('x') for _i in range(12)]
+    assert channels == list(range(12))
+    with pytest.raises(RuntimeError):
+        res.claim_dma('y')
+    res.release_dma(channels[5])
+    assert res.claim_dma('y') == 5
+    res.release('x')
+    assert res.free_dma_channels == 11
@@ -0,0 +1,157 @@
+import random
+import pytest
+from ttboard.pins.gpio_map import GPIOMapTT04, GPIOMapTT06
+from ttboard.pins.standard import StandardPin
+import ttboard.pins.port_compiler as pc
+
+
+class FakeSIO:
+    '''
+        Just enough of machine.mem32 over the SIO GPIO registers
+    '''
+    def __init__(self):
+        self.gpio_in = 0
+        self.gpio_out = 0
+        self.gpio_oe = 0
+    
+    def __getitem__(self, addr):
+        return {pc.GPIO_IN: self.gpio_in, 
+                pc.GPIO_OUT: self.gpio_out, 
+                pc.GPIO_OE: self.gpio_oe}[addr]
+    
+    def __setitem__(self, addr, val):
+        val &= 0xffffffff
+        if addr == pc.GPIO_OUT_SET:
+            self.gpio_out |= val
+        elif addr == pc.GPIO_OUT_CLR:
+            self.gpio_out &= ~val
+        elif addr == pc.GPIO_OUT_XOR:
+            self.gpio_out ^= val
+        elif addr == pc.GPIO_OE:
+            self.gpio_oe = val
+        else:
+            raise KeyError(hex(addr))
+
+
+class FakeRawPin:
+    def __init__(self, sio:FakeSIO, gpio:int):
+        self.sio = sio
+        self.gpio = gpio
+    
+    def value(self, v=None):
+        if v is not None:
+            raise RuntimeError('read only')
+        return (self.sio.gpio_in >> self.gpio) & 1
+    
+    def init(self, mode, pull=None):
+        pass
+
+
+def port_pins(sio, gpio_map, port):
+    # per-pin StandardPins, for bit-by-bit reference values
+    layout = pc.PortLayout.from_gpio_map(gpio_map)
+    return [StandardPin(f'{port}{i}', FakeRawPin(sio, gpio)) 
+                for i, gpio in enumerate(layout.ports[port])]
+
+
+@pytest.mark.parametrize('gpio_map', [GPIOMapTT04, GPIOMapTT06])
+def test_generated_reads_match_pins(gpio_map):
+    sio = FakeSIO()
+    funcs = pc.compile_accessors(pc.PortLayout.from_gpio_map(gpio_map), sio)
+    readers = {'ui_in': funcs['read_ui_in_byte'], 
+               'uo_out': funcs['read_uo_out_byte'], 
+               'uio': funcs['read_uio_byte']}
+    rnd = random.Random(42)
+    for _i in range(50):
+        sio.gpio_in = rnd.getrandbits(30)
+        for port, reader in readers.items():
+            expected = 0
+            for bit, p in enumerate(port_pins(sio, gpio_map, port)):
+                expected |= p() << bit
+            assert reader() == expected
+
+
+def test_generated_writes_touch_only_their_pins():
+    sio = FakeSIO()
+    layout = pc.PortLayout.from_gpio_map(GPIOMapTT06)
+    funcs = pc.compile_accessors(layout, sio)
+    sio.gpio_out = 0x3ffffffe # everything but the clock high
+    
+    funcs['write_ui_in_byte'](0xa5)
+    for bit, gpio in enumerate(layout.ports['ui_in']):
+        assert (sio.gpio_out >> gpio) & 1 == (0xa5 >> bit) & 1
+    others = sio.gpio_out & ~layout.gpio_mask('ui_in')
+    assert others == 0x3ffffffe & ~layout.gpio_mask('ui_in')
+    
+    funcs['write_ports'](uio=0x0f, clk=1)
+    assert funcs['read_clock']() == 1
+    assert (sio.gpio_out >> 21) & 0xff == 0x0f
+    
+    funcs['write_uio_outputenable'](0x81)
+    assert funcs['read_uio_outputenable']() == 0x81
+
+
+def test_incomplete_layout():
+    with pytest.raises(ValueError):
+        pc.PortLayout({'ui_in': list(range(8)), 'uo_out': list(range(8))}, 0)
+
+
+# a made up board: everything moved around, clock on GPIO 1
+OddLayout = pc.PortLayout({
+    'ui_in': [2, 3, 4, 5, 6, 7, 8, 9],
+    'uo_out': [17, 16, 15, 14, 13, 12, 11, 10],
+    'uio': [18, 19, 20, 21, 22, 23, 24, 25]}, 1)
+
+
+def test_standard_layout():
+    assert pc.PortLayout.from_gpio_map(GPIOMapTT04).is_standard
+    assert pc.PortLayout.from_gpio_map(GPIOMapTT06).is_standard
+    assert not OddLayout.is_standard
+
+
+class Words:
+    # viper's ptr32, over FakeSIO
+    def __init__(self, sio, base):
+        self.sio = sio
+        self.base = base
+    
+    def __getitem__(self, i):
+        return self.sio[self.base + 4*i]
+    
+    def __setitem__(self, i, v):
+        self.sio[self.base + 4*i] = v
+
+
+class ClockedSIO(FakeSIO):
+    # notes ui_in on every rising clock
+    def __init__(self, layout):
+        super().__init__()
+        self.read_ui_in = pc.compile_accessors(layout, self)['read_ui_in_byte']
+        self.clk_mask = 1 << layout.clock
+        self.clocked = []
+    
+    def __setitem__(self, addr, val):
+        if addr == pc.GPIO_OUT_SET and val & self.clk_mask:
+            # inputs come through GPIO_IN, loop them back
+            self.gpio_in, saved = self.gpio_out, self.gpio_in
+            self.clocked.append(self.read_ui_in())
+            self.gpio_in = saved
+        super().__setitem__(addr, val)
+
+
+@pytest.mark.parametrize('layout', [pc.PortLayout.from_gpio_map(GPIOMapTT06), OddLayout])
+def test_generated_vector_loop(layout):
+    sio = ClockedSIO(layout)
+    scatter = lambda port, v: eval('lambda val: ' + layout.scatter_expr(port))(v)
+    sio.gpio_in = scatter('uo_out', 0x5a) | scatter('uio', 0xc3)
+    apply_vectors = pc.compile_vector_loop(layout, {
+        'ptr32': lambda addr: Words(sio, addr),
+        'ptr8': lambda buf: buf})
+    stim = bytearray([0x01, 0x80, 0xa5])
+    capture = bytearray(2*len(stim))
+    
+    assert apply_vectors(stim, 2, capture, 2) == 3
+    assert sio.clocked == [0x01, 0x01, 0x80, 0x80, 0xa5, 0xa5]
+    assert capture == bytearray([0x5a, 0xc3]*3)
+    # clock left low, nothing but ui_in touched
+    assert sio.gpio_out == scatter('ui_in', 0xa5)
@@ -0,0 +1,43 @@
+import asyncio
+import ttboard.util.platform as platform
+import ttboard.cocotb.triggers as triggers
+from microcotb.clock import Clock
+from microcotb.time.system import SystemTime
+from ttboard.cocotb.dut import ClockPin
+from ttboard.cocotb.triggers import ClockCycles, Timer
+from ttboard.cocotb.profiler import Profiler
+
+
+def test_profiles_awaits_and_cycles(capsys):
+    platform.mem32.reset()
+    platform.mem32[0xd0000024] = 1
+    SystemTime.reset()
+    Clock.clear_all()
+    clk = ClockPin('clk', None)
+    clk.allow_bursts = False
+    profiler = Profiler(clk)
+    try:
+        profiler.test_start('test_counter')
+        Clock(clk, 10, 'us').start()
+        async def test():
+            for _i in range(3):
+                await ClockCycles(clk, 10)
+            await Timer(100, 'us')
+        asyncio.run(test())
+        profiler.test_done()
+    finally:
+        profiler.stop()
+        platform.mem32.reset()
+
+    assert profiler not in triggers.WaitHooks
+    assert len(profiler.profiles) == 1
+    prof = profiler.profiles[0]
+    assert prof.name == 'test_counter'
+    assert prof.awaits['ClockCycles'][0] == 3
+    assert prof.awaits['Timer'][0] == 1
+    assert 40 <= prof.cycles <= 41
+    assert prof.await_us <= prof.wall_us
+
+    profiler.print_summary()
+    out = capsys.readouterr().out
+    assert 'test_counter' in out and 'ClockCycles 3/' in out
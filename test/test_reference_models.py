@@ -0,0 +1,49 @@
+import time
+import pytest
+import microcotb as cocotb
+from ttboard.sim.model import DesignModel
+from ttboard.sim.reference import TTTestModel, FactoryTestModel
+from ttboard.cocotb.sim import SimDUT
+
+
+def stepped(model, stim, clocks_per_vector, capture_uio):
+    return DesignModel.run_vectors(model, stim, None, clocks_per_vector, capture_uio)
+
+
+@pytest.mark.parametrize('model_class', [TTTestModel, FactoryTestModel])
+@pytest.mark.parametrize('clocks_per_vector', [1, 3])
+@pytest.mark.parametrize('capture_uio', [False, True])
+def test_bulk_matches_stepping(model_class, clocks_per_vector, capture_uio):
+    stim = bytearray([1]*1000)
+    a, b = model_class(), model_class()
+    a.reset()
+    b.reset()
+    assert a.run_vectors(stim, None, clocks_per_vector, capture_uio) == \
+            stepped(b, stim, clocks_per_vector, capture_uio)
+    # and carries on from the same state
+    assert a.run_vectors(stim[:300], None, clocks_per_vector, capture_uio) == \
+            stepped(b, stim[:300], clocks_per_vector, capture_uio)
+
+
+def test_factory_modes():
+    model = FactoryTestModel()
+    model.reset()
+    # counting starts on the second edge out of reset
+    assert list(model.run_vectors(bytearray([1]*4))) == [0, 1, 2, 3]
+    # loopback, while still clocking
+    got = model.run_vectors(bytearray([0, 0, 1]), uio_in=0x5a)
+    assert list(got) == [0x5a, 0x5a, 6]
+    assert model.loopback(b'\x01\x02') == bytearray([1, 2])
+
+
+def test_factory_testbench_on_sim_dut():
+    import examples.tt_um_factory_test.tt_um_factory_test as factory
+    runner = cocotb.get_runner(factory.__name__)
+    dut = SimDUT(FactoryTestModel(), 'FactoryTest')
+    dut.add_bit_attribute('some_bit', dut.uo_out, 5)
+    start = time.time()
+    runner.test(dut)
+    assert time.time() - start < 10
+    for test in runner.tests_to_run.values():
+        if not test.skip:
+            assert test.failed == test.expect_fail, test.name
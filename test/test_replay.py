@@ -0,0 +1,141 @@
+import pytest
+import ttboard.util.platform as platform
+from ttboard.sim.model import DesignModel
+from ttboard.pins.gpio_map import GPIOMapTT06
+from ttboard.cocotb.dut import ClockPin
+from ttboard.cocotb.recorder import SessionRecorder
+from ttboard.stream.engine import StreamEngine
+from ttboard.stream.session import VectorSession, SessionReplay
+
+RstBit = 1 << GPIOMapTT06.project_reset()
+
+
+class Accumulator(DesignModel):
+    def __init__(self, step_bug_at:int=None):
+        super().__init__()
+        self.count = 0
+        self.step_bug_at = step_bug_at
+
+    def reset(self):
+        self.uo_out = 0
+        self.count = 0
+        self.uio_oe = 0xf0
+        self.uio_out = 0
+
+    def clock(self, ui_in, uio_in):
+        self.count += 1
+        self.uo_out = (self.uo_out + ui_in + (uio_in & 0xf)) & 0xff
+        if self.count == self.step_bug_at:
+            self.uo_out ^= 1
+        self.uio_out = (self.count & 0xf) << 4
+
+
+def reset_project(put_in_reset):
+    if put_in_reset:
+        platform.mem32[0xd0000018] = RstBit
+        platform.mem32[0xd0000024] = RstBit
+    else:
+        platform.mem32[0xd0000028] = RstBit
+
+
+class ResetPin:
+    def __init__(self):
+        self.write_hooks = []
+
+    @property
+    def value(self):
+        return 0 if platform.mem32[0xd0000020] & RstBit else 1
+
+    @value.setter
+    def value(self, v):
+        reset_project(not v)
+        for hook in self.write_hooks:
+            hook(v)
+
+
+class FakeBoard:
+    class Port:
+        def __init__(self, write):
+            self.write = write
+            self.port = self
+        @property
+        def value(self):
+            return None
+        @value.setter
+        def value(self, v):
+            self.write(v)
+        def do_force_update_last_value(self, v):
+            pass
+
+    def __init__(self):
+        self.ui_in = self.Port(platform.write_ui_in_byte)
+        self.uio_in = self.Port(platform.write_uio_byte)
+        self.uio_oe_pico = self.Port(platform.write_uio_outputenable)
+
+    def _take_project_io_control(self, why):
+        pass
+
+    def reset_project(self, put_in_reset):
+        reset_project(put_in_reset)
+
+
+@pytest.fixture
+def sim():
+    platform.mem32.reset()
+    platform.mem32[0xd0000024] = 0x1E1E00 | 1
+    platform.mem32.attach_model(Accumulator(), GPIOMapTT06)
+    yield platform.mem32
+    platform.mem32.reset()
+
+
+def record_session(max_cycles=64):
+    clk = ClockPin('clk', None)
+    rst_n = ResetPin()
+    recorder = SessionRecorder(clk, rst_n, max_cycles)
+    platform.write_uio_outputenable(0x0f)
+    rst_n.value = 0
+    for _i in range(2):
+        clk.value = 1
+        clk.value = 0
+    rst_n.value = 1
+    for i in range(10):
+        platform.write_ui_in_byte(i * 3)
+        if i == 6:
+            platform.write_uio_byte(0x05)
+        clk.value = 1
+        clk.value = 0
+    platform.write_ui_in_byte(0xff) # after the last clock, not recorded
+    return recorder.stop()
+
+
+def test_record_save_replay(sim, tmp_path):
+    session = record_session()
+    assert len(session) == 12
+    assert [r[4] for r in session.runs()] == [0, 1, 1]
+    assert session.cycle(2) == dict(ui_in=0, uio_in=0, uio_oe=0x0f, flags=1,
+                                    uo_out=0, uio_out=0x10)
+
+    path = str(tmp_path / 'session.ttv')
+    session.save(path)
+    loaded = VectorSession.load(path)
+    assert len(loaded) == 12 and loaded.uo_out == session.uo_out[:12]
+
+    # fresh project, same session
+    sim.attach_model(Accumulator(), GPIOMapTT06)
+    result = SessionReplay(engine=StreamEngine(FakeBoard())).run(loaded)
+    assert result.passed and result.num_cycles == 12
+
+
+def test_replay_reports_first_mismatch(sim):
+    session = record_session()
+    sim.attach_model(Accumulator(step_bug_at=5), GPIOMapTT06)
+    result = SessionReplay(engine=StreamEngine(FakeBoard())).run(session)
+    assert not result.passed
+    # 2 reset cycles, then the 5th clock out of reset
+    assert result.mismatch == 6
+    assert result.expected[0] ^ result.got[0] == 1
+
+
+def test_full_session_stops_recording(sim):
+    session = record_session(max_cycles=4)
+    assert len(session) == 4
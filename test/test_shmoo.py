@@ -0,0 +1,58 @@
+import pytest
+import ttboard.util.platform as platform
+from ttboard.clocking.system import SystemClock
+from ttboard.shmoo.engine import Shmoo
+from ttboard.shmoo.results import ShmooResults
+
+
+class FakeBoard:
+    def __init__(self):
+        self.system_clock = SystemClock()
+        self.shuttle = type('Shuttle', (), {'enabled': None})()
+    def clock_project_stop(self):
+        pass
+
+
+class ThresholdProbe:
+    sys_per_project = 2
+    def __init__(self, max_hz, flaky_at=None):
+        self.max_hz = max_hz
+        self.flaky_at = flaky_at
+        self.tried = []
+    def __call__(self, freq_hz):
+        assert platform.get_RP_system_clock() == freq_hz * 2
+        self.tried.append(freq_hz)
+        if freq_hz == self.flaky_at and self.tried.count(freq_hz) > 1:
+            raise RuntimeError('glitch')
+        return 0 if freq_hz <= self.max_hz else 3
+
+
+@pytest.fixture
+def board():
+    platform.set_RP_system_clock(125_000_000)
+    yield FakeBoard()
+    platform.set_RP_system_clock(125_000_000)
+
+
+def test_finds_max_and_restores(board, tmp_path):
+    results = ShmooResults(str(tmp_path / 'shmoo.json'))
+    probe = ThresholdProbe(70_000_000)
+    res = Shmoo(board, results).run(probe, 'tt_um_test')
+
+    assert res.max_hz == 70_000_000
+    assert res.sys_hz == 140_000_000
+    assert len(probe.tried) < 20
+    assert platform.get_RP_system_clock() == 125_000_000
+    assert board.system_clock.requirements == {}
+
+    reloaded = ShmooResults(results.path)
+    assert reloaded.max_hz('tt_um_test') == 70_000_000
+    assert reloaded.max_hz('other') is None
+
+
+def test_flaky_best_point_steps_down(board, tmp_path):
+    results = ShmooResults(str(tmp_path / 'shmoo.json'))
+    probe = ThresholdProbe(70_000_000, flaky_at=70_000_000)
+    res = Shmoo(board, results).run(probe, 'tt_um_test', save=False)
+    assert 0 < res.max_hz < 70_000_000
+    assert results.designs == []
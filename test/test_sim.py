@@ -0,0 +1,99 @@
+import pytest
+import ttboard.util.platform as platform
+import ttboard.sim.registers as regs
+from ttboard.sim.model import DesignModel
+from ttboard.pins.gpio_map import GPIOMapTT06
+from ttboard.pins.upython import Pin
+
+
+class Adder(DesignModel):
+    '''
+        registered uo_out = ui_in + uio_in, count of clocks on uio[7:4]
+    '''
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+    
+    def reset(self):
+        self.uo_out = 0
+        self.count = 0
+        self.uio_oe = 0xf0
+        self.uio_out = 0
+    
+    def clock(self, ui_in, uio_in):
+        self.uo_out = (ui_in + (uio_in & 0x0f)) & 0xff
+        self.count += 1
+        self.uio_out = (self.count & 0xf) << 4
+
+
+@pytest.fixture
+def sim():
+    platform.mem32.reset()
+    yield platform.mem32
+    platform.mem32.reset()
+
+
+def clock(n=1):
+    for _i in range(n):
+        platform.write_clock(1)
+        platform.write_clock(0)
+
+
+def test_register_semantics(sim):
+    sim[regs.GPIO_OUT_SET] = 0b1010
+    sim[regs.GPIO_OUT_XOR] = 0b0110
+    sim[regs.GPIO_OUT_CLR] = 0b1000
+    assert sim[regs.GPIO_OUT] == 0b0100
+    
+    # only pins with OE set read back what's driven
+    sim[regs.GPIO_OE_SET] = 0b0100
+    assert sim[regs.GPIO_IN] == 0b0100
+    sim[regs.GPIO_OE_CLR] = 0b0100
+    assert sim[regs.GPIO_IN] == 0
+    
+    sim.set_pull_up(3, True)
+    assert sim[regs.GPIO_IN] == 0b1000
+    sim.drive(0b1000, 0)
+    assert sim[regs.GPIO_IN] == 0
+
+
+def test_desktop_pin_shares_registers(sim):
+    p = Pin(9, Pin.OUT)
+    platform.write_ui_in_byte(0x01)
+    assert p() == 1
+    p(0)
+    assert platform.read_ui_in_byte() == 0
+
+
+def test_model_driven_by_ports(sim):
+    sim.attach_model(Adder(), GPIOMapTT06)
+    rst = Pin(GPIOMapTT06.project_reset(), Pin.OUT)
+    Pin(0, Pin.OUT)
+    sim[regs.GPIO_OE_SET] = 0x1E1E00 # ui_in
+    platform.write_uio_outputenable(0x0f)
+    platform.write_ui_in_byte(0)
+    
+    rst(0)
+    clock()
+    rst(1)
+    
+    platform.write_ports(ui_in=0x40, uio=0x02)
+    clock(3)
+    assert platform.read_uo_out_byte() == 0x42
+    # low nibble ours, high nibble the model's count
+    assert platform.read_uio_byte() == 0x32
+    
+    # reset pin undriven is pulled up on the board
+    rst.init(Pin.IN)
+    clock()
+    assert platform.read_uio_byte() == 0x42
+
+
+def test_clock_burst_drives_model(sim):
+    sim.attach_model(Adder(), GPIOMapTT06)
+    Pin(0, Pin.OUT)
+    burst = platform.PIOClockBurst(None)
+    burst.start(20)
+    burst.release()
+    assert sim.model.count == 20
+    assert platform.read_clock() == 0
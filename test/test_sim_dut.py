@@ -0,0 +1,78 @@
+import asyncio
+import time
+import pytest
+from microcotb.clock import Clock
+from microcotb.time.system import SystemTime
+from ttboard.cocotb.sim import SimDUT
+from ttboard.cocotb.triggers import ClockCycles, RisingEdge
+from ttboard.sim.model import DesignModel
+
+
+class Counter(DesignModel):
+    '''
+        uo_out counts up while ui_in[0], uio[7:4] mirror uio[3:0]
+    '''
+    def reset(self):
+        self.uo_out = 0
+        self.uio_oe = 0xf0
+
+    def clock(self, ui_in, uio_in):
+        if ui_in & 1:
+            self.uo_out = (self.uo_out + 1) & 0xff
+        self.uio_out = (uio_in & 0x0f) << 4
+
+
+@pytest.fixture
+def dut():
+    SystemTime.reset()
+    Clock.clear_all()
+    dut = SimDUT(Counter())
+    dut.add_bit_attribute('bit5', dut.uo_out, 5)
+    dut.add_slice_attribute('low', dut.uo_out, 3, 0)
+    Clock(dut.clk, 10, 'us').start()
+    yield dut
+    Clock.clear_all()
+
+
+def test_ports_and_attributes(dut):
+    async def test():
+        dut.ui_in.value = 1
+        dut.uio_oe_pico.value = 0x0f
+        dut.uio_in.value = 0x3
+        dut.rst_n.value = 0
+        await ClockCycles(dut.clk, 2)
+        dut.rst_n.value = 1
+        await ClockCycles(dut.clk, 1)
+        assert dut.uo_out.value == 1
+        assert dut.uio_out.value == 0x33
+        await RisingEdge(dut.bit5)
+        assert dut.uo_out.value == 0x20
+        assert dut.low.value == 0
+        dut.ui_in[0] = 0
+        await ClockCycles(dut.clk, 3)
+        assert dut.uo_out.value == 0x20
+    asyncio.run(test())
+
+
+def test_long_waits_are_quick(dut):
+    async def test():
+        dut.ui_in.value = 1
+        dut.rst_n.value = 0
+        await ClockCycles(dut.clk, 1)
+        dut.rst_n.value = 1
+        await ClockCycles(dut.clk, 100000)
+    start = time.time()
+    asyncio.run(test())
+    assert time.time() - start < 2
+    assert dut.cycles == 100001
+    assert dut.uo_out.value == 100000 & 0xff
+    assert SystemTime.current().time_in('ms') >= 1000
+
+
+def test_step_function():
+    d = SimDUT(lambda ui_in, uio_in: (ui_in ^ 0xff, ui_in))
+    d.model.uio_oe = 0xff
+    d.ui_in.value = 0x0f
+    d.clk.value = 1
+    d.clk.value = 0
+    assert d.uo_out.value == 0xf0 and d.uio_out.value == 0x0f
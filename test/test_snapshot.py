@@ -0,0 +1,68 @@
+import os
+import pytest
+import ttboard.util.platform as platform
+from ttboard.mode import RPMode
+from ttboard.cocotb.dut import DUT
+from ttboard.cocotb.snapshot import SnapshotDecoder
+
+
+@pytest.fixture
+def dut(monkeypatch):
+    # DemoBoard wants its config.ini
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), '..', 'src'))
+    dut = DUT('snap')
+    dut.tt.mode = RPMode.ASIC_RP_CONTROL
+    dut.add_bit_attribute('led', dut.uo_out, 5)
+    dut.add_slice_attribute('segments', dut.uo_out, 6, 0)
+    dut.add_slice_attribute('sel', dut.ui_in, 7, 4)
+    reads = []
+    read_state = platform.read_gpio_state
+    def counting():
+        reads.append(1)
+        return read_state()
+    monkeypatch.setattr(platform, 'read_gpio_state', counting)
+    yield dut, reads
+    platform.mem32.drive(0, 0)
+
+
+def drive_uo_out(dut, value:int):
+    layout = dut.tt.pins.layout
+    scatter = eval('lambda val: ' + layout.scatter_expr('uo_out'))
+    platform.mem32.drive(layout.gpio_mask('uo_out'), scatter(value))
+
+
+def test_snapshot_matches_signals(dut):
+    dut, reads = dut
+    dut.ui_in.value = 0xa5
+    dut.uio_oe_pico.value = 0x0f
+    dut.clk.value = 1
+    drive_uo_out(dut, 0xe3)
+    snap = dut.snapshot()
+    assert len(reads) == 1
+    for name in ['uo_out', 'ui_in', 'uio_oe_pico', 'led', 'segments', 'sel']:
+        assert snap[name] == int(getattr(dut, name).value), name
+    assert snap.uo_out == 0xe3 and snap.led == 1 and snap.segments == 0x63
+    assert snap.sel == 0xa and snap.clk == 1
+    dut.clk.value = 0
+
+    # what was read stays put
+    drive_uo_out(dut, 0)
+    assert snap.uo_out == 0xe3 and dut.snapshot().uo_out == 0
+    assert len(reads) == 2
+
+
+def test_new_attributes_show_up(dut):
+    dut, _reads = dut
+    assert dut.snapshot().names.count('low_bit') == 0
+    dut.add_bit_attribute('low_bit', dut.uo_out, 0)
+    drive_uo_out(dut, 0x01)
+    assert dut.snapshot().low_bit == 1
+    with pytest.raises(AttributeError):
+        dut.snapshot().nosuchthing
+
+
+def test_gather_split_ports():
+    gather = SnapshotDecoder.gather_function([5, 6, 7, 8, 13, 14, 15, 16])
+    assert gather((0xa << 5) | (0x5 << 13)) == 0x5a
+    gather = SnapshotDecoder.gather_function([3, 1, 2])
+    assert gather(0b1010) == 0b011
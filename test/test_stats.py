@@ -0,0 +1,61 @@
+import types
+import pytest
+import ttboard.util.platform as platform
+import ttboard.util.stats as stats
+from ttboard.pins.mux_control import MuxControl
+from ttboard.ports.io import IO
+from ttboard.ports.oe import OutputEnable
+
+
+@pytest.fixture
+def counting():
+    pins = types.SimpleNamespace(
+        uo_out=IO('uo_out', 8, platform.read_uo_out_byte, None),
+        ui_in=IO('ui_in', 8, platform.read_ui_in_byte, platform.write_ui_in_byte,
+                 gpios=[9, 10, 11, 12, 17, 18, 19, 20]),
+        uio_in=IO('uio_in', 8, platform.read_uio_byte, platform.write_uio_byte),
+        uio_out=IO('uio_out', 8, platform.read_uio_byte, None),
+        uio_oe_pico=OutputEnable('uio_oe_pico', 8, platform.read_uio_outputenable,
+                                 platform.write_uio_outputenable))
+    platform.mem32.reset()
+    platform.mem32[0xd0000024] = 0x1E1E00
+    stats.reset()
+    stats.enable(pins)
+    yield pins
+    stats.disable()
+    stats.reset()
+    platform.mem32.reset()
+
+
+def test_counts_and_restores(counting):
+    original_select = stats._patches[0][2]
+    mux = MuxControl('hk_csb', 1)
+    mux.select(0)
+    mux.select(0) # no change, but still a call
+    for i in range(5):
+        counting.ui_in.value = i
+    counting.uo_out.value
+    mux.ctrlpin.mode = mux.ctrlpin.mode
+
+    summary = stats.summary()
+    assert summary['mux select'][0] == 2
+    assert summary['ui_in write'][0] == 5
+    assert summary['uo_out read'][0] == 1
+    assert summary['pin mode'][0] == 1
+    assert 'system clock' not in summary
+    assert 'ui_in write' in stats.report()
+
+    # bit writes skip the fast path while counted
+    counting.ui_in[7] = 1
+    assert stats.summary()['ui_in write'][0] > 5
+    assert platform.read_ui_in_byte() == 0x84
+
+    stats.disable()
+    assert MuxControl.select is original_select
+    assert counting.ui_in.port.signal_write is platform.write_ui_in_byte
+    assert not counting.ui_in.hooks.active
+    mux.select(1)
+    assert stats.summary()['mux select'][0] == 2
+
+    stats.reset()
+    assert stats.summary() == {}
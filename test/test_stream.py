@@ -0,0 +1,79 @@
+import os
+import pytest
+import ttboard.util.platform as platform
+from ttboard.mode import RPMode
+from ttboard.demoboard import DemoBoard
+from ttboard.sim.model import DesignModel
+from ttboard.pins.gpio_map import GPIOMapTT06
+from ttboard.stream.engine import StreamEngine
+
+
+class Mixer(DesignModel):
+    '''
+        uo_out accumulates ui_in, uio_out[7:4] counts clocks
+    '''
+    def reset(self):
+        self.uo_out = 0
+        self.count = 0
+        self.uio_oe = 0xf0
+        self.uio_out = 0
+
+    def clock(self, ui_in, uio_in):
+        self.count += 1
+        self.uo_out = (self.uo_out * 3 + ui_in) & 0xff
+        self.uio_out = (self.count & 0xf) << 4
+
+
+@pytest.fixture
+def tt(monkeypatch):
+    # DemoBoard wants its config.ini
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), '..', 'src'))
+    tt = DemoBoard.get()
+    tt.mode = RPMode.ASIC_RP_CONTROL
+    yield tt
+    platform.mem32.detach_model()
+
+
+def attach(model):
+    model.reset()
+    platform.mem32.attach_model(model, GPIOMapTT06)
+
+
+def expected(stim, clocks_per_vector=1, capture_uio=False):
+    model = Mixer()
+    model.reset()
+    return model.run_vectors(stim, None, clocks_per_vector, capture_uio)
+
+
+@pytest.mark.parametrize('clocks_per_vector', [1, 3])
+def test_run_captures_uo_out(tt, clocks_per_vector):
+    stim = bytearray([(i * 37) & 0xff for i in range(50)])
+    attach(Mixer())
+    got = StreamEngine(tt).run(stim, clocks_per_vector=clocks_per_vector)
+    assert got == expected(stim, clocks_per_vector)
+    # last vector left on the inputs, and the port knows it
+    assert platform.read_ui_in_byte() == stim[-1]
+    assert tt.ui_in.value == stim[-1]
+
+
+def test_run_captures_uio_every_other_byte(tt):
+    stim = bytearray(range(1, 21))
+    tt.uio_oe_pico.value = 0
+    attach(Mixer())
+    capture = bytearray(2*len(stim))
+    got = StreamEngine(tt).run(stim, capture, capture_uio=True)
+    assert got is capture
+    assert got == expected(stim, capture_uio=True)
+    # uo_out at even offsets, uio (count in the top nibble) at odd
+    assert got[0::2] == expected(stim)
+    assert list(got[1::2]) == [(n & 0xf) << 4 for n in range(1, 21)]
+
+
+def test_pio_only_on_standard_layout(tt, monkeypatch):
+    from ttboard.pins.port_compiler import PortLayout
+    eng = StreamEngine(tt)
+    assert eng.pio_supported
+    odd = PortLayout({'ui_in': list(range(2, 10)), 'uo_out': list(range(10, 18)),
+                      'uio': list(range(18, 26))}, 1)
+    monkeypatch.setattr(tt.pins, 'layout', odd)
+    assert not eng.pio_supported
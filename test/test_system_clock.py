@@ -0,0 +1,89 @@
+import pytest
+import ttboard.util.platform as platform
+from ttboard.clocking.system import SystemClock
+
+
+class Consumer:
+    def __init__(self):
+        self.changes = []
+    def system_clock_changed(self, old_hz, new_hz):
+        self.changes.append((old_hz, new_hz))
+
+
+@pytest.fixture
+def sysclk():
+    platform.set_RP_system_clock(125_000_000)
+    clk = SystemClock()
+    yield clk
+    platform.set_RP_system_clock(125_000_000)
+
+
+def test_requirements_and_consumers(sysclk):
+    consumer = Consumer()
+    sysclk.add_consumer(consumer)
+    sysclk.add_consumer(consumer)
+    
+    sysclk.require('a', 100_000_000)
+    sysclk.require('b', 120_000_000)
+    assert platform.get_RP_system_clock() == 120_000_000
+    # same clock, nothing to do
+    sysclk.require('a', 120_000_000)
+    sysclk.release('b')
+    assert sysclk.changes == 2
+    
+    sysclk.release('a')
+    assert platform.get_RP_system_clock() == 125_000_000
+    assert consumer.changes == [(125_000_000, 100_000_000), 
+                                (100_000_000, 120_000_000), 
+                                (120_000_000, 125_000_000)]
+
+
+def test_batch_changes_once(sysclk):
+    consumer = Consumer()
+    sysclk.add_consumer(consumer)
+    with sysclk.batch():
+        sysclk.default_hz = 100_000_000
+        sysclk.require('a', 50_000_000)
+        sysclk.require('b', 133_000_000)
+        sysclk.release('a')
+        assert sysclk.target == 133_000_000
+        assert platform.get_RP_system_clock() == 125_000_000
+    
+    assert platform.get_RP_system_clock() == 133_000_000
+    assert consumer.changes == [(125_000_000, 133_000_000)]
+    sysclk.release_all()
+    assert platform.get_RP_system_clock() == 100_000_000
+
+
+def test_clock_burst_not_busy_after_clock_change(monkeypatch):
+    import os
+    from ttboard.demoboard import DemoBoard
+    # DemoBoard wants its config.ini
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), '..', 'src'))
+    tt = DemoBoard.get()
+    tt.clock_cycles(10, blocking=False)
+    tt.system_clock.require('burst_test', 100_000_000)
+    try:
+        assert not tt.clock_cycles_busy
+        tt.clock_cycles(5)
+        assert not tt.clock_cycles_busy
+    finally:
+        tt.system_clock.release('burst_test')
+        tt.clock_cycles_wait()
+
+
+def test_flash_slowed_for_overclocking(sysclk, monkeypatch):
+    divisors = []
+    monkeypatch.setattr(platform, 'set_flash_divisor', lambda d: divisors.append(d) or True)
+    sysclk.require('a', 200_000_000)
+    assert divisors == []
+    sysclk.require('overclock_test', 300_000_000)
+    sysclk.require('overclock_test', 280_000_000)
+    assert divisors == [4]
+    # released, rather than required back down, gets us to 'a'
+    sysclk.release('overclock_test')
+    assert divisors == [4, 2]
+    assert platform.get_RP_system_clock() == 200_000_000
+    sysclk.release('a')
+    assert sysclk.requirements == {}
+    assert platform.get_RP_system_clock() == 125_000_000
@@ -0,0 +1,91 @@
+import io
+import pytest
+import ttboard.util.platform as platform
+from microcotb.time.system import SystemTime
+from microcotb.time.value import TimeValue
+from ttboard.ports.io import IO
+from ttboard.cocotb.trace import SignalTracer
+
+
+class FakePin:
+    def __init__(self):
+        self.write_hooks = []
+
+    def write(self, v):
+        for hook in self.write_hooks:
+            hook(v)
+
+
+@pytest.fixture
+def ports():
+    platform.mem32.reset()
+    platform.mem32[0xd0000024] = 0x1E1E00
+    SystemTime.reset()
+    ui_in = IO('ui_in', 8, platform.read_ui_in_byte, platform.write_ui_in_byte,
+               gpios=[9, 10, 11, 12, 17, 18, 19, 20])
+    uo_out = IO('uo_out', 8, platform.read_uo_out_byte, None)
+    yield ui_in, uo_out
+    platform.mem32.reset()
+
+
+def test_records_writes_and_reads(ports):
+    ui_in, uo_out = ports
+    tracer = SignalTracer(16)
+    tracer.attach_port('ui_in', ui_in)
+    tracer.attach_port('uo_out', uo_out)
+    clk = FakePin()
+    tracer.attach_pin('clk', clk)
+
+    ui_in.value = 0x12
+    SystemTime.advance(TimeValue(40, 'ns'))
+    ui_in[7] = 1
+    clk.write(1)
+    int(uo_out.value)
+    int(uo_out.value)   # unchanged, not recorded
+    SystemTime.advance(TimeValue(1, 'us'))
+    clk.write(0)
+    assert platform.read_ui_in_byte() == 0x92
+    assert list(tracer.records()) == [
+        (0, 'ui_in', 0x12), (40, 'ui_in', 0x92), (40, 'clk', 1),
+        (40, 'uo_out', 0), (1040, 'clk', 0)]
+
+    tracer.detach()
+    assert ui_in._bit_masks is not None and clk.write_hooks == []
+    ui_in.value = 3
+    assert len(tracer) == 5
+
+
+def test_ring_keeps_latest_and_time_runs_on(ports):
+    ui_in, _uo = ports
+    tracer = SignalTracer(4)
+    tracer.attach_port('ui_in', ui_in)
+    for i in range(6):
+        ui_in.value = i
+        SystemTime.advance(TimeValue(10, 'ns'))
+    SystemTime.reset()  # next test
+    ui_in.value = 0x80
+    assert list(tracer.records()) == [
+        (30, 'ui_in', 3), (40, 'ui_in', 4), (50, 'ui_in', 5),
+        (50, 'ui_in', 0x80)]
+
+    out = io.StringIO()
+    tracer.write_vcd(out)
+    vcd = out.getvalue()
+    assert '$var wire 8 ! ui_in [7:0] $end' in vcd
+    assert vcd.endswith('#50\nb101 !\nb10000000 !\n')
+
+
+def test_times_in_ns_whatever_base_units(ports, monkeypatch):
+    ui_in, _uo_out = ports
+    monkeypatch.setattr(TimeValue, 'BaseUnits', 'ps')
+    monkeypatch.setattr(TimeValue, 'BaseUn', 1)
+    SystemTime.reset()
+    tracer = SignalTracer(16)
+    tracer.attach_port('ui_in', ui_in)
+    ui_in.value = 1
+    SystemTime.advance(TimeValue(40, 'ns'))
+    ui_in.value = 2
+    tracer.detach()
+    monkeypatch.undo()
+    SystemTime.reset()
+    assert list(tracer.records()) == [(0, 'ui_in', 1), (40, 'ui_in', 2)]
@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+import ttboard.util.platform as platform
+from microcotb.clock import Clock
+from microcotb.time.system import SystemTime
+from ttboard.cocotb.dut import ClockPin
+from ttboard.cocotb.triggers import ClockCycles
+
+
+class CountingClockPin(ClockPin):
+    def __init__(self):
+        super().__init__('clk', None, tt=self)
+        self.rising = 0
+        self.bursts = 0
+
+    @property
+    def value(self):
+        return platform.read_clock()
+
+    @value.setter
+    def value(self, set_to:int):
+        if set_to and not platform.read_clock():
+            self.rising += 1
+        platform.write_clock(set_to)
+
+    def clock_cycles(self, num_cycles, freq):
+        self.bursts += 1
+        for _i in range(num_cycles):
+            self.value = 1
+            self.value = 0
+
+
+def run_cycles(bursts:bool, initial:int, num_cycles:int, rising:bool):
+    platform.mem32.reset()
+    platform.mem32[0xd0000024] = 1
+    SystemTime.reset()
+    Clock.clear_all()
+    clk = CountingClockPin()
+    clk.allow_bursts = bursts
+    clock = Clock(clk, 10, 'us')
+    clock.start()
+    clk.value = initial
+    clock.current_signal_value = initial
+    clk.rising = 0
+    async def wait():
+        await ClockCycles(clk, num_cycles, rising)
+    asyncio.run(wait())
+    return (clk.bursts, clk.rising, platform.read_clock(),
+            SystemTime.current().time_in('ns'), clock.next_toggle.time_in('ns'),
+            clock.current_signal_value)
+
+
+@pytest.mark.parametrize('initial', [0, 1])
+@pytest.mark.parametrize('rising', [True, False])
+@pytest.mark.parametrize('num_cycles', [8, 13])
+def test_burst_matches_stepping(initial, rising, num_cycles):
+    stepped = run_cycles(False, initial, num_cycles, rising)
+    burst = run_cycles(True, initial, num_cycles, rising)
+    assert stepped[0] == 0 and burst[0] == 1
+    assert burst[1:] == stepped[1:]
+
+
+def test_short_waits_step():
+    assert run_cycles(True, 0, 2, True)[0] == 0
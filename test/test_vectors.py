@@ -0,0 +1,73 @@
+import pytest
+import ttboard.util.platform as platform
+
+
+@pytest.fixture(autouse=True)
+def rp_drives_inputs():
+    # as in ASIC_RP_CONTROL: ui_in, uio and clock driven by the RP2040
+    platform.mem32.reset()
+    platform.mem32[0xd0000024] = 0x1FE00000 | 0x1E1E00 | 1
+    yield
+    platform.mem32.reset()
+
+def test_apply_vectors_walks_stimulus():
+    stim = bytearray([0x01, 0x5a, 0xf0])
+    capture = bytearray(len(stim))
+    
+    num = platform.apply_vectors(stim, 3, capture)
+    
+    assert num == len(stim)
+    # last vector is left on the inputs, clock is left low
+    assert platform.read_ui_in_byte() == 0xf0
+    assert platform.read_clock() == 0
+    assert capture == bytearray([platform.read_uo_out_byte()]*len(stim))
+    
+
+def test_apply_vectors_captures_uio():
+    platform.write_uio_byte(0x42)
+    stim = bytearray([7, 8])
+    capture = bytearray(2*len(stim))
+    
+    platform.apply_vectors(stim, 1, capture, True)
+    
+    uo_out = platform.read_uo_out_byte()
+    assert capture == bytearray([uo_out, 0x42, uo_out, 0x42])
+    
+
+def test_apply_vectors_capture_too_small():
+    with pytest.raises(ValueError):
+        platform.apply_vectors(bytearray(4), 1, bytearray(4), True)
+
+
+def test_write_ports_only_touches_given_ports():
+    platform.write_ports(ui_in=0x11, uio=0x22, clk=0)
+    platform.write_ports(ui_in=0x33, clk=1)
+    
+    assert platform.read_ui_in_byte() == 0x33
+    assert platform.read_uio_byte() == 0x22
+    assert platform.read_clock() == 1
+    platform.write_clock(0)
+
+
+def test_bit_and_slice_writes_use_gpio_masks():
+    from ttboard.ports.io import IO
+    ui_in_gpios = [9, 10, 11, 12, 17, 18, 19, 20]
+    ui_in = IO('ui_in', 8, platform.read_ui_in_byte, platform.write_ui_in_byte, ui_in_gpios)
+    platform.write_clock(1)
+    ui_in.value = 0x0f
+    
+    ui_in[7] = 1
+    ui_in[0] = 0
+    assert platform.read_ui_in_byte() == 0x8e
+    assert ui_in.port.last_value == 0x8e
+    
+    ui_in[5:2] = 0b1001
+    assert platform.read_ui_in_byte() == 0xa6
+    assert ui_in.port.last_value == 0xa6
+    # nothing else touched
+    assert platform.read_clock() == 1
+    platform.write_clock(0)
+    
+    # out of range still complains, as before
+    with pytest.raises(Exception):
+        ui_in[5:2] = 0x1f